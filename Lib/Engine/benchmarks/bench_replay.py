@@ -0,0 +1,80 @@
+"""
+Replay format benchmark: write throughput, bytes per game, seek latency.
+
+Records random self-play games, then compares the replay size with the
+game's event_log dumped as JSON and times seek() to random turns.
+
+    python benchmarks/bench_replay.py --games 500 --snapshot-every 10
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from ptcgengine import replay
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.registry import default_registry
+from ptcgengine.sim import random_policy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--snapshot-every", type=int, default=10)
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--seeks", type=int, default=500)
+    args = parser.parse_args()
+
+    db = default_registry()
+    deck_a = Deck(name="A", cards=[create_instance("TestMon")] * 4 + [create_instance("LightningEnergy")] * 16)
+    deck_b = Deck(name="B", cards=[create_instance("TestMon")] * 3 + [create_instance("LightningEnergy")] * 17)
+
+    replays = []
+    record_time = 0.0
+    encode_time = 0.0
+    json_bytes = 0
+    for seed in range(args.games):
+        rng = random.Random(seed)
+        t0 = time.perf_counter()
+        rec = replay.ReplayRecorder(deck_a, deck_b, db, seed=seed, snapshot_every=args.snapshot_every)
+        while rec.state.winner is None and rec.state.turn <= args.max_turns:
+            actions = replay.api.get_available_actions(rec.state, db)
+            if not actions:
+                break
+            rec.step(random_policy(rec.state, actions, rng))
+        t1 = time.perf_counter()
+        replays.append(rec.to_bytes())
+        t2 = time.perf_counter()
+        record_time += t1 - t0
+        encode_time += t2 - t1
+        json_bytes += len(json.dumps([{"type": e.type, "payload": e.payload} for e in rec.state.event_log]))
+
+    total = sum(len(r) for r in replays)
+    print(f"games                 : {args.games}")
+    print(f"bytes / game          : {total / args.games:.0f} (event_log JSON: {json_bytes / args.games:.0f})")
+    print(f"play + record         : {args.games / record_time:.0f} games/s")
+    print(f"to_bytes()            : {total / encode_time / 1e6:.1f} MB/s")
+
+    rng = random.Random(0)
+    parsed = [replay.Replay(r, db) for r in replays]
+    seek, full = [], []
+    for _ in range(args.seeks):
+        r = rng.choice(parsed)
+        last = r.snapshots[-1].turn + args.snapshot_every - 1 if r.snapshots else 1
+        turn = rng.randint(1, last)
+        t0 = time.perf_counter()
+        r.seek(turn)
+        t1 = time.perf_counter()
+        r._play(r.initial_state(), r.actions(), until_turn=turn)
+        t2 = time.perf_counter()
+        seek.append(t1 - t0)
+        full.append(t2 - t1)
+    print(f"seek latency          : p50 {statistics.median(seek) * 1e3:.2f} ms, max {max(seek) * 1e3:.2f} ms")
+    print(f"replay from turn 1    : p50 {statistics.median(full) * 1e3:.2f} ms, max {max(full) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Selector benchmark: search_deck-style selects and count expressions over a
+60-card deck, answered from the zone indexes versus a full scan with
+filters.apply_filter.
+
+    python benchmarks/bench_selectors.py --iterations 20000
+"""
+
+import argparse
+import random
+import timeit
+
+from ptcgengine.cards import EnergyCard, PokemonCard
+from ptcgengine.context import EffectContext
+from ptcgengine.expressions import compile_expr
+from ptcgengine.filters import apply_filter
+from ptcgengine.selectors import compile_selector
+from ptcgengine.state import GameState
+
+QUERIES = {
+    "water pokemon": [{"type": "pokemon_type", "value": "water"}],
+    "energy": [{"type": "supertype", "value": "energy"}],
+    "hp 60..90": [{"type": "hp_at_least", "value": 60}, {"type": "hp_at_most", "value": 90}],
+}
+
+
+def _deck(seed):
+    rng = random.Random(seed)
+    mons = [
+        PokemonCard(card_id=f"M{hp}{t}", name="M", hp=hp, types=[t], current_hp=hp)
+        for hp in (30, 50, 60, 70, 90, 120) for t in ("fire", "water", "grass")
+    ]
+    energy = [EnergyCard(card_id=f"E{t}", name="E", energy_type=t) for t in "RWG"]
+    return [rng.choice(mons).copy() for _ in range(20)] + [rng.choice(energy).copy() for _ in range(40)]
+
+
+def _scan(filters):
+    def select(game, ctx):
+        objs = list(game.players[ctx.controller].deck)
+        for flt in filters:
+            objs = [o for o in objs if apply_filter(o, flt)]
+        return objs
+    return select
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    state = GameState()
+    state.players[0].deck = _deck(0)
+    ctx = EffectContext(0)
+    n = args.iterations
+    print(f"{'query':>14} {'scan select':>12} {'indexed':>9} {'scan count':>11} {'indexed':>9}   (us)")
+    for name, filters in QUERIES.items():
+        node = {"op": "select", "args": {"who": "self", "zone": "deck", "filters": filters}}
+        indexed = compile_selector(node)
+        count = compile_expr({"op": "count", "selector": node})
+        scan = _scan(filters)
+        assert indexed(state, ctx) == scan(state, ctx) and count(state, ctx) == len(scan(state, ctx))
+        times = [
+            min(timeit.repeat(lambda f=f: f(state, ctx), number=n, repeat=3)) / n * 1e6
+            for f in (scan, indexed, lambda g, c, scan=scan: len(scan(g, c)), count)
+        ]
+        print(f"{name:>14} {times[0]:12.2f} {times[1]:9.2f} {times[2]:11.2f} {times[3]:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Collision-rate and cost benchmark for GameState.zobrist.
+
+Plays random games, records every position reached, and checks how many
+distinct positions (by hashing.features) share a hash. Also reports the
+collision count when the hash is truncated, which gives a feel for the
+headroom at 64 bits, and compares incremental vs from-scratch hashing cost.
+
+    python benchmarks/bench_zobrist.py --games 500
+"""
+
+import argparse
+import random
+import time
+
+from ptcgengine.api import get_available_actions, new_game, step
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.hashing import compute_hash, features
+from ptcgengine.registry import default_registry
+
+
+def _positions(games, seed):
+    db = default_registry()
+    decks = [
+        Deck(name="A", cards=[create_instance("TestMon")] * 4 + [create_instance("LightningEnergy")] * 16),
+        Deck(name="B", cards=[create_instance("TestMon")] * 2 + [create_instance("LightningEnergy")] * 18),
+    ]
+    rng = random.Random(seed)
+    for g in range(games):
+        state = new_game(decks[g % 2], decks[1 - g % 2], db, seed=seed + g)
+        yield state
+        while state.winner is None and state.turn < 60:
+            state, _ = step(state, rng.choice(get_available_actions(state, db)), db)
+            yield state
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    by_hash = {}
+    positions = 0
+    incremental_ns = 0
+    full_ns = 0
+    for state in _positions(args.games, args.seed):
+        positions += 1
+        t0 = time.perf_counter_ns()
+        h = state.zobrist
+        t1 = time.perf_counter_ns()
+        assert h == compute_hash(state)
+        t2 = time.perf_counter_ns()
+        incremental_ns += t1 - t0
+        full_ns += t2 - t1
+        key = frozenset(features(state).items())
+        by_hash.setdefault(h, set()).add(key)
+
+    distinct = set().union(*by_hash.values())
+    collisions = sum(len(v) - 1 for v in by_hash.values())
+    print(f"positions visited : {positions}")
+    print(f"distinct positions: {len(distinct)}")
+    print(f"64-bit collisions : {collisions}")
+    for bits in (32, 24, 16):
+        mask = (1 << bits) - 1
+        buckets = {}
+        for h, keys in by_hash.items():
+            buckets.setdefault(h & mask, set()).update(keys)
+        print(f"{bits}-bit collisions : {sum(len(v) - 1 for v in buckets.values())}")
+    print(f"incremental hash  : {incremental_ns / positions:.0f} ns/position")
+    print(f"full recompute    : {full_ns / positions:.0f} ns/position")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,82 @@
 """
-Updated to handle card objects instead of raw IDs.
+Legal action generation.
+
+Actions are computed from a read-only look at the state: if the state is
+still in PHASE_START, the effect of start_of_turn (draw the top card, reset
+the turn flags) is accounted for analytically instead of applying it to a
+copy. Results are memoised per state version, so asking again for an
+unchanged state (UI redraws, repeated policy queries) is a dict lookup.
+The returned list is fresh, but the action dicts in it are shared between
+calls and must be treated as read-only.
+
+While an attack waits for a choice (state.pending) the only legal actions
+answer it: one "choose" action per distinct pick, where picks that take
+the same card ids count as one.
 """
 
+from itertools import chain, combinations
+
 from .actions import (
     make_attack_action, make_pass_action,
-    make_retreat_action, make_attach_energy_action
+    make_retreat_action, make_attach_energy_action, make_choose_action
 )
-from .turn_manager import PHASE_MAIN, apply_phase_transitions
-from .energy import has_energy_for_cost
+from .turn_manager import PHASE_MAIN, PHASE_START, TURN_FLAG_DEFAULTS
+from .energy import can_pay
 
 def get_available_actions(state, card_db=None):
-    local = state.clone()
-    apply_phase_transitions(local)
+    # card_db only decides whether attack costs are enforced
+    key = ("actions", card_db is None)
+    memo = state.memo()
+    actions = memo.get(key)
+    if actions is None:
+        actions = memo[key] = _legal_actions(state, check_costs=card_db is not None)
+    return list(actions)
+
+def _choose_actions(choice):
+    seen = set()
+    actions = []
+    for k in range(choice.min, choice.max + 1):
+        for pick in combinations(range(len(choice.options)), k):
+            ids = tuple(choice.options[i].card_id for i in pick)
+            if ids not in seen:
+                seen.add(ids)
+                actions.append(make_choose_action(pick))
+    return actions
+
+def _legal_actions(state, check_costs=True):
+    if state.pending is not None:
+        return _choose_actions(state.pending.choice)
+    p = state.players[state.active_player]
+    phase = state.phase
+    flags = state.turn_flags
+    hand = p.hand
+
+    if phase == PHASE_START:
+        # What start_of_turn would do, without doing it
+        phase = PHASE_MAIN
+        flags = TURN_FLAG_DEFAULTS
+        if p.deck:
+            hand = chain(p.hand, (p.deck[-1],))
 
-    p = local.players[local.active_player]
     actions = []
 
-    if local.phase == PHASE_MAIN:
+    if phase == PHASE_MAIN:
         # Attacks
         mon = p.active
-        if mon and not local.turn_flags.get("attack_used", False):
+        if mon and not flags.get("attack_used", False):
+            costs = mon.definition.costs
             for atk in mon.attacks:
-                if card_db is None or has_energy_for_cost(mon, atk["cost"], card_db):
+                if not check_costs or can_pay(mon, costs[atk["name"]]):
                     actions.append(make_attack_action(atk["name"]))
 
         # Energy attachment
-        if not local.turn_flags.get("energy_attached", False):
-            for c in p.hand:
+        if not flags.get("energy_attached", False):
+            for c in hand:
                 if c.supertype == "energy":
                     actions.append(make_attach_energy_action(c.card_id, "self_active"))
 
         # Retreat (placeholder)
-        if not local.turn_flags.get("retreat_used", False):
+        if not flags.get("retreat_used", False):
             actions.append(make_retreat_action())
 
         actions.append(make_pass_action())
@@ -10,6 +10,7 @@ RETREAT = "retreat"
 PLAY_CARD = "play_card"      # (stub for future)
 USE_ABILITY = "use_ability"  # (stub)
 ATTACH_ENERGY = "attach_energy"
+CHOOSE = "choose"            # answer a pending choice (see interpreter.Choice)
 
 def make_attack_action(attack_name: str):
     return {
@@ -34,6 +35,13 @@ def make_attach_energy_action(card_id: str, target: str = "self_active"):
         "target": target,
     }
 
+def make_choose_action(selection):
+    """selection: indices into the pending choice's options."""
+    return {
+        "type": CHOOSE,
+        "selection": list(selection),
+    }
+
 # Stub for future expansion:
 def make_play_card_action(card_id: str):
     return {
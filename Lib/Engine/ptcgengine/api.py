@@ -1,11 +1,23 @@
+from dataclasses import dataclass
+
 from .action_generation import get_available_actions as _inner_actions
-from .actions import ATTACH_ENERGY, ATTACK, PASS, RETREAT
+from .actions import ATTACH_ENERGY, ATTACK, CHOOSE, PASS, RETREAT
+from .card_models import EngineCardState, card_instance_from_engine
+from .cards import attack_effects, attack_trees, choice_attacks, create_card_instance
 from .context import EffectContext
-from .interpreter import execute_effect
+from .energy import attach_energy_card
+from .event_log import EventLog
+from .interpreter import Choice, Execution
+from .rng import Stream
 from .state import GameState
-from .turn_manager import PHASE_MAIN, apply_phase_transitions, end_turn
-from .view import render_state
-from .card_models import card_instance_from_engine, EngineCardState
+from .tracing import instrument
+from .turn_manager import (
+    PHASE_MAIN,
+    apply_phase_transitions,
+    end_turn,
+    resolve_knockouts,
+)
+from .view import render_state  # noqa: F401 - re-exported for UI callers
 
 
 def initial_state(deck=None, trainer=None):
@@ -24,81 +36,195 @@ def initial_state(deck=None, trainer=None):
 
     return state
 
+def new_game(deck_a, deck_b, card_db, seed=None, hand_size=7):
+    """
+    Deal a fresh two-player game from two Decks.
+
+    The game's random stream (state.rng) is derived from `seed`, and each
+    deck is shuffled with that player's split of it. Its CardInstances
+    are instantiated from `card_db` by definition_id, and `hand_size` cards
+    are drawn. The first Pokémon in hand (or, failing that, in the deck)
+    becomes the active Pokémon.
+    """
+    state = GameState(rng=Stream.from_seed(seed))
+    for i, deck in enumerate((deck_a, deck_b)):
+        shuffled = deck.shuffled(state.rng.split("player", i, "deck"))
+        p = state.players[i]
+        p.deck = [
+            create_card_instance(c.identity.definition_id, card_db)
+            for c in reversed(shuffled.cards)
+        ]
+        for _ in range(min(hand_size, len(p.deck))):
+            p.hand.append(p.deck.pop())
+        p.active = _take_first_pokemon(p.hand) or _take_first_pokemon(p.deck)
+        if p.active is None:
+            raise ValueError(f"Deck {deck.name!r} has no Pokémon")
+    return state
+
+def _take_first_pokemon(cards):
+    for i, c in enumerate(cards):
+        if c.supertype == "pokemon":
+            return cards.pop(i)
+    return None
+
+@instrument("get_available_actions")
 def get_available_actions(state, card_db=None):
     return _inner_actions(state, card_db)
 
+@instrument("step")
 def step(state, action, card_db=None):
     """
     Applies the action and returns a tuple:
       (next_state, list_of_new_events)
 
-    Next state contains the updated full event log.
+    Next state contains the updated full event log. The input state is left
+    untouched; the result shares every zone and card the action did not modify.
+
+    An attack that reaches a choice (say, which cards to search for) stops
+    there: pending_choice() of the result is that Choice, the only legal
+    actions are "choose" actions answering it, and the attack finishes in
+    the step that applies one.
     """
     state = state.clone()
+    new_events = _advance(state, action, card_db)
+    return state, new_events
+
+
+@dataclass(frozen=True)
+class UndoToken:
+    """Handle returned by apply(); pass it back to undo() to roll the action back."""
+
+    mark: int
+    events: list
+
+
+@instrument("apply")
+def apply(state, action, card_db=None) -> UndoToken:
+    """
+    Applies the action to `state` in place and returns an UndoToken.
+
+    Produces the same state as step() without cloning, which makes it the
+    cheaper choice for search: apply, inspect, then undo(state, token).
+    Tokens must be undone in reverse order. The new events are available as
+    token.events. Call commit(state) to stop journaling once an applied line
+    of play is kept. If the action is rejected, `state` is rolled back
+    before the error propagates.
+    """
+    mark = state.checkpoint()
+    try:
+        new_events = _advance(state, action, card_db)
+    except Exception:
+        state.rollback(mark)
+        raise
+    return UndoToken(mark=mark, events=new_events)
+
+
+def pending_choice(state) -> Choice | None:
+    """The choice an attack in progress is waiting for, if any."""
+    pending = getattr(state, "pending", None)
+    return pending.choice if pending is not None else None
+
+
+def undo(state, token: UndoToken) -> None:
+    """Roll `state` back to how it was before the apply() that returned `token`."""
+    state.rollback(token.mark)
+
+
+def commit(state) -> None:
+    """Drop the undo journal of `state`; outstanding tokens become invalid."""
+    state.commit()
+
+
+def _advance(state, action, card_db):
     apply_phase_transitions(state)
     new_events = []
 
-    if state.phase == PHASE_MAIN:
+    if state.pending is not None:
+        new_events = _apply_choice(state, action)
+    elif state.phase == PHASE_MAIN:
         new_events = _apply_main_phase_action(state, action, card_db)
 
-    state.event_log = list(state.event_log) + new_events
-    return state, new_events
+    if new_events:
+        log = state.event_log
+        if not isinstance(log, EventLog):
+            log = EventLog(log)
+        state.set("event_log", log.extend(new_events))
+    return new_events
 
 
 # ---------------------------
 # UI-facing accessors
 # ---------------------------
+# Projections are memoized per state version (GameState.memo()), so a UI
+# polling every frame gets the same objects back until the state changes.
+# Treat them as read-only; hand lists are copied, the cards in them are not.
+def _memoized(state, key, build):
+    memo = getattr(state, "memo", None)
+    if memo is None:
+        return build(state)
+    cache = memo()
+    key = ("ui", key)
+    if key not in cache:
+        cache[key] = build(state)
+    return cache[key]
+
+
+def _project_active(state, who) -> EngineCardState | None:
+    players = getattr(state, "players", [])
+    if len(players) < (2 if who else 1):
+        return None
+    ap = getattr(state, "active_player", 0)
+    return card_instance_from_engine(players[1 - ap if who else ap].active)
+
+
+def _project_hand(state, seat) -> tuple:
+    players = getattr(state, "players", [])
+    if not players:
+        return ()
+    if seat is None:
+        seat = getattr(state, "active_player", 0)
+    hand = getattr(players[seat], "hand", []) or []
+    return tuple(ci for ci in (card_instance_from_engine(c) for c in hand) if ci is not None)
+
+
+def _project_seat(state, seat) -> EngineCardState | None:
+    players = getattr(state, "players", [])
+    if len(players) <= seat:
+        return None
+    return card_instance_from_engine(players[seat].active)
+
+
 def get_active(state) -> EngineCardState | None:
     try:
-        ap = getattr(state, "active_player", 0)
-        players = getattr(state, "players", [])
-        if not players:
-            return None
-        return card_instance_from_engine(players[ap].active)
+        return _memoized(state, "active", lambda s: _project_active(s, 0))
     except Exception:
         return None
 
 
 def get_opponent_active(state) -> EngineCardState | None:
     try:
-        ap = getattr(state, "active_player", 0)
-        players = getattr(state, "players", [])
-        if len(players) < 2:
-            return None
-        opp = 1 - ap
-        return card_instance_from_engine(players[opp].active)
+        return _memoized(state, "opponent_active", lambda s: _project_active(s, 1))
     except Exception:
         return None
 
 
 def get_hand(state) -> list[EngineCardState]:
     try:
-        ap = getattr(state, "active_player", 0)
-        players = getattr(state, "players", [])
-        if not players:
-            return []
-        hand = getattr(players[ap], "hand", []) or []
-        return [ci for ci in (card_instance_from_engine(c) for c in hand) if ci is not None]
+        return list(_memoized(state, "hand", lambda s: _project_hand(s, None)))
     except Exception:
         return []
 
 # Perspective-aware accessors (human = player 0 for now)
 def get_human_entity(state) -> EngineCardState | None:
     try:
-        players = getattr(state, "players", [])
-        if not players:
-            return None
-        return card_instance_from_engine(players[0].active)
+        return _memoized(state, "human_entity", lambda s: _project_seat(s, 0))
     except Exception:
         return None
 
 
 def get_opponent_entity(state) -> EngineCardState | None:
     try:
-        players = getattr(state, "players", [])
-        if len(players) < 2:
-            return None
-        return card_instance_from_engine(players[1].active)
+        return _memoized(state, "opponent_entity", lambda s: _project_seat(s, 1))
     except Exception:
         return None
 
@@ -109,11 +235,7 @@ def get_active_entity(state) -> EngineCardState | None:
 
 def get_human_hand(state) -> list[EngineCardState]:
     try:
-        players = getattr(state, "players", [])
-        if not players:
-            return []
-        hand = getattr(players[0], "hand", []) or []
-        return [ci for ci in (card_instance_from_engine(c) for c in hand) if ci is not None]
+        return list(_memoized(state, "human_hand", lambda s: _project_hand(s, 0)))
     except Exception:
         return []
 
@@ -136,17 +258,17 @@ def _apply_main_phase_action(state, action, card_db):
 
     if t == ATTACK:
         events = _apply_attack(state, action, card_db)
-        state.turn_flags["attack_used"] = True
-        end_turn(state)
+        if state.pending is None:
+            events += _finish_attack(state)
         return events
 
     if t == ATTACH_ENERGY:
         _apply_attach_energy(state, action, card_db)
-        state.turn_flags["energy_attached"] = True
+        state.set_flag("energy_attached", True)
         return []
 
     if t == RETREAT:
-        state.turn_flags["retreat_used"] = True
+        state.set_flag("retreat_used", True)
         return []
 
     if t == PASS:
@@ -160,19 +282,43 @@ def _apply_attack(state, action, card_db):
     mon = state.players[ap].active
 
     atk_name = action["attack_name"]
-    try:
-        atk = next(a for a in mon.attacks if a["name"] == atk_name)
-    except StopIteration:
+    if not any(a["name"] == atk_name for a in mon.attacks):
         raise ValueError(
             f"Attack {atk_name} not found on {mon.card_id}"
-        ) from None
-
-    effect = atk.get("effect")
-    events = []
-    if effect:
-        ctx = EffectContext(controller=ap)
-        state, events = execute_effect(effect, state, ctx)
+        )
+
+    # Effects are compiled once per definition (see cards.attack_effects);
+    # attacks that can stop at a choice run on the interpreter instead
+    definition = mon.definition
+    if atk_name in choice_attacks(definition):
+        execution = Execution(attack_trees(definition)[atk_name], state, EffectContext(controller=ap))
+        if execution.run() is not None:
+            state.set("pending", execution.suspend((definition, atk_name)))
+        return execution.events
+    effect = attack_effects(definition).get(atk_name)
+    if effect is None:
+        return []
+    state, events = effect(state, EffectContext(controller=ap))
+    return events
 
+def _apply_choice(state, action):
+    if action["type"] != CHOOSE:
+        raise ValueError(f"Waiting for a choice, got {action['type']}")
+    pending = state.pending
+    definition, atk_name = pending.source
+    execution = Execution.restore(attack_trees(definition)[atk_name], state, pending)
+    # resume() checks the selection before anything changes
+    if execution.resume(action["selection"]) is not None:
+        state.set("pending", execution.suspend(pending.source))
+        return execution.events
+    state.set("pending", None)
+    return execution.events + _finish_attack(state)
+
+def _finish_attack(state):
+    state.set_flag("attack_used", True)
+    events = resolve_knockouts(state)
+    if state.winner is None:
+        end_turn(state)
     return events
 
 def _apply_attach_energy(state, action, card_db):
@@ -188,10 +334,9 @@ def _apply_attach_energy(state, action, card_db):
     else:
         raise ValueError(f"Energy card {cid} not in hand")
 
-    target = p.active
-    if not target:
+    if not p.active:
         raise ValueError("No active Pokémon to attach to")
 
     # Move card
-    p.hand.remove(card)
-    target.attached_energies.append(card)
+    state.remove_card(ap, "hand", card)
+    attach_energy_card(state, p.active, card)
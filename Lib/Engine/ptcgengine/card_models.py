@@ -42,18 +42,38 @@ class EngineCardState:
             raise ValueError("EngineCardState requires a CardDefinition unless hidden=True.")
 
 
+# card_id -> (engine definition it was built from, CardDefinition)
+_INTERNED: dict[str, tuple[Any, CardDefinition]] = {}
+
+
 def _definition_from_engine(card: BaseCard) -> CardDefinition:
+    """
+    The CardDefinition for `card`, interned per card_id: every card sharing
+    an engine definition gets the same object. A card_id whose fields changed
+    (another card database) replaces the interned entry.
+    """
+    card_id = getattr(card, "card_id", getattr(card, "id", "unknown"))
+    source = getattr(card, "definition", None)
+    hit = _INTERNED.get(card_id)
+    if hit is not None and source is not None and hit[0] is source:
+        return hit[1]
+
     image = None
     meta = getattr(card, "metadata", {}) or {}
     if isinstance(meta, dict):
         image = meta.get("image")
-    return CardDefinition(
-        id=getattr(card, "card_id", getattr(card, "id", "unknown")),
+    definition = CardDefinition(
+        id=card_id,
         name=getattr(card, "name", "Unknown"),
         supertype=getattr(card, "supertype", "unknown"),
         hp=getattr(card, "hp", getattr(card, "max_hp", 0)),
         image=image,
     )
+    if hit is not None and hit[1] == definition:
+        definition = hit[1]
+    if source is not None:
+        _INTERNED[card_id] = (source, definition)
+    return definition
 
 
 def card_instance_from_engine(card: BaseCard | None) -> EngineCardState | None:
@@ -1,21 +1,144 @@
 """
-Card dataclasses + factory functions for instantiating gameplay cards.
+Card definitions + runtime card objects + factory functions.
+
+Static card data (name, HP, types, attacks, ...) lives in immutable
+definition objects (PokemonDef, EnergyDef, TrainerDef) that are interned per
+card_id, so every copy of a card in every game shares one definition. The
+gameplay objects (PokemonCard, EnergyCard, TrainerCard) are small __slots__
+records holding a reference to their definition plus the runtime state that
+changes during a battle (current_hp, attached_energies, status).
+
+Definitions hold plain data only, so states pickle; compiled attack effects
+live in a per-process cache next to them (see attack_effects). Pickling or
+deep-copying a definition gives back the interned one for its card_id.
 
 These objects live ONLY inside the engine. The UI receives dict snapshots
-through render_state() and never touches these dataclasses.
+through render_state() and never touches these classes.
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Any
+import json
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
 
-@dataclass
-class BaseCard:
+from .compiler import compile_effect
+from .effect_analysis import card_effects, check_effect, fold_effect
+from .energy import compile_cost
+from .errors import CardDataError
+from .interpreter import has_choice_points
+
+###############################################################
+# DEFINITIONS (flyweights)
+###############################################################
+
+@dataclass(frozen=True)
+class CardDef:
     card_id: str
     supertype: str
     name: str
     # Additional metadata (stage, set, etc.) stored for engine rules only
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    def __reduce__(self):
+        kwargs = {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+        return _reintern, (type(self), kwargs)
+
+    def __deepcopy__(self, memo):
+        # Immutable and shared: copies keep pointing at the flyweight
+        return self
+
+
+@dataclass(frozen=True)
+class PokemonDef(CardDef):
+    hp: int = 0
+    types: Tuple[str, ...] = ()
+    attacks: Tuple[Dict[str, Any], ...] = ()
+    retreat_cost: Tuple[str, ...] = ()
+    # attack name -> compiled cost, filled in once at definition time
+    costs: Dict[str, Any] = field(default_factory=dict, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        for atk in self.attacks:
+            self.costs[atk["name"]] = compile_cost(atk.get("cost", ()))
+
+    @property
+    def effects(self) -> Dict[str, Callable]:
+        """attack name -> compiled effect (see attack_effects)."""
+        return attack_effects(self)
+
+
+# card_id -> (definition, {attack name: compiled effect}, {attack name: folded effect tree},
+#             names of the attacks that can stop at a choice)
+_COMPILED: Dict[str, Tuple[CardDef, Dict[str, Callable], Dict[str, dict], frozenset]] = {}
+
+def _compiled_attacks(definition: PokemonDef) -> tuple:
+    hit = _COMPILED.get(definition.card_id)
+    if hit is not None and hit[0] is definition:
+        return hit
+    trees = {atk["name"]: fold_effect(atk["effect"]) for atk in definition.attacks if atk.get("effect")}
+    hit = _COMPILED[definition.card_id] = (
+        definition,
+        {name: compile_effect(tree) for name, tree in trees.items()},
+        trees,
+        frozenset(name for name, tree in trees.items() if has_choice_points(tree)),
+    )
+    return hit
+
+def attack_effects(definition: PokemonDef) -> Dict[str, Callable]:
+    """
+    Compiled (and constant-folded) attack effects of `definition`, built on
+    first use and kept per card_id for as long as that id's definition stays
+    the same object.
+    """
+    return _compiled_attacks(definition)[1]
+
+def attack_trees(definition: PokemonDef) -> Dict[str, dict]:
+    """The folded effect trees attack_effects() compiled, for the interpreter."""
+    return _compiled_attacks(definition)[2]
+
+def choice_attacks(definition: PokemonDef) -> frozenset:
+    """Names of the attacks of `definition` that can stop at a choice point."""
+    return _compiled_attacks(definition)[3]
+
+
+@dataclass(frozen=True)
+class EnergyDef(CardDef):
+    energy_type: str = ""
+
+
+@dataclass(frozen=True)
+class TrainerDef(CardDef):
+    # Stub for future expansion
+    effect: Dict[str, Any] = field(default_factory=dict)
+
+
+###############################################################
+# RUNTIME CARDS
+###############################################################
+
+class BaseCard:
+    __slots__ = ("definition",)
+
+    def __init__(self, card_id=None, supertype=None, name=None, metadata=None, *, definition=None):
+        if definition is None:
+            definition = CardDef(card_id, supertype, name, metadata or {})
+        self.definition = definition
+
+    card_id = property(lambda self: self.definition.card_id)
+    supertype = property(lambda self: self.definition.supertype)
+    name = property(lambda self: self.definition.name)
+    metadata = property(lambda self: self.definition.metadata)
+
+    def copy(self):
+        """Copy used by copy-on-write states before mutating a card."""
+        new = object.__new__(type(self))
+        new.definition = self.definition
+        return new
+
+    def _runtime(self) -> tuple:
+        return ()
+
     def snapshot(self):
         """Public renderer-facing dict."""
         return {
@@ -24,17 +147,69 @@ class BaseCard:
             "supertype": self.supertype,
         }
 
-@dataclass
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return (
+            (self.definition is other.definition or self.definition == other.definition)
+            and self._runtime() == other._runtime()
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        runtime = "".join(f", {k}={v!r}" for k, v in zip(self.__slots__, self._runtime(), strict=True))
+        return f"{type(self).__name__}(card_id={self.card_id!r}{runtime})"
+
+
 class PokemonCard(BaseCard):
-    hp: int = 0
-    types: List[str] = field(default_factory=list)
-    attacks: List[Dict[str, Any]] = field(default_factory=list)
-    retreat_cost: List[str] = field(default_factory=list)
+    __slots__ = ("current_hp", "attached_energies", "status", "energy_pool")
 
-    # Runtime state (NOT in card_db; mutable during battle)
-    current_hp: int = 0
-    attached_energies: List["EnergyCard"] = field(default_factory=list)
-    status: set = field(default_factory=set)
+    def __init__(
+        self,
+        card_id=None,
+        supertype="pokemon",
+        name=None,
+        metadata=None,
+        hp=0,
+        types=(),
+        attacks=(),
+        retreat_cost=(),
+        current_hp=0,
+        attached_energies=None,
+        status=None,
+        *,
+        definition=None,
+    ):
+        if definition is None:
+            definition = PokemonDef(
+                card_id, supertype, name, metadata or {},
+                hp=hp, types=tuple(types), attacks=tuple(attacks), retreat_cost=tuple(retreat_cost),
+            )
+        self.definition = definition
+        # Runtime state (NOT in card_db; mutable during battle)
+        self.current_hp = current_hp
+        self.attached_energies = list(attached_energies or [])
+        self.status = set(status or ())
+        # {energy_type: count}, kept in sync by energy.attach_energy_card
+        self.energy_pool = dict(Counter(e.energy_type for e in self.attached_energies))
+
+    hp = property(lambda self: self.definition.hp)
+    types = property(lambda self: self.definition.types)
+    attacks = property(lambda self: self.definition.attacks)
+    retreat_cost = property(lambda self: self.definition.retreat_cost)
+
+    def copy(self):
+        new = object.__new__(PokemonCard)
+        new.definition = self.definition
+        new.current_hp = self.current_hp
+        new.attached_energies = list(self.attached_energies)
+        new.status = set(self.status)
+        new.energy_pool = self.energy_pool
+        return new
+
+    def _runtime(self) -> tuple:
+        return (self.current_hp, self.attached_energies, self.status, self.energy_pool)
 
     def snapshot(self):
         return {
@@ -48,9 +223,16 @@ class PokemonCard(BaseCard):
             "status": list(self.status),
         }
 
-@dataclass
+
 class EnergyCard(BaseCard):
-    energy_type: str = ""
+    __slots__ = ()
+
+    def __init__(self, card_id=None, supertype="energy", name=None, metadata=None, energy_type="", *, definition=None):
+        if definition is None:
+            definition = EnergyDef(card_id, supertype, name, metadata or {}, energy_type=energy_type)
+        self.definition = definition
+
+    energy_type = property(lambda self: self.definition.energy_type)
 
     def snapshot(self):
         return {
@@ -60,47 +242,90 @@ class EnergyCard(BaseCard):
             "energy_type": self.energy_type,
         }
 
-@dataclass
+
 class TrainerCard(BaseCard):
-    # Stub for future expansion
-    effect: Dict[str, Any] = field(default_factory=dict)
+    __slots__ = ()
 
-    def snapshot(self):
-        return {
-            "card_id": self.card_id,
-            "name": self.name,
-            "supertype": self.supertype,
-        }
+    def __init__(self, card_id=None, supertype="trainer", name=None, metadata=None, effect=None, *, definition=None):
+        if definition is None:
+            definition = TrainerDef(card_id, supertype, name, metadata or {}, effect=effect or {})
+        self.definition = definition
+
+    effect = property(lambda self: self.definition.effect)
 
 
 ###############################################################
 # CARD FACTORY FUNCTIONS
 ###############################################################
 
-def create_card_instance(card_id: str, card_db: Dict[str, Any]):
+DEFAULT_CARD_DB_PATH = Path(__file__).parent / "cards" / "card_db.json"
+
+def load_card_db(path=None) -> Dict[str, Any]:
+    """Load a card database JSON file (the packaged card_db.json by default)."""
+    with open(path or DEFAULT_CARD_DB_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# card_id -> (db entry it was built from, definition)
+_INTERNED: Dict[str, Tuple[Dict[str, Any], CardDef]] = {}
+
+def get_definition(card_id: str, card_db: Dict[str, Any]) -> CardDef:
+    """
+    Interned definition for `card_id`.
+
+    Definitions are shared process-wide; a new one is only built when the
+    card_db entry for this id differs from the one seen before. A
+    CardRegistry is asked directly for its prebuilt definition.
+    """
+    lookup = getattr(card_db, "definition", None)
+    if lookup is not None:
+        return lookup(card_id)
+
     entry = card_db.get(card_id)
     if entry is None:
         raise ValueError(f"card_id {card_id} not found in DB")
 
+    hit = _INTERNED.get(card_id)
+    if hit is not None and (hit[0] is entry or hit[0] == entry):
+        return hit[1]
+
+    definition = build_definition(card_id, entry)
+    _INTERNED[card_id] = (entry, definition)
+    return definition
+
+def _reintern(cls, kwargs) -> CardDef:
+    # Unpickling: hand back the interned definition if it has the same data
+    definition = cls(**kwargs)
+    hit = _INTERNED.get(definition.card_id)
+    if hit is not None and hit[1] == definition:
+        return hit[1]
+    return definition
+
+def build_definition(card_id: str, entry: Dict[str, Any]) -> CardDef:
+    problems = [
+        f"{attack or 'effect'}: {p}" for attack, effect in card_effects(card_id, entry) for p in check_effect(effect)
+    ]
+    if problems:
+        raise CardDataError(f"Card {card_id!r} has invalid effects: " + "; ".join(problems))
+
     supertype = entry.get("supertype")
     name = entry.get("name", card_id)
 
     if supertype == "pokemon":
-        return PokemonCard(
+        return PokemonDef(
             card_id=card_id,
             supertype="pokemon",
             name=name,
             hp=entry["hp"],
-            current_hp=entry["hp"],
-            types=entry.get("types", []),
-            attacks=entry.get("attacks", []),
-            retreat_cost=entry.get("retreat_cost", []),
+            types=tuple(entry.get("types", [])),
+            attacks=tuple(entry.get("attacks", [])),
+            retreat_cost=tuple(entry.get("retreat_cost", [])),
             metadata={k: v for k, v in entry.items()
                       if k not in ("hp", "types", "attacks", "retreat_cost")}
         )
 
     if supertype == "energy":
-        return EnergyCard(
+        return EnergyDef(
             card_id=card_id,
             supertype="energy",
             name=name,
@@ -110,7 +335,7 @@ def create_card_instance(card_id: str, card_db: Dict[str, Any]):
         )
 
     if supertype == "trainer":
-        return TrainerCard(
+        return TrainerDef(
             card_id=card_id,
             supertype="trainer",
             name=name,
@@ -120,3 +345,20 @@ def create_card_instance(card_id: str, card_db: Dict[str, Any]):
         )
 
     raise ValueError(f"Unsupported card supertype: {supertype}")
+
+_RUNTIME_TYPES = {PokemonDef: PokemonCard, EnergyDef: EnergyCard, TrainerDef: TrainerCard}
+
+def card_from_definition(definition: CardDef):
+    """Fresh runtime card (full HP, nothing attached) for a definition."""
+    cls = _RUNTIME_TYPES.get(type(definition), BaseCard)
+    card = object.__new__(cls)
+    card.definition = definition
+    if cls is PokemonCard:
+        card.current_hp = definition.hp
+        card.attached_energies = []
+        card.status = set()
+        card.energy_pool = {}
+    return card
+
+def create_card_instance(card_id: str, card_db: Dict[str, Any]):
+    return card_from_definition(get_definition(card_id, card_db))
@@ -0,0 +1,110 @@
+"""
+Effect compiler.
+
+Turns an effect node from card_db.json into a closure fn(game, ctx) that
+returns (game, events) exactly like interpreter.execute_effect, but without
+re-walking the dict tree or comparing op strings on every call.
+
+Nothing is cached here: card definitions keep their compiled attacks in a
+per-definition cache (see cards.attack_effects), so the attack path in api
+only ever does a lookup.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, List, Tuple
+
+from .errors import InterpreterError
+from .expressions import EXPR_OPS, compile_expr
+from .primitives import PRIMITIVES
+from .selectors import compile_selector
+from .tracing import DEBUG, STATS, channel
+
+_TRACE = channel("effect")
+
+CompiledEffect = Callable[[Any, Any], Tuple[Any, list]]
+
+def compile_effect(node: dict) -> CompiledEffect:
+    """Compile an effect node."""
+    op = node.get("op")
+    args = node.get("args", {})
+
+    if op is None and "type" in node:
+        from .interpreter import _handle_direct_event
+        return lambda game, ctx: _handle_direct_event(node, game, ctx)
+
+    if op is None:
+        return _raiser("Effect node missing 'op'")
+
+    if op == "seq":
+        return _compile_block(args["steps"])
+
+    if op == "if":
+        cond = compile_expr(args["condition"])
+        then_block = _compile_block(args["then"])
+        else_block = _compile_block(args.get("else", []))
+
+        def if_(game, ctx):
+            if cond(game, ctx):
+                return then_block(game, ctx)
+            return else_block(game, ctx)
+        return if_
+
+    if op == "repeat":
+        count = compile_expr(args["count"])
+        body = _compile_block(args["body"])
+
+        def repeat(game, ctx):
+            events = []
+            for _ in range(count(game, ctx)):
+                game, evts = body(game, ctx)
+                events.extend(evts)
+            return game, events
+        return repeat
+
+    if op in PRIMITIVES:
+        fn = PRIMITIVES[op]
+        bound = {k: _compile_arg(v) for k, v in args.items()}
+        counter = f"effect.{op}"
+
+        def run(game, ctx):
+            if _TRACE.debug:
+                _TRACE.emit(DEBUG, "exec", op=op)
+            if STATS.enabled:
+                STATS.count(counter)
+            return fn(bound, game, ctx), []
+        return run
+
+    return _raiser(f"Unknown op: {op}")
+
+
+def _compile_block(nodes: List[dict]) -> CompiledEffect:
+    steps = tuple(compile_effect(n) for n in nodes)
+
+    if len(steps) == 1:
+        return steps[0]
+
+    def block(game, ctx):
+        events = []
+        for run in steps:
+            game, evts = run(game, ctx)
+            events.extend(evts)
+        return game, events
+    return block
+
+
+def _compile_arg(value):
+    """Pre-compile expression and selector arguments of a primitive."""
+    if isinstance(value, dict):
+        op = value.get("op")
+        if op == "select":
+            return compile_selector(value)
+        if op in EXPR_OPS:
+            return compile_expr(value)
+    return value
+
+
+def _raiser(message: str) -> CompiledEffect:
+    def fail(game, ctx):
+        raise InterpreterError(message)
+    return fail
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import random
 from dataclasses import dataclass, field
 from typing import Any, Dict, List
 
 from .card_instance import CardInstance, create_instance
+from .rng import Stream
 from .serialization import dump_canonical
 
 
@@ -16,10 +16,11 @@ class Deck:
     cards: List[CardInstance] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    def shuffled(self, seed: int | None = None) -> "Deck":
+    def shuffled(self, seed: int | Stream | None = None) -> "Deck":
+        """Shuffled copy; `seed` is an int seed or an rng.Stream to draw from."""
         cards_copy = list(self.cards)
-        rng = random.Random(seed)
-        rng.shuffle(cards_copy)
+        stream = seed if isinstance(seed, Stream) else Stream.from_seed(seed)
+        stream.shuffle(cards_copy)
         return Deck(name=self.name, cards=cards_copy, metadata=self.metadata)
 
     def to_json(self) -> Dict[str, Any]:
@@ -0,0 +1,127 @@
+"""
+Determinization of hidden zones.
+
+From one player's seat (the observer) the opponent's hand and both decks
+are hidden: only their sizes are public. Given the known deck lists, the
+cards that can be in those zones are each deck list minus every card the
+observer can see (active, bench, discard, attached energy, and the
+observer's own hand). A determinization deals those unseen cards at random
+into the hidden zones, keeping every zone size and all public information
+unchanged.
+
+Determinizer does the bookkeeping once per position. It keeps one
+preallocated buffer of runtime cards per player, so a sample is an in-place
+shuffle of each buffer plus a set_zone() per hidden zone; nothing else is
+built per sample. Sample k is drawn from its own rng.Stream split, so a given
+(seed, k) always yields the same determinization whatever order samples
+are requested in.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Iterable, Mapping, Sequence
+
+from .cards import attack_trees, create_card_instance
+from .errors import EngineError
+from .interpreter import reoffer
+from .rng import Stream
+
+
+def _card_ids(deck_list) -> list:
+    """Card ids of a Deck, a sequence of CardInstances or a plain sequence of ids."""
+    cards = getattr(deck_list, "cards", deck_list)
+    return [c if isinstance(c, str) else c.identity.definition_id for c in cards]
+
+def _visible_ids(state, index: int, observer: int) -> Iterable[str]:
+    p = state.players[index]
+    in_play = ([p.active] if p.active is not None else []) + list(p.bench)
+    for mon in in_play:
+        yield mon.card_id
+        for e in getattr(mon, "attached_energies", ()):
+            yield e.card_id
+    for c in p.discard:
+        yield c.card_id
+    if index == observer:
+        for c in p.hand:
+            yield c.card_id
+
+
+def deck_lists(state) -> list:
+    """
+    Card ids of everything each player has in the game (in play, attached,
+    hand, deck and discard), for when the decks a game was dealt from are
+    not at hand: the deck lists a Determinizer needs.
+    """
+    lists = []
+    for i, p in enumerate(state.players):
+        ids = list(_visible_ids(state, i, i))
+        ids.extend(c.card_id for c in p.deck)
+        lists.append(ids)
+    return lists
+
+
+class Determinizer:
+    def __init__(
+        self,
+        state,
+        observer: int,
+        deck_lists: Sequence[Any],
+        card_db: Mapping[str, Any],
+        seed: int = 0,
+    ):
+        self.observer = observer
+        self.seed = seed
+        self._stream = Stream.from_seed(seed)
+        self._next = 0
+        # Per player: (unseen cards in canonical order, shuffle buffer,
+        # hidden zone names, zone sizes)
+        self._plans = []
+        for i, deck_list in enumerate(deck_lists):
+            p = state.players[i]
+            zones = ("deck",) if i == observer else ("hand", "deck")
+            sizes = tuple(len(getattr(p, z)) for z in zones)
+            unseen = Counter(_card_ids(deck_list))
+            unseen.subtract(_visible_ids(state, i, observer))
+            if any(n < 0 for n in unseen.values()) or unseen.total() != sum(sizes):
+                raise EngineError(f"Deck list of player {i} does not match the visible cards")
+            cards = [
+                create_card_instance(card_id, card_db)
+                for card_id, n in sorted(unseen.items()) for _ in range(n)
+            ]
+            self._plans.append((cards, list(cards), zones, sizes))
+
+    def sample(self, state, k: int | None = None):
+        """A clone of `state` with its hidden zones redealt (sample `k`, or the next one)."""
+        new = state.clone()
+        self.sample_into(new, k)
+        return new
+
+    def samples(self, state, n: int) -> list:
+        return [self.sample(state) for _ in range(n)]
+
+    def sample_into(self, state, k: int | None = None) -> None:
+        """
+        Redeal the hidden zones of `state` in place. `state` must be a clone
+        (see GameState.clone), since the sampled zones share the buffer's
+        card objects.
+        """
+        if k is None:
+            k = self._next
+            self._next += 1
+        stream = self._stream.split("sample", k)
+        for i, (cards, buffer, zones, sizes) in enumerate(self._plans):
+            if cards and state.owns(cards[0]):
+                raise EngineError("sample_into needs a cloned GameState")
+            buffer[:] = cards
+            stream = stream.shuffle(buffer)
+            start = 0
+            for zone, size in zip(zones, sizes, strict=True):
+                state.set_zone(i, zone, buffer[start:start + size])
+                start += size
+        if state.pending is not None:
+            # Options of a pending choice may point into the redealt zones
+            definition, attack = state.pending.source
+            state.set("pending", reoffer(attack_trees(definition)[attack], state, state.pending))
+
+
@@ -0,0 +1,312 @@
+"""
+Load-time checks and constant folding for card effects.
+
+check_effect() walks an effect tree and lists everything the interpreter
+would only trip over mid-game: unknown effect, expression or filter ops,
+missing arguments (against primitives.PRIMITIVE_ARGS and the expression
+grammar), bad selector zones, division by a constant zero.
+build_definition() runs it on every attack, so a bad card raises
+CardDataError as soon as it is loaded (for a CardRegistry, at startup).
+
+fold_effect() then rewrites constant subtrees: arithmetic, comparisons and
+logic over constants become one const node, an `if` on a constant condition
+becomes its chosen block and a `repeat` of zero disappears. Unchanged
+subtrees are returned as-is. An effect is state-independent when, after
+folding, every amount, count and condition in it is a constant; selectors
+still pick their targets from the state, but nothing else is read.
+
+    python -m ptcgengine.effect_analysis [card_db.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Mapping, Sequence, Tuple
+
+from .expressions import _BINARY_OPS, EXPR_OPS
+from .filters import FILTER_TYPES
+from .primitives import PRIMITIVE_ARGS
+from .selectors import SELECTOR_ZONES
+
+# Zones a card list can be moved between (everything but the active spot)
+CARD_ZONES = SELECTOR_ZONES - {"active"}
+
+CONTROL_OPS = {"seq": ("steps",), "if": ("condition", "then"), "repeat": ("count", "body")}
+
+
+###############################################################
+# VALIDATION
+###############################################################
+
+def check_effect(node, path: str = "effect") -> List[str]:
+    """Problems found in an effect tree, each prefixed with where it is."""
+    problems: List[str] = []
+    _check_effect(node, path, problems)
+    return problems
+
+
+def _check_effect(node, path, problems):
+    if not isinstance(node, dict):
+        problems.append(f"{path}: effect must be an object, got {node!r}")
+        return
+    op = node.get("op")
+    if op is None:
+        if "type" not in node:
+            problems.append(f"{path}: effect node missing 'op'")
+        return
+    args = node.get("args", {})
+    if not isinstance(args, dict):
+        problems.append(f"{path}: {op} args must be an object")
+        return
+
+    if op in CONTROL_OPS:
+        for name in CONTROL_OPS[op]:
+            if name not in args:
+                problems.append(f"{path}: {op} is missing '{name}'")
+        for name in ("steps", "then", "else", "body"):
+            if name in args:
+                _check_block(args[name], f"{path}.{name}", problems)
+        for name in ("condition", "count"):
+            if name in args:
+                _check_expr(args[name], f"{path}.{name}", problems)
+        return
+
+    kinds = PRIMITIVE_ARGS.get(op)
+    if kinds is None:
+        problems.append(f"{path}: unknown op {op!r}")
+        return
+    for name, kind in kinds.items():
+        if name not in args:
+            problems.append(f"{path}: {op} is missing '{name}'")
+        elif kind == "expr":
+            _check_expr(args[name], f"{path}.{name}", problems)
+        elif kind == "selector":
+            _check_selector(args[name], f"{path}.{name}", problems)
+        elif kind == "zone" and args[name] not in CARD_ZONES:
+            problems.append(f"{path}.{name}: unknown zone {args[name]!r}")
+
+
+def _check_block(block, path, problems):
+    if not isinstance(block, list):
+        problems.append(f"{path}: expected a list of effects")
+        return
+    for i, step in enumerate(block):
+        _check_effect(step, f"{path}[{i}]", problems)
+
+
+def _check_expr(node, path, problems):
+    if not isinstance(node, dict):
+        problems.append(f"{path}: expression must be an object, got {node!r}")
+        return
+    op = node.get("op")
+    if op not in EXPR_OPS:
+        problems.append(f"{path}: unknown expression op {op!r}")
+    elif op == "const":
+        if "value" not in node:
+            problems.append(f"{path}: const is missing 'value'")
+    elif op == "var":
+        if not isinstance(node.get("name"), str):
+            problems.append(f"{path}: var is missing 'name'")
+    elif op == "count":
+        if "selector" not in node:
+            problems.append(f"{path}: count is missing 'selector'")
+        else:
+            _check_selector(node["selector"], f"{path}.selector", problems)
+    elif op == "coin_flips":
+        count = node.get("count", 1)
+        if isinstance(count, dict):
+            _check_expr(count, f"{path}.count", problems)
+        elif not isinstance(count, int):
+            problems.append(f"{path}: coin_flips count must be an int or expression")
+    else:
+        operands = node.get("args")
+        if not isinstance(operands, list) or len(operands) != 2:
+            problems.append(f"{path}: {op} needs exactly two args")
+            return
+        for i, arg in enumerate(operands):
+            _check_expr(arg, f"{path}.args[{i}]", problems)
+        right = operands[1]
+        if op == "div" and isinstance(right, dict) and _fold_expr(right) == {"op": "const", "value": 0}:
+            problems.append(f"{path}: division by zero")
+
+
+def _check_selector(node, path, problems):
+    if not isinstance(node, dict) or node.get("op") != "select":
+        problems.append(f"{path}: expected a select node")
+        return
+    args = node.get("args", {})
+    if args.get("who") not in ("self", "opponent"):
+        problems.append(f"{path}: 'who' must be 'self' or 'opponent'")
+    if args.get("zone") not in SELECTOR_ZONES:
+        problems.append(f"{path}: unknown zone {args.get('zone')!r}")
+    for i, flt in enumerate(args.get("filters", [])):
+        _check_filter(flt, f"{path}.filters[{i}]", problems)
+
+
+def _check_filter(flt, path, problems):
+    if not isinstance(flt, dict) or flt.get("type") not in FILTER_TYPES:
+        problems.append(f"{path}: unknown filter {flt!r}")
+    elif "value" not in flt:
+        problems.append(f"{path}: filter is missing 'value'")
+    elif flt["type"] == "and":
+        for i, sub in enumerate(flt["value"]):
+            _check_filter(sub, f"{path}.value[{i}]", problems)
+
+
+###############################################################
+# FOLDING
+###############################################################
+
+def _const(node) -> bool:
+    return isinstance(node, dict) and node.get("op") == "const"
+
+
+def _fold_expr(node):
+    if not isinstance(node, dict):
+        return node
+    op = node.get("op")
+    if op in _BINARY_OPS:
+        operands = node.get("args")
+        if not isinstance(operands, list) or len(operands) != 2:
+            return node
+        a, b = (_fold_expr(x) for x in operands)
+        if _const(a) and _const(b):
+            try:
+                return {"op": "const", "value": _BINARY_OPS[op](a["value"], b["value"])}
+            except (TypeError, ArithmeticError):
+                pass
+        if a is operands[0] and b is operands[1]:
+            return node
+        return {**node, "args": [a, b]}
+    if op == "coin_flips" and isinstance(node.get("count"), dict):
+        count = _fold_expr(node["count"])
+        if count is not node["count"]:
+            return {**node, "count": count["value"] if _const(count) else count}
+    return node
+
+
+def _fold_block(block):
+    if not isinstance(block, list):
+        return block
+    folded = [fold_effect(step) for step in block]
+    return block if all(a is b for a, b in zip(folded, block, strict=True)) else folded
+
+
+def fold_effect(node):
+    """`node` with constant subtrees folded (the same object if nothing folds)."""
+    if not isinstance(node, dict):
+        return node
+    op = node.get("op")
+    args = node.get("args")
+    if not isinstance(args, dict):
+        return node
+
+    if op == "seq":
+        new = {"steps": _fold_block(args.get("steps", []))}
+    elif op == "if":
+        cond = _fold_expr(args.get("condition"))
+        if _const(cond):
+            chosen = args.get("then", []) if cond["value"] else args.get("else", [])
+            return {"op": "seq", "args": {"steps": _fold_block(chosen)}}
+        new = {"condition": cond, "then": _fold_block(args.get("then", []))}
+        if "else" in args:
+            new["else"] = _fold_block(args["else"])
+    elif op == "repeat":
+        count = _fold_expr(args.get("count"))
+        if _const(count) and count["value"] <= 0:
+            return {"op": "seq", "args": {"steps": []}}
+        new = {"count": count, "body": _fold_block(args.get("body", []))}
+    elif op in PRIMITIVE_ARGS:
+        kinds = PRIMITIVE_ARGS[op]
+        new = {k: _fold_expr(v) if kinds.get(k) == "expr" else v for k, v in args.items()}
+    else:
+        return node
+
+    if all(new[k] is args.get(k) for k in new) and new.keys() == args.keys():
+        return node
+    return {**node, "args": new}
+
+
+def _expressions(node) -> Iterator[Any]:
+    """Every expression position (amounts, counts, conditions) in an effect tree."""
+    if not isinstance(node, dict) or not isinstance(node.get("args"), dict):
+        return
+    op, args = node.get("op"), node["args"]
+    if op in CONTROL_OPS:
+        for name in ("condition", "count"):
+            if name in args:
+                yield args[name]
+        for name in ("steps", "then", "else", "body"):
+            for step in args.get(name, ()):
+                yield from _expressions(step)
+    else:
+        kinds = PRIMITIVE_ARGS.get(op, {})
+        for name, value in args.items():
+            if kinds.get(name) == "expr":
+                yield value
+
+
+def is_state_independent(node) -> bool:
+    """True if every expression in the (folded) effect is a constant."""
+    return all(_const(expr) for expr in _expressions(fold_effect(node)))
+
+
+###############################################################
+# CARD DATABASES
+###############################################################
+
+@dataclass(frozen=True)
+class EffectReport:
+    card_id: str
+    # Attack name, or None for a trainer card's effect
+    attack: str | None
+    effect: dict
+    state_independent: bool
+    problems: Tuple[str, ...]
+
+
+def card_effects(card_id: str, entry: Mapping[str, Any]) -> Iterator[Tuple[str | None, dict]]:
+    for atk in entry.get("attacks", ()):
+        if atk.get("effect"):
+            yield atk.get("name"), atk["effect"]
+    if entry.get("effect"):
+        yield None, entry["effect"]
+
+
+def check_card_db(card_db: Mapping[str, Any]) -> List[EffectReport]:
+    """One report per effect in `card_db`; folded effects are only given for valid ones."""
+    reports = []
+    for card_id, entry in card_db.items():
+        for attack, effect in card_effects(card_id, entry):
+            problems = tuple(check_effect(effect))
+            folded = effect if problems else fold_effect(effect)
+            reports.append(EffectReport(
+                card_id, attack, folded, not problems and is_state_independent(folded), problems,
+            ))
+    return reports
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    from .cards import load_card_db
+
+    parser = argparse.ArgumentParser(prog="python -m ptcgengine.effect_analysis", description=__doc__.split("\n\n")[1])
+    parser.add_argument("card_db", nargs="?", default=None, help="Card database JSON (defaults to the packaged one)")
+    args = parser.parse_args(argv)
+
+    reports = check_card_db(load_card_db(args.card_db))
+    for r in reports:
+        where = f"{r.card_id} / {r.attack}" if r.attack is not None else r.card_id
+        kind = "INVALID" if r.problems else "static" if r.state_independent else "dynamic"
+        print(f"{kind:>8}  {where}")
+        for problem in r.problems:
+            print(f"          {problem}")
+    bad = sum(1 for r in reports if r.problems)
+    print(f"{len(reports)} effects, {sum(r.state_independent for r in reports)} state-independent, {bad} invalid")
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Fixed-shape NumPy encoding of game states.
+
+Each state becomes one float32 feature row plus one boolean legal-action
+row. Players are ordered from the point of view of the side to move: block
+0 describes state.active_player, block 1 the opponent. Per player block:
+
+    hp          current HP per slot (slot 0 = active, 1..MAX_BENCH = bench)
+    max_hp      printed HP per slot
+    occupied    1.0 where the slot holds a Pokémon
+    energy      attached energy counts, SLOTS x len(ENERGY_TYPES)
+    zone_sizes  len() of each zone in state.ZONES
+
+followed by the global block: turn number, one-hot phase and turn flags.
+A state still in PHASE_START is encoded as it stands after the start of
+turn (on a clone, with the draw done), the position its legal actions
+describe.
+unpack() returns named, shaped views over a feature array, so callers never
+need the raw offsets.
+
+Actions map to indices in a fixed space of NUM_ACTIONS: pass, retreat, one
+slot per attack position on the active Pokémon, one slot per energy type
+for attaching energy from hand, and MAX_CHOICES slots for the "choose"
+actions of a state waiting on an attack's choice (see api.step): slot k is
+the k-th choose action get_available_actions() returns, the empty
+selection first. legal_mask rows set True at the index of every action
+get_available_actions() returns, and action_from_index() maps a chosen
+index back to the action dict. Choose actions past the first MAX_CHOICES
+get no index and are left out of the mask.
+
+encode_into() is the batched path: it writes straight into caller-owned
+arrays, so encoding thousands of states allocates nothing per state beyond
+what the legal-action memo already holds.
+"""
+
+from itertools import chain
+
+import numpy as np
+
+from .action_generation import get_available_actions
+from .actions import ATTACH_ENERGY, ATTACK, CHOOSE, PASS, RETREAT
+from .energy import ENERGY_TYPES
+from .errors import EngineError
+from .state import ZONES
+from .turn_manager import (
+    PHASE_ATTACK,
+    PHASE_END,
+    PHASE_MAIN,
+    PHASE_START,
+    TURN_FLAG_DEFAULTS,
+    apply_phase_transitions,
+)
+
+MAX_BENCH = 5
+SLOTS = 1 + MAX_BENCH
+PHASES = (PHASE_START, PHASE_MAIN, PHASE_ATTACK, PHASE_END)
+FLAGS = tuple(TURN_FLAG_DEFAULTS)
+
+ENERGY_INDEX = {t: i for i, t in enumerate(ENERGY_TYPES)}
+PHASE_INDEX = {p: i for i, p in enumerate(PHASES)}
+
+# Action index space
+PASS_INDEX = 0
+RETREAT_INDEX = 1
+ATTACK_OFFSET = 2
+MAX_ATTACKS = 4
+ATTACH_OFFSET = ATTACK_OFFSET + MAX_ATTACKS
+CHOOSE_OFFSET = ATTACH_OFFSET + len(ENERGY_TYPES)
+MAX_CHOICES = 16
+NUM_ACTIONS = CHOOSE_OFFSET + MAX_CHOICES
+
+
+def _layout(fields, start=0):
+    out = {}
+    for name, width in fields:
+        out[name] = slice(start, start + width)
+        start += width
+    return out, start
+
+# name -> slice within one player block
+PLAYER_LAYOUT, PLAYER_WIDTH = _layout((
+    ("hp", SLOTS),
+    ("max_hp", SLOTS),
+    ("occupied", SLOTS),
+    ("energy", SLOTS * len(ENERGY_TYPES)),
+    ("zone_sizes", len(ZONES)),
+))
+# name -> slice within the whole row
+GLOBAL_LAYOUT, NUM_FEATURES = _layout((
+    ("turn", 1),
+    ("phase", len(PHASES)),
+    ("flags", len(FLAGS)),
+), start=2 * PLAYER_WIDTH)
+
+_HP = PLAYER_LAYOUT["hp"].start
+_MAX_HP = PLAYER_LAYOUT["max_hp"].start
+_OCCUPIED = PLAYER_LAYOUT["occupied"].start
+_ENERGY = PLAYER_LAYOUT["energy"].start
+_ZONES = PLAYER_LAYOUT["zone_sizes"].start
+_TURN = GLOBAL_LAYOUT["turn"].start
+_PHASE = GLOBAL_LAYOUT["phase"].start
+_FLAGS = GLOBAL_LAYOUT["flags"].start
+
+
+def energy_index(energy_type: str) -> int:
+    try:
+        return ENERGY_INDEX[energy_type]
+    except KeyError:
+        raise EngineError(f"Unknown energy type {energy_type!r}") from None
+
+
+###############################################################
+# ACTION INDICES
+###############################################################
+
+def _hand_for_actions(state):
+    """Cards an attach action may refer to (see action_generation)."""
+    p = state.players[state.active_player]
+    if state.phase == PHASE_START and p.deck:
+        return chain(p.hand, (p.deck[-1],))
+    return p.hand
+
+def action_index(state, action) -> int:
+    """Position of a legal action dict in the NUM_ACTIONS index space."""
+    t = action["type"]
+    if t == PASS:
+        return PASS_INDEX
+    if t == RETREAT:
+        return RETREAT_INDEX
+    if t == ATTACK:
+        mon = state.players[state.active_player].active
+        for i, atk in enumerate(mon.attacks if mon else ()):
+            if atk["name"] == action["attack_name"]:
+                if i >= MAX_ATTACKS:
+                    break
+                return ATTACK_OFFSET + i
+        raise EngineError(f"Attack {action['attack_name']!r} has no action index")
+    if t == ATTACH_ENERGY:
+        for c in _hand_for_actions(state):
+            if c.card_id == action["card_id"]:
+                return ATTACH_OFFSET + energy_index(c.energy_type)
+        raise EngineError(f"Energy card {action['card_id']} not found in hand")
+    if t == CHOOSE and state.pending is not None:
+        choices = get_available_actions(state)
+        if action in choices:
+            k = choices.index(action)
+            if k < MAX_CHOICES:
+                return CHOOSE_OFFSET + k
+        raise EngineError(f"Selection {action['selection']} has no action index")
+    raise EngineError(f"Action type {t!r} has no action index")
+
+def _indexed_actions(state, card_db):
+    """(index, action) for get_available_actions(state, card_db), in order (memoised)."""
+    key = ("indexed_actions", card_db is None)
+    memo = state.memo()
+    pairs = memo.get(key)
+    if pairs is None:
+        actions = get_available_actions(state, card_db)
+        if state.pending is not None:
+            actions = actions[:MAX_CHOICES]
+        pairs = memo[key] = tuple((action_index(state, a), a) for a in actions)
+    return pairs
+
+def legal_action_indices(state, card_db=None):
+    """Indices of the legal actions, in get_available_actions() order (memoised)."""
+    key = ("action_indices", card_db is None)
+    memo = state.memo()
+    indices = memo.get(key)
+    if indices is None:
+        indices = memo[key] = tuple(i for i, _ in _indexed_actions(state, card_db))
+    return indices
+
+def action_from_index(state, index, card_db=None):
+    """The legal action behind `index`; raises EngineError if it is not legal."""
+    for i, action in _indexed_actions(state, card_db):
+        if i == index:
+            return action
+    raise EngineError(f"Action index {index} is not legal in this state")
+
+
+###############################################################
+# STATE ENCODING
+###############################################################
+
+def allocate(n):
+    """Zeroed (features, legal_mask) arrays for a batch of n states."""
+    return (
+        np.zeros((n, NUM_FEATURES), dtype=np.float32),
+        np.zeros((n, NUM_ACTIONS), dtype=np.bool_),
+    )
+
+def encode(state, card_db=None):
+    """Encode one state as (features[NUM_FEATURES], legal_mask[NUM_ACTIONS])."""
+    features, mask = allocate(1)
+    encode_into([state], features, mask, card_db)
+    return features[0], mask[0]
+
+def encode_batch(states, card_db=None, out=None):
+    """
+    Encode a sequence of states as (features[n, NUM_FEATURES], legal_mask[n, NUM_ACTIONS]).
+    Pass `out` (e.g. from allocate()) to reuse buffers across calls.
+    """
+    if out is None:
+        out = allocate(len(states))
+    encode_into(states, *out, card_db)
+    return out
+
+def encode_into(states, features, mask, card_db=None, start=0):
+    """
+    Write `states` into rows start.. of preallocated `features` / `mask`
+    arrays (C-contiguous float32 / bool, as returned by allocate()).
+    """
+    n = len(states)
+    if features.dtype != np.float32 or mask.dtype != np.bool_:
+        raise TypeError("encode_into needs float32 features and a bool mask")
+    if not (features.flags.c_contiguous and mask.flags.c_contiguous):
+        raise ValueError("encode_into needs C-contiguous arrays")
+    if features.shape[1:] != (NUM_FEATURES,) or mask.shape[1:] != (NUM_ACTIONS,):
+        raise ValueError("encode_into got arrays of the wrong width")
+    if start + n > min(len(features), len(mask)):
+        raise ValueError(f"No room for {n} states at row {start}")
+
+    features[start:start + n] = 0
+    mask[start:start + n] = False
+    # Flat memoryviews: item assignment on them is much cheaper than
+    # numpy scalar indexing and creates no intermediate arrays.
+    buf = memoryview(features).cast("B").cast("f")
+    bits = memoryview(mask).cast("B")
+    width = len(ENERGY_TYPES)
+
+    for row, state in enumerate(states, start):
+        m = row * NUM_ACTIONS
+        for a in legal_action_indices(state, card_db):
+            bits[m + a] = 1
+        if state.phase == PHASE_START:
+            state = state.clone()
+            apply_phase_transitions(state)
+
+        base = row * NUM_FEATURES
+        me = state.active_player
+        for side in (0, 1):
+            p = state.players[me ^ side]
+            off = base + side * PLAYER_WIDTH
+            bench = p.bench
+            for slot in range(min(SLOTS, len(bench) + 1)):
+                mon = bench[slot - 1] if slot else p.active
+                if mon is None:
+                    continue
+                buf[off + _HP + slot] = mon.current_hp
+                buf[off + _MAX_HP + slot] = mon.hp
+                buf[off + _OCCUPIED + slot] = 1.0
+                e = off + _ENERGY + slot * width
+                for t, count in mon.energy_pool.items():
+                    buf[e + energy_index(t)] = count
+            buf[off + _ZONES] = len(p.deck)
+            buf[off + _ZONES + 1] = len(p.hand)
+            buf[off + _ZONES + 2] = len(p.bench)
+            buf[off + _ZONES + 3] = len(p.discard)
+
+        buf[base + _TURN] = state.turn
+        phase = PHASE_INDEX.get(state.phase)
+        if phase is not None:
+            buf[base + _PHASE + phase] = 1.0
+        flags = state.turn_flags
+        for i, name in enumerate(FLAGS):
+            if flags.get(name):
+                buf[base + _FLAGS + i] = 1.0
+
+def unpack(features):
+    """
+    Named views over an encoded batch (no copies):
+    hp / max_hp / occupied (n, 2, SLOTS), energy (n, 2, SLOTS, len(ENERGY_TYPES)),
+    zone_sizes (n, 2, len(ZONES)), turn (n,), phase (n, len(PHASES)), flags (n, len(FLAGS)).
+    """
+    players = features[..., :2 * PLAYER_WIDTH].reshape(*features.shape[:-1], 2, PLAYER_WIDTH)
+    out = {name: players[..., s] for name, s in PLAYER_LAYOUT.items()}
+    out["energy"] = out["energy"].reshape(*players.shape[:-1], SLOTS, len(ENERGY_TYPES))
+    out.update((name, features[..., s]) for name, s in GLOBAL_LAYOUT.items())
+    out["turn"] = out["turn"][..., 0]
+    return out
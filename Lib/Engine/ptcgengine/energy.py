@@ -1,32 +1,71 @@
 """
-Cost evaluation adapted for EnergyCard objects.
+Energy pools and attack cost evaluation.
+
+Every PokemonCard keeps an energy_pool ({energy_type: count}) that is
+updated incrementally whenever energy is attached (see attach_energy_card),
+and every attack cost is compiled once into an EnergyCost. Checking whether
+an attack is payable is then a handful of dict lookups, independent of how
+many cards are attached.
 """
 
+from __future__ import annotations
+
 from collections import Counter
-from .cards import EnergyCard, PokemonCard
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Tuple
 
-def get_pokemon_energy_pool(pokemon: PokemonCard):
-    types = [e.energy_type for e in pokemon.attached_energies]
-    return Counter(types)
+if TYPE_CHECKING:
+    from .cards import EnergyCard, PokemonCard
+
+COLORLESS = "C"
+
+# Every energy symbol the engine knows, in a fixed order (used for encodings)
+ENERGY_TYPES = ("G", "R", "W", "L", "P", "F", "D", "M", "Y", "N", COLORLESS)
 
-def has_energy_for_cost(pokemon: PokemonCard, cost, card_db=None):
-    if not cost:
-        return True
 
-    pool = get_pokemon_energy_pool(pokemon)
-    typed_reqs = []
-    colorless = 0
+@dataclass(frozen=True)
+class EnergyCost:
+    # ((energy_type, count), ...) for every non-colorless symbol
+    typed: Tuple[Tuple[str, int], ...]
+    # Total number of energy the attack needs, colorless included
+    total: int
 
-    for sym in cost:
-        if sym == "C":
-            colorless += 1
-        else:
-            typed_reqs.append(sym)
 
-    pool = pool.copy()
-    for t in typed_reqs:
-        if pool[t] <= 0:
+@lru_cache(maxsize=None)
+def _compile_cost(cost: Tuple[str, ...]) -> EnergyCost:
+    typed = Counter(sym for sym in cost if sym != COLORLESS)
+    return EnergyCost(typed=tuple(sorted(typed.items())), total=len(cost))
+
+def compile_cost(cost: Iterable[str]) -> EnergyCost:
+    """Precompiled form of an attack cost like ["L", "C"] (cached)."""
+    return _compile_cost(tuple(cost or ()))
+
+def get_pokemon_energy_pool(pokemon: PokemonCard):
+    return Counter(pokemon.energy_pool)
+
+def can_pay(pokemon: PokemonCard, cost: EnergyCost) -> bool:
+    if len(pokemon.attached_energies) < cost.total:
+        return False
+    pool = pokemon.energy_pool
+    for t, n in cost.typed:
+        if pool.get(t, 0) < n:
             return False
-        pool[t] -= 1
+    return True
+
+def has_energy_for_cost(pokemon: PokemonCard, cost, card_db=None):
+    if not cost:
+        return True
+    if not isinstance(cost, EnergyCost):
+        cost = compile_cost(cost)
+    return can_pay(pokemon, cost)
 
-    return sum(pool.values()) >= colorless
+def attach_energy_card(state, pokemon: PokemonCard, energy: EnergyCard) -> PokemonCard:
+    """Attach `energy` to `pokemon` through the state's mutation ops, updating its pool."""
+    pool = dict(pokemon.energy_pool)
+    pool[energy.energy_type] = pool.get(energy.energy_type, 0) + 1
+    return state.update_card(
+        pokemon,
+        attached_energies=pokemon.attached_energies + [energy],
+        energy_pool=pool,
+    )
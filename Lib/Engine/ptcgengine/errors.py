@@ -12,3 +12,6 @@ class PrimitiveError(EngineError):
 
 class InterpreterError(EngineError):
     pass
+
+class CardDataError(EngineError):
+    pass
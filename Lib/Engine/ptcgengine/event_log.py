@@ -0,0 +1,130 @@
+"""
+Persistent, append-only event log.
+
+EventLog is an immutable view over a chunked backing store. extend() returns
+a new log and leaves the old one untouched, but the two share every full
+chunk, so states cloned from one another share their history instead of
+copying it. Appending from the newest view of a backing store is amortised
+O(len(new events)); appending from an older view (a branch) copies only the
+chunk index and the partially filled last chunk.
+
+len() is O(1) and events newer than a known version (a previous length)
+are reached without walking the older history.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List
+
+from .events import GameEvent
+
+CHUNK_SIZE = 64
+
+
+class EventLog:
+    __slots__ = ("_chunks", "_len")
+
+    def __init__(self, events: Iterable[GameEvent] = ()):
+        self._chunks: List[List[GameEvent]] = []
+        self._len = 0
+        self._append_in_place(list(events))
+
+    @property
+    def version(self) -> int:
+        """Monotonic version of this log; equal to the number of events."""
+        return self._len
+
+    def extend(self, events: Iterable[GameEvent]) -> "EventLog":
+        """Return a new log with `events` appended."""
+        events = list(events)
+        if not events:
+            return self
+        new = EventLog.__new__(EventLog)
+        new._chunks = self._chunks if self._at_tip() else self._branch()
+        new._len = self._len
+        new._append_in_place(events)
+        return new
+
+    def append(self, event: GameEvent) -> "EventLog":
+        return self.extend((event,))
+
+    def since(self, version: int) -> Iterator[GameEvent]:
+        """Iterate over the events added after `version` (a previous len())."""
+        version = max(version, 0)
+        if version >= self._len:
+            return
+        ci, off = divmod(version, CHUNK_SIZE)
+        remaining = self._len - version
+        while remaining > 0:
+            chunk = self._chunks[ci]
+            part = chunk[off:off + remaining]
+            yield from part
+            remaining -= len(part)
+            ci += 1
+            off = 0
+
+    def newer_than(self, version: int) -> List[GameEvent]:
+        """Events added after `version`, as a list (for UI and network pushes)."""
+        return list(self.since(version))
+
+    def _at_tip(self) -> bool:
+        # True when nothing has been appended to the backing store past us.
+        n = self._len
+        full, rest = divmod(n, CHUNK_SIZE)
+        if rest:
+            return len(self._chunks) == full + 1 and len(self._chunks[-1]) == rest
+        return len(self._chunks) == full
+
+    def _branch(self) -> List[List[GameEvent]]:
+        full, rest = divmod(self._len, CHUNK_SIZE)
+        chunks = self._chunks[:full]
+        if rest:
+            chunks.append(self._chunks[full][:rest])
+        return chunks
+
+    def _append_in_place(self, events: List[GameEvent]) -> None:
+        chunks = self._chunks
+        i = 0
+        while i < len(events):
+            if not chunks or len(chunks[-1]) >= CHUNK_SIZE:
+                chunks.append([])
+            last = chunks[-1]
+            take = CHUNK_SIZE - len(last)
+            last.extend(events[i:i + take])
+            i += take
+        self._len += len(events)
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return self.since(0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("event log index out of range")
+        ci, off = divmod(index, CHUNK_SIZE)
+        return self._chunks[ci][off]
+
+    def __add__(self, events):
+        return self.extend(events)
+
+    def __eq__(self, other):
+        if isinstance(other, EventLog):
+            return self._len == other._len and list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __reduce__(self):
+        # Only pickle the events visible through this view.
+        return (EventLog, (list(self),))
+
+    def __repr__(self):
+        return f"<EventLog len={self._len}>"
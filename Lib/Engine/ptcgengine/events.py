@@ -19,6 +19,17 @@ def attack_event(source: str, target: str, damage: int) -> GameEvent:
     )
 
 
+def knockout_event(card_id: str, player: int) -> GameEvent:
+    return GameEvent(
+        type="knockout",
+        payload={"card_id": card_id, "player": player},
+    )
+
+
+def game_over_event(winner: int) -> GameEvent:
+    return GameEvent(type="game_over", payload={"winner": winner})
+
+
 def status_event(effect: str, target: str) -> GameEvent:
     return GameEvent(
         type="status_effect",
@@ -1,7 +1,30 @@
+import operator
+
+from . import rng
 from .errors import ExpressionError
-from .selectors import resolve_selector
+from .selectors import compile_selector, count_selector
+
+_BINARY_OPS = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "div": operator.truediv,
+    "eq": operator.eq,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "and": lambda a, b: a and b,
+    "or": lambda a, b: a or b,
+}
+
+EXPR_OPS = frozenset({"const", "var", "count", "coin_flips", *_BINARY_OPS})
 
 def eval_expr(node, game, ctx):
+    # Pre-compiled expression (see compile_expr)
+    if callable(node):
+        return node(game, ctx)
+
     op = node["op"]
 
     if op == "const":
@@ -40,8 +63,64 @@ def eval_expr(node, game, ctx):
 
     # count selector
     if op == "count":
-        sel = node["selector"]
-        objs = resolve_selector(sel, game, ctx)
-        return len(objs)
+        return count_selector(node["selector"], game, ctx)
+
+    # number of heads; "stream" optionally names a separate per-effect stream
+    if op == "coin_flips":
+        count = node.get("count", 1)
+        if isinstance(count, dict):
+            count = eval_expr(count, game, ctx)
+        return rng.coin_flips(game, count, ctx.controller, *_stream_label(node))
 
     raise ExpressionError(f"Unknown expression op: {op}")
+
+
+def compile_expr(node):
+    """
+    Compile an expression node into a closure fn(game, ctx) -> value.
+
+    Evaluates exactly like eval_expr, including raising ExpressionError for
+    unknown ops or variables, but only when the closure is called.
+    """
+    if callable(node):
+        return node
+
+    op = node["op"]
+
+    if op == "const":
+        value = node["value"]
+        return lambda game, ctx: value
+
+    if op == "var":
+        name = node["name"]
+
+        def var(game, ctx):
+            try:
+                return ctx.vars[name]
+            except KeyError:
+                raise ExpressionError(f"Unknown variable: {name}") from None
+        return var
+
+    if op in _BINARY_OPS:
+        fn = _BINARY_OPS[op]
+        a = compile_expr(node["args"][0])
+        b = compile_expr(node["args"][1])
+        return lambda game, ctx: fn(a(game, ctx), b(game, ctx))
+
+    if op == "count":
+        sel = compile_selector(node["selector"])
+        return getattr(sel, "count", None) or (lambda game, ctx: len(sel(game, ctx)))
+
+    if op == "coin_flips":
+        count = node.get("count", 1)
+        count = compile_expr(count) if isinstance(count, dict) else (lambda game, ctx, n=count: n)
+        label = _stream_label(node)
+        return lambda game, ctx: rng.coin_flips(game, count(game, ctx), ctx.controller, *label)
+
+    def unknown(game, ctx):
+        raise ExpressionError(f"Unknown expression op: {op}")
+    return unknown
+
+
+def _stream_label(node):
+    return (node["stream"],) if "stream" in node else ()
@@ -1,9 +1,17 @@
+import math
+
 from .errors import SelectorError
+from .zone_index import HP_BUCKET
+
+FILTER_TYPES = frozenset({"supertype", "pokemon_type", "card_type", "hp_at_least", "hp_at_most", "and"})
 
 def apply_filter(obj, flt):
     ftype = flt["type"]
     value = flt["value"]
 
+    if ftype == "supertype":
+        return getattr(obj, "supertype", None) == value
+
     if ftype == "pokemon_type":
         return hasattr(obj, "types") and value in obj.types
 
@@ -21,3 +29,116 @@ def apply_filter(obj, flt):
         return all(apply_filter(obj, sub) for sub in value)
 
     raise SelectorError(f"Unknown filter type: {ftype}")
+
+
+###############################################################
+# COMPILED CHAINS
+###############################################################
+
+def _flatten(filters):
+    for flt in filters:
+        if flt["type"] == "and":
+            yield from _flatten(flt["value"])
+        else:
+            yield flt
+
+def _predicate(flt):
+    ftype = flt["type"]
+    value = flt["value"]
+    if ftype == "supertype":
+        return lambda obj: getattr(obj, "supertype", None) == value
+    if ftype == "pokemon_type":
+        return lambda obj: value in getattr(obj, "types", ())
+    if ftype == "card_type":
+        return lambda obj: isinstance(obj, str) and obj.startswith(value)
+    if ftype == "hp_at_least":
+        return lambda obj: getattr(obj, "hp", None) is not None and obj.hp >= value
+    if ftype == "hp_at_most":
+        return lambda obj: getattr(obj, "hp", None) is not None and obj.hp <= value
+
+    def unknown(obj):
+        raise SelectorError(f"Unknown filter type: {ftype}")
+    return unknown
+
+# Filter type -> index key kind, most selective first
+_INDEXED = (("pokemon_type", "type"), ("supertype", "supertype"))
+
+
+class FilterChain:
+    """
+    A selector's filter list compiled into one predicate. With `indexed`,
+    one filter is answered by a zone_index key instead (candidates are that
+    key's cards) and counts over HP ranges are summed from the HP buckets.
+    """
+
+    __slots__ = ("key", "predicate", "hp_range")
+
+    def __init__(self, filters, indexed: bool = True):
+        rest = list(_flatten(filters))
+        self.key = None
+        if indexed:
+            for ftype, kind in _INDEXED:
+                flt = next((f for f in rest if f["type"] == ftype), None)
+                if flt is not None:
+                    self.key = (kind, flt["value"])
+                    rest.remove(flt)
+                    break
+            else:
+                if any(f["type"] in ("hp_at_least", "hp_at_most") for f in rest):
+                    self.key = ("hp", None)
+
+        self.hp_range = None
+        if self.key == ("hp", None) and all(f["type"] in ("hp_at_least", "hp_at_most") for f in rest):
+            # Candidates all have HP: one range check replaces the HP filters
+            lo, hi = -math.inf, math.inf
+            for f in rest:
+                if f["type"] == "hp_at_least":
+                    lo = max(lo, f["value"])
+                else:
+                    hi = min(hi, f["value"])
+            self.hp_range = (lo, hi)
+            self.predicate = lambda obj: lo <= obj.hp <= hi
+            return
+
+        preds = tuple(_predicate(f) for f in rest)
+        if not preds:
+            self.predicate = None
+        elif len(preds) == 1:
+            self.predicate = preds[0]
+        elif len(preds) == 2:
+            a, b = preds
+            self.predicate = lambda obj: a(obj) and b(obj)
+        else:
+            self.predicate = lambda obj: all(p(obj) for p in preds)
+
+    def filter(self, cards) -> list:
+        pred = self.predicate
+        return list(cards) if pred is None else [c for c in cards if pred(c)]
+
+    def candidates(self, player, zone: str):
+        if self.key is None:
+            return getattr(player, zone)
+        return player.index(zone).get(self.key)
+
+    def select(self, player, zone: str) -> list:
+        return self.filter(self.candidates(player, zone))
+
+    def count(self, player, zone: str) -> int:
+        if self.hp_range is not None:
+            return self._count_hp(player.index(zone))
+        cards = self.candidates(player, zone)
+        pred = self.predicate
+        return len(cards) if pred is None else sum(1 for c in cards if pred(c))
+
+    def _count_hp(self, index) -> int:
+        lo, hi = self.hp_range
+        pred = self.predicate
+        n = 0
+        for bucket, cards in index.hp_buckets():
+            low = bucket * HP_BUCKET
+            high = low + HP_BUCKET - 1
+            if lo <= low and high <= hi:
+                n += len(cards)
+            elif high >= lo and low <= hi:
+                n += sum(1 for c in cards if pred(c))
+        return n
@@ -0,0 +1,116 @@
+"""
+Zobrist-style position hashing.
+
+A position is described by a multiset of features: every card in a zone
+(with HP, attached energy and status for Pokémon), every turn flag, the
+active player, the phase, the winner and any pending choice. Each feature maps to a 64-bit key
+derived from blake2b, so keys are stable across processes and runs, and the
+position hash is the sum of its feature keys modulo 2**64. Summing (rather
+than XOR) keeps duplicate cards in a zone from cancelling out, and lets
+GameState update the hash incrementally: remove a feature's key, add the
+new one.
+
+Deliberately not hashed: the turn number and the order of cards inside a
+zone, so transpositions reached by different move orders collide on
+purpose. state_equal() compares positions under the same equivalence.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from functools import lru_cache
+
+MASK = (1 << 64) - 1
+
+# Top-level GameState fields that take part in the hash
+HASHED_FIELDS = ("active_player", "phase", "winner", "pending", "turn_flags")
+
+
+@lru_cache(maxsize=1 << 16)
+def feature_key(feature: tuple) -> int:
+    """Stable 64-bit key for a hashable feature tuple of str/int/None values."""
+    digest = hashlib.blake2b(repr(feature).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def card_feature(player: int, zone: str, card) -> tuple:
+    pool = getattr(card, "energy_pool", None)
+    if pool is None:
+        return ("card", player, zone, card.card_id)
+    return (
+        "card", player, zone, card.card_id, card.current_hp,
+        tuple(sorted(pool.items())), tuple(sorted(card.status)),
+    )
+
+
+def card_key(player: int, zone: str, card) -> int:
+    if card is None:
+        return 0
+    return feature_key(card_feature(player, zone, card))
+
+
+def field_key(name: str, value) -> int:
+    """Key for a HASHED_FIELDS entry; turn_flags sums one key per flag."""
+    if name == "turn_flags":
+        return sum(feature_key(("flag", k, v)) for k, v in value.items()) & MASK
+    return feature_key((name, _plain(name, value)))
+
+
+def _plain(name: str, value):
+    # A PendingChoice as a tuple of ids and numbers
+    if name == "pending" and value is not None:
+        definition, attack = value.source
+        options = tuple(c.card_id for c in value.choice.options)
+        return (definition.card_id, attack, value.controller, value.frames, value.choice.max, options)
+    return value
+
+
+def features(state) -> Counter:
+    """The multiset of features describing a position."""
+    from .state import ZONES
+
+    out = Counter()
+    for i, p in enumerate(state.players):
+        if p.active is not None:
+            out[card_feature(i, "active", p.active)] += 1
+        for zone in ZONES:
+            for card in getattr(p, zone):
+                out[card_feature(i, zone, card)] += 1
+    for k, v in state.turn_flags.items():
+        out[("flag", k, v)] += 1
+    for name in HASHED_FIELDS[:-1]:
+        out[(name, _plain(name, getattr(state, name)))] += 1
+    return out
+
+
+def compute_hash(state) -> int:
+    """Hash a position from scratch (what GameState.zobrist maintains incrementally)."""
+    return sum(feature_key(f) * n for f, n in features(state).items()) & MASK
+
+
+def public_key(state) -> int:
+    """
+    The position hash with every hand and deck counted only by size: the
+    part of a position that all determinizations along one line of play
+    share (see determinize.py), whatever the deal put in the hidden zones.
+    """
+    key = state.zobrist
+    for i, p in enumerate(state.players):
+        for zone in ("hand", "deck"):
+            cards = getattr(p, zone)
+            key -= sum(card_key(i, zone, c) for c in cards)
+            key += feature_key(("hidden", i, zone, len(cards)))
+    return key & MASK
+
+
+def state_equal(a, b) -> bool:
+    """
+    True when two states describe the same position (see module docstring).
+    Positions with different hashes are rejected without a full comparison.
+    """
+    if a is b:
+        return True
+    if a.zobrist != b.zobrist:
+        return False
+    return features(a) == features(b)
@@ -1,70 +1,275 @@
-from .expressions import eval_expr
-from .primitives import PRIMITIVES
+"""
+Effect interpreter.
+
+Effects run on an explicit stack of frames instead of recursing through
+seq / if / repeat: a frame is one block of effect nodes, the position of the
+next node in it and how many more times the block runs. Every event goes
+into one buffer owned by the Execution.
+
+Primitives listed in CHOICE_POINTS need a player decision (which cards
+search_deck takes, say). start_effect() returns an Execution that stops
+there with a Choice in `pending`; resume(selection) carries on from the same
+frame, so nothing runs twice. execute_effect() runs an effect to completion
+and settles every choice the way the primitive would on its own.
+
+A paused Execution can be stored on a GameState as a PendingChoice: the
+frames are kept as (block key, next index, remaining passes) below the root
+node, so restore() rebuilds the stack over any state from the same effect
+tree. That is how api.step() stops an attack at a choice until a "choose"
+action answers it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Sequence
+
+from .context import EffectContext
 from .errors import InterpreterError
-from .utils import trace
-from .events import attack_event, GameEvent
+from .events import GameEvent, attack_event
+from .expressions import eval_expr
+from .primitives import PRIMITIVES, take_from_deck
+from .selectors import resolve_selector
+from .tracing import DEBUG, STATS, channel, instrument
+
+_TRACE = channel("effect")
+
+
+@dataclass(frozen=True)
+class Choice:
+    """A decision an effect is waiting for: pick between `min` and `max` of `options`."""
+
+    op: str
+    player: int
+    options: tuple
+    min: int
+    max: int
+
+    @property
+    def default(self) -> tuple:
+        """What the primitive picks without a player: the first `max` options."""
+        return tuple(range(self.max))
+
+
+def _offer_search_deck(args, game, ctx, limit=None) -> Choice:
+    options = tuple(resolve_selector(args["selector"], game, ctx))
+    maxn = eval_expr(args["max"], game, ctx) if limit is None else limit
+    return Choice("search_deck", ctx.controller, options, 0, max(0, min(maxn, len(options))))
+
+def _resolve_search_deck(args, game, ctx, cards) -> None:
+    take_from_deck(game, ctx.controller, cards)
+
+
+# op -> (offer(args, game, ctx, limit=None) -> Choice, resolve(args, game, ctx, chosen cards)).
+# With `limit`, offer() only re-lists the options (see Execution.reoffer).
+CHOICE_POINTS: Dict[str, tuple[Callable, Callable]] = {
+    "search_deck": (_offer_search_deck, _resolve_search_deck),
+}
+
+
+# Block-valued args a frame can come from
+_BLOCKS = ("steps", "then", "else", "body")
+
+
+def has_choice_points(node) -> bool:
+    """True if running `node` can stop at a CHOICE_POINTS op."""
+    if not isinstance(node, dict):
+        return False
+    if node.get("op") in CHOICE_POINTS:
+        return True
+    args = node.get("args")
+    if not isinstance(args, dict):
+        return False
+    return any(has_choice_points(step) for key in _BLOCKS for step in args.get(key, ()))
+
+
+@dataclass(frozen=True)
+class PendingChoice:
+    """A paused effect, as stored on GameState.pending."""
+
+    choice: Choice
+    # What the effect belongs to, e.g. (attacker definition, attack name)
+    source: tuple
+    controller: int
+    # (block key, next index, remaining passes) per frame; the root frame's key is None
+    frames: tuple
+
 
+class Execution:
+    """
+    One run of an effect over `game`. Call run() (or resume() after a
+    choice); both return the pending Choice, or None once the effect is done.
+    """
+
+    __slots__ = ("game", "ctx", "events", "pending", "_stack", "_node")
+
+    def __init__(self, node, game, ctx, events: list | None = None):
+        self.game = game
+        self.ctx = ctx
+        self.events: list[GameEvent] = events if events is not None else []
+        self.pending: Choice | None = None
+        # Frames: [nodes, next index, remaining passes, block key]
+        self._stack: list[list] = [[(node,), 0, 1, None]]
+        self._node = None
+
+    @classmethod
+    def restore(cls, node, game, pending: PendingChoice, events: list | None = None) -> "Execution":
+        """The Execution `pending` was suspended from, over `game`; `node` is the root effect."""
+        execution = cls(node, game, EffectContext(pending.controller), events)
+        stack = []
+        nodes = (node,)
+        try:
+            for key, i, n in pending.frames:
+                if key is not None:
+                    nodes = stack[-1][0][stack[-1][1] - 1]["args"].get(key, [])
+                stack.append([nodes, i, n, key])
+            execution._node = nodes[i - 1]
+        except (IndexError, KeyError, TypeError):
+            raise InterpreterError("Pending choice does not fit this effect") from None
+        execution._stack = stack
+        execution.pending = pending.choice
+        return execution
+
+    def suspend(self, source: tuple) -> PendingChoice:
+        """The pending choice and where to resume, as plain data."""
+        if self.pending is None:
+            raise InterpreterError("Execution is not waiting for a choice")
+        frames = tuple((key, i, n) for _, i, n, key in self._stack)
+        return PendingChoice(self.pending, source, self.ctx.controller, frames)
+
+    def reoffer(self) -> Choice:
+        """
+        List the pending choice's options again from the current state (after
+        hidden zones were resampled, say), keeping its size limit.
+        """
+        choice = self.pending
+        node = self._node
+        self.pending = CHOICE_POINTS[node["op"]][0](node.get("args", {}), self.game, self.ctx, choice.max)
+        return self.pending
+
+    @property
+    def done(self) -> bool:
+        return not self._stack and self.pending is None
+
+    def run(self, choose: Callable[[Choice], Sequence[int]] | None = None) -> Choice | None:
+        """
+        Run until the effect finishes or reaches a choice point. With
+        `choose`, choices are answered on the spot by choose(choice) ->
+        indices into choice.options, and run() only returns once done.
+        """
+        if self.pending is not None:
+            raise InterpreterError("Execution is waiting for a choice; call resume()")
+        game, ctx, stack = self.game, self.ctx, self._stack
+        while stack:
+            frame = stack[-1]
+            nodes, i = frame[0], frame[1]
+            if i == len(nodes):
+                frame[2] -= 1
+                if frame[2] > 0:
+                    frame[1] = 0
+                else:
+                    stack.pop()
+                continue
+            frame[1] = i + 1
+            node = nodes[i]
+            op = node.get("op")
+            args = node.get("args", {})
+
+            if op is None:
+                if "type" not in node:
+                    raise InterpreterError("Effect node missing 'op'")
+                event = _direct_event(node, ctx)
+                if event is not None:
+                    self.events.append(event)
+                continue
+
+            if _TRACE.debug:
+                _TRACE.emit(DEBUG, "exec", op=op)
+            if STATS.enabled:
+                STATS.count(f"effect.{op}")
+
+            if op == "seq":
+                stack.append([args["steps"], 0, 1, "steps"])
+            elif op == "if":
+                key = "then" if eval_expr(args["condition"], game, ctx) else "else"
+                stack.append([args.get(key, []), 0, 1, key])
+            elif op == "repeat":
+                n = eval_expr(args["count"], game, ctx)
+                if n > 0:
+                    stack.append([args["body"], 0, n, "body"])
+            elif op in CHOICE_POINTS:
+                choice = CHOICE_POINTS[op][0](args, game, ctx)
+                self.pending, self._node = choice, node
+                if choose is None:
+                    return choice
+                self._settle(choose(choice))
+            elif op in PRIMITIVES:
+                PRIMITIVES[op](args, game, ctx)
+            else:
+                raise InterpreterError(f"Unknown op: {op}")
+        return None
+
+    def resume(self, selection: Sequence[int], choose=None) -> Choice | None:
+        """Answer the pending choice with indices into its options and keep running."""
+        self._settle(selection)
+        return self.run(choose)
 
+    def _settle(self, selection: Sequence[int]) -> None:
+        choice = self.pending
+        if choice is None:
+            raise InterpreterError("Execution is not waiting for a choice")
+        picked = list(selection)
+        if len(set(picked)) != len(picked) or not choice.min <= len(picked) <= choice.max:
+            raise InterpreterError(f"Pick {choice.min}..{choice.max} distinct options, got {picked}")
+        if any(not 0 <= i < len(choice.options) for i in picked):
+            raise InterpreterError(f"Choice index out of range: {picked}")
+        node = self._node
+        self.pending = self._node = None
+        CHOICE_POINTS[node["op"]][1](node.get("args", {}), self.game, self.ctx, [choice.options[i] for i in picked])
+
+
+def reoffer(node, game, pending: PendingChoice) -> PendingChoice:
+    """`pending` with its options listed again from `game` (see Execution.reoffer)."""
+    execution = Execution.restore(node, game, pending)
+    execution.reoffer()
+    return execution.suspend(pending.source)
+
+
+def start_effect(node, game, ctx, events: list | None = None) -> Execution:
+    """Begin executing `node`; the result is paused at the first choice point, if any."""
+    execution = Execution(node, game, ctx, events)
+    execution.run()
+    return execution
+
+
+def _default_choice(choice: Choice) -> tuple:
+    return choice.default
+
+
+@instrument("execute_effect")
 def execute_effect(node, game, ctx):
     """
-    Executes an effect in a pure functional way and returns:
+    Executes an effect and returns:
       (next_state, events: list[GameEvent])
 
-    Existing primitives still operate by mutating the provided game state in place.
+    Primitives mutate the provided game state in place; choice points take
+    their default (see Choice.default).
     """
-    op = node.get("op")
-    args = node.get("args", {})
-
-    # Support simple declarative event payloads (non-op style)
-    # Example: {"type": "attack", "damage": 30, ...}
-    if op is None and "type" in node:
-        return _handle_direct_event(node, game, ctx)
-
-    if op is None:
-        raise InterpreterError("Effect node missing 'op'")
-
-    trace("EXEC:", op)
-
-    if op == "seq":
-        events: list[GameEvent] = []
-        for step in args["steps"]:
-            game, evts = execute_effect(step, game, ctx)
-            events.extend(evts)
-        return game, events
-
-    if op == "if":
-        cond = eval_expr(args["condition"], game, ctx)
-        block = args["then"] if cond else args.get("else", [])
-        events: list[GameEvent] = []
-        for s in block:
-            game, evts = execute_effect(s, game, ctx)
-            events.extend(evts)
-        return game, events
-
-    if op == "repeat":
-        n = eval_expr(args["count"], game, ctx)
-        events: list[GameEvent] = []
-        for _ in range(n):
-            for s in args["body"]:
-                game, evts = execute_effect(s, game, ctx)
-                events.extend(evts)
-        return game, events
-
-    if op in PRIMITIVES:
-        game = PRIMITIVES[op](args, game, ctx)
-        return game, []
-
-    raise InterpreterError(f"Unknown op: {op}")
+    execution = Execution(node, game, ctx)
+    execution.run(_default_choice)
+    return execution.game, execution.events
 
 
-def _handle_direct_event(node, game, ctx):
-    """Map simple effect dicts to structured GameEvents."""
-    ev_type = node.get("type")
-    if ev_type == "attack":
-        dmg = node.get("damage", 0)
+def _direct_event(node, ctx) -> GameEvent | None:
+    # Simple declarative event payloads (non-op style), e.g.
+    # {"type": "attack", "damage": 30, ...}
+    if node.get("type") == "attack":
         source = getattr(getattr(ctx, "active", None), "card_id", "unknown")
-        target = node.get("target", "unknown")
-        ev = attack_event(source=source, target=target, damage=dmg)
-        return game, [ev]
+        return attack_event(source=source, target=node.get("target", "unknown"), damage=node.get("damage", 0))
+    return None
 
-    return game, []
+
+def _handle_direct_event(node, game, ctx):
+    """Map simple effect dicts to structured GameEvents."""
+    event = _direct_event(node, ctx)
+    return game, [event] if event is not None else []
@@ -0,0 +1,292 @@
+"""
+Monte Carlo tree search opponent.
+
+MCTS runs UCT over api.get_available_actions / api.apply: every iteration
+walks one working copy of the position down the tree, expands a node,
+plays a rollout with a sim policy ("random", "heuristic" or any
+Policy callable) and then rolls the whole line back with a single undo(), so
+no GameState is cloned per node or per rollout. Search stops at whichever
+budget runs out first: `iterations` or `time_limit` seconds of wall clock.
+
+Nodes are keyed by the position hash (GameState.zobrist) reached after their
+move. When search() is called again later in the game, the node matching the
+new position is looked up a few plies below the previous root and its
+subtree (with all its statistics) becomes the new root.
+
+By default the search sees the full state, including deck order and the
+opponent's hand. Given the deck lists (`deck_lists`), it searches the
+information set instead: every iteration redeals the hidden zones with a
+determinize.Determinizer and only follows moves that are legal in that
+deal (single-observer ISMCTS). A node then stands for every deal along
+its line of play, so it is keyed by hashing.public_key (hands and decks by
+size only) rather than by whichever deal first reached it, and a tree is
+only reused for the player it was searched for.
+
+MCTSOpponent wraps an MCTS in a single background thread so a UI can keep
+drawing while the opponent thinks: think() returns a Future.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Sequence
+
+from . import api
+from .determinize import Determinizer
+from .hashing import public_key
+from .registry import default_registry
+from .sim import Policy, aggressive_policy, random_policy
+
+ROLLOUTS = {
+    "random": random_policy,
+    "heuristic": aggressive_policy,
+}
+
+# How many plies below the previous root search() looks for the new position
+REUSE_DEPTH = 4
+
+
+class Node:
+    __slots__ = ("action", "parent", "player", "key", "children", "untried", "visits", "value")
+
+    def __init__(self, action, parent, player, key):
+        self.action = action
+        self.parent = parent
+        # Player who made `action`; value is from their point of view
+        self.player = player
+        self.key = key
+        self.children: List[Node] = []
+        self.untried: List[dict] | None = None
+        self.visits = 0
+        self.value = 0.0
+
+    def best_child(self, exploration, children):
+        log_n = math.log(self.visits)
+        best, best_score = None, -math.inf
+        for child in children:
+            score = child.value / child.visits + exploration * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    action: dict
+    iterations: int
+    elapsed: float
+    # Visits of the chosen move / of the root
+    visits: int
+    root_visits: int
+    # Mean rollout score of the chosen move for the player to move, in [0, 1]
+    value: float
+
+
+class MCTS:
+    def __init__(
+        self,
+        card_db: Mapping[str, Any] | None = None,
+        iterations: int | None = None,
+        time_limit: float | None = 1.0,
+        rollout: Policy | str = "random",
+        exploration: float = 1.4,
+        max_rollout_steps: int = 200,
+        seed: int | None = None,
+        deck_lists: Sequence[Any] | None = None,
+    ):
+        if iterations is None and time_limit is None:
+            raise ValueError("MCTS needs an iteration or a time budget")
+        if isinstance(rollout, str):
+            try:
+                rollout = ROLLOUTS[rollout]
+            except KeyError:
+                raise ValueError(f"Unknown rollout {rollout!r}; choose from {sorted(ROLLOUTS)}") from None
+        self.card_db = card_db
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.rollout = rollout
+        self.exploration = exploration
+        self.max_rollout_steps = max_rollout_steps
+        self.rng = random.Random(seed)
+        self.deck_lists = deck_lists
+        self.root: Node | None = None
+        # The player the tree was searched for
+        self.observer = 0
+
+    def search(self, state, iterations=None, time_limit=None, stop: threading.Event | None = None) -> SearchResult:
+        """
+        Pick a move for the player to move in `state` (which is not modified).
+        Budgets default to the ones given to the constructor; setting `stop`
+        ends the search early with the best move found so far.
+        """
+        iterations = iterations if iterations is not None else self.iterations
+        time_limit = time_limit if time_limit is not None else self.time_limit
+        start = time.perf_counter()
+        deadline = start + time_limit if time_limit is not None else math.inf
+
+        work = state.clone()
+        if self.deck_lists is not None and work.active_player != self.observer:
+            self.root = None
+        self.observer = work.active_player
+        key = self._key(work)
+        root = self.root = self._reuse(key) or Node(None, None, None, key)
+        determinizer = None
+        if self.deck_lists is not None:
+            card_db = self.card_db if self.card_db is not None else default_registry()
+            determinizer = Determinizer(
+                work, work.active_player, self.deck_lists, card_db, seed=self.rng.getrandbits(32)
+            )
+        done = 0
+        while (iterations is None or done < iterations) and time.perf_counter() < deadline:
+            if stop is not None and stop.is_set():
+                break
+            self._iterate(root, work, determinizer)
+            done += 1
+        if root.untried is None:
+            self._iterate(root, work, determinizer)
+            done += 1
+        if not root.children:
+            raise ValueError("No legal actions to search")
+
+        best = max(root.children, key=lambda c: c.visits)
+        return SearchResult(
+            action=best.action,
+            iterations=done,
+            elapsed=time.perf_counter() - start,
+            visits=best.visits,
+            root_visits=root.visits,
+            value=best.value / best.visits,
+        )
+
+    def reset(self) -> None:
+        """Forget the search tree (e.g. when a new game starts)."""
+        self.root = None
+
+    def _iterate(self, root, work, determinizer=None):
+        card_db = self.card_db
+        if determinizer is not None:
+            work.commit()
+            determinizer.sample_into(work)
+        node = root
+        first = None
+
+        # Selection
+        while True:
+            if determinizer is None:
+                if node.untried is None:
+                    node.untried = self._legal(work)
+                children = node.children
+            else:
+                # Only moves that exist in this deal are candidates
+                legal = self._legal(work)
+                children = [c for c in node.children if c.action in legal]
+                node.untried = [a for a in legal if all(c.action != a for c in node.children)]
+            if node.untried or not children:
+                break
+            node = node.best_child(self.exploration, children)
+            token = api.apply(work, node.action, card_db)
+            first = first or token
+
+        # Expansion
+        if node.untried:
+            action = node.untried.pop(self.rng.randrange(len(node.untried)))
+            player = work.active_player
+            token = api.apply(work, action, card_db)
+            first = first or token
+            child = Node(action, node, player, self._key(work))
+            node.children.append(child)
+            node = child
+
+        # Rollout
+        winner = work.winner
+        steps = 0
+        while winner is None and steps < self.max_rollout_steps:
+            actions = api.get_available_actions(work, card_db)
+            if not actions:
+                break
+            token = api.apply(work, self.rollout(work, actions, self.rng), card_db)
+            first = first or token
+            winner = work.winner
+            steps += 1
+
+        if first is not None:
+            api.undo(work, first)
+
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.value += 0.5
+            elif winner == node.player:
+                node.value += 1.0
+            node = node.parent
+
+    def _legal(self, work):
+        if work.winner is not None:
+            return []
+        return api.get_available_actions(work, self.card_db)
+
+    def _key(self, work) -> int:
+        if self.deck_lists is None:
+            return work.zobrist
+        return public_key(work)
+
+    def _reuse(self, key):
+        if self.root is None:
+            return None
+        frontier = [self.root]
+        for _ in range(REUSE_DEPTH + 1):
+            for node in frontier:
+                if node.key == key and node.visits:
+                    node.parent = None
+                    node.action = None
+                    return node
+            frontier = [c for node in frontier for c in node.children]
+        return None
+
+
+class MCTSOpponent:
+    """
+    Computer player driven by MCTS, searching on a background thread.
+
+    think(state) returns a Future resolving to the chosen action dict; the
+    caller keeps using `state`, which the search never mutates.
+
+    The search is pure Python, so while it runs it holds the GIL for most of
+    each switch interval and a render loop on the main thread gets fewer
+    frames. Keep time_limit short for interactive use, and close() the
+    opponent when it is no longer needed so the worker thread exits.
+    """
+
+    def __init__(self, player: int = 1, **mcts_options):
+        self.player = player
+        self.mcts = MCTS(**mcts_options)
+        self.last_result: SearchResult | None = None
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mcts")
+
+    def wants_to_move(self, state) -> bool:
+        return getattr(state, "winner", None) is None and getattr(state, "active_player", None) == self.player
+
+    def think(self, state) -> Future:
+        self._stop.clear()
+        # Clone here rather than on the worker: clone() touches bookkeeping
+        # on the source state, which belongs to the caller's thread.
+        return self._executor.submit(self._search, state.clone())
+
+    def cancel(self) -> None:
+        """Ask a running search to return its best move now."""
+        self._stop.set()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _search(self, state):
+        self.last_result = self.mcts.search(state, stop=self._stop)
+        return self.last_result.action
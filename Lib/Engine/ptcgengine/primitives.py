@@ -1,49 +1,53 @@
+from .energy import attach_energy_card
 from .expressions import eval_expr
 from .selectors import resolve_single_target, resolve_selector
 from .errors import PrimitiveError
 
 PRIMITIVES = {}
+# name -> {arg: kind}; kinds are "selector", "expr", "zone" and "value"
+# (checked by effect_analysis when cards are loaded)
+PRIMITIVE_ARGS = {}
 
-def primitive(name):
+def primitive(name, **arg_kinds):
     def wrapper(fn):
         PRIMITIVES[name] = fn
+        PRIMITIVE_ARGS[name] = arg_kinds
         return fn
     return wrapper
 
-@primitive("deal_damage")
+@primitive("deal_damage", target="selector", amount="expr")
 def deal_damage(args, game, ctx):
     target = resolve_single_target(args["target"], game, ctx)
     amount = eval_expr(args["amount"], game, ctx)
     # Use current_hp for runtime damage tracking
-    target.current_hp -= amount
+    game.update_card(target, current_hp=target.current_hp - amount)
     return game
 
-@primitive("heal")
+@primitive("heal", target="selector", amount="expr")
 def heal(args, game, ctx):
     target = resolve_single_target(args["target"], game, ctx)
     amount = eval_expr(args["amount"], game, ctx)
-    target.current_hp += amount
+    game.update_card(target, current_hp=target.current_hp + amount)
     return game
 
-@primitive("draw")
+@primitive("draw", count="expr")
 def draw(args, game, ctx):
     player = game.players[ctx.controller]
     count = eval_expr(args["count"], game, ctx)
-    for _ in range(count):
-        if player.deck:
-            player.hand.append(player.deck.pop())
+    for _ in range(min(count, len(player.deck))):
+        game.add_card(ctx.controller, "hand", game.take_card(ctx.controller, "deck"))
     return game
 
-@primitive("discard_from_hand")
+@primitive("discard_from_hand", count="expr")
 def discard_from_hand(args, game, ctx):
     player = game.players[ctx.controller]
     count = eval_expr(args["count"], game, ctx)
     for _ in range(min(count, len(player.hand))):
-        card = player.hand.pop(0)
-        player.discard.append(card)
+        card = game.take_card(ctx.controller, "hand", 0)
+        game.add_card(ctx.controller, "discard", card)
     return game
 
-@primitive("attach_energy")
+@primitive("attach_energy", to="selector", energy_card="value")
 def attach_energy(args, game, ctx):
     """
     Generic effect-level attach (e.g. 'attach from discard').
@@ -51,7 +55,7 @@ def attach_energy(args, game, ctx):
     """
     target = resolve_single_target(args["to"], game, ctx)
     energy_card = args["energy_card"]
-    target.attached_energies.append(energy_card)
+    attach_energy_card(game, target, energy_card)
     return game
 
 @primitive("switch_active")
@@ -60,36 +64,35 @@ def switch_active(args, game, ctx):
     if not player.bench:
         raise PrimitiveError("No bench Pokémon to switch with.")
     old_active = player.active
-    new_active = player.bench.pop(0)
+    new_active = game.take_card(ctx.controller, "bench", 0)
     if old_active:
-        player.bench.insert(0, old_active)
-    player.active = new_active
+        game.add_card(ctx.controller, "bench", old_active, 0)
+    game.set_active(ctx.controller, new_active)
     return game
 
-@primitive("move_card")
+@primitive("move_card", src="zone", dst="zone", card="value")
 def move_card(args, game, ctx):
     src = args["src"]
     dst = args["dst"]
     card = args["card"]
 
-    src_list = getattr(game.players[ctx.controller], src)
-    dst_list = getattr(game.players[ctx.controller], dst)
-
-    if card not in src_list:
+    if card not in getattr(game.players[ctx.controller], src):
         raise PrimitiveError("Card not in source zone.")
 
-    src_list.remove(card)
-    dst_list.append(card)
+    game.remove_card(ctx.controller, src, card)
+    game.add_card(ctx.controller, dst, card)
 
     return game
 
-@primitive("search_deck")
+@primitive("search_deck", selector="selector", max="expr")
 def search_deck(args, game, ctx):
-    player = game.players[ctx.controller]
     sel = resolve_selector(args["selector"], game, ctx)
     maxn = eval_expr(args["max"], game, ctx)
-    chosen = sel[:maxn]
-    for c in chosen:
-        player.deck.remove(c)
-        player.hand.append(c)
+    take_from_deck(game, ctx.controller, sel[:maxn])
     return game
+
+def take_from_deck(game, player, cards):
+    """Move `cards` from the deck of `player` to their hand."""
+    for c in cards:
+        game.remove_card(player, "deck", c)
+        game.add_card(player, "hand", c)
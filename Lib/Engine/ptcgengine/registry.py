@@ -1,6 +1,139 @@
 """
-For future use:
-- card registration
-- templates
-- effect expansion
+Process-wide card definition registry.
+
+A CardRegistry is loaded once from a card_db JSON file, builds the interned
+definition for every card up front (attack effects are compiled lazily, on
+first use, per card_id; see cards.attack_effects), and keeps secondary
+indexes for the lookups deck building, AI evaluation and selectors
+need: by supertype, energy type, Pokémon type, stage, attack cost and
+CardIdentity.canonical_id.
+
+It is a read-only Mapping of card_id -> raw entry, so it can be passed
+anywhere a card_db dict is accepted (get_available_actions, step,
+create_card_instance, ...).
 """
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Sequence, Tuple
+
+from .card_identity import make_canonical_id
+from .card_instance import DEFAULT_NAMESPACE, CardInstance
+from .cards import DEFAULT_CARD_DB_PATH, CardDef, get_definition, load_card_db
+
+
+def cost_key(cost: Iterable[str]) -> Tuple[str, ...]:
+    """Order-independent key for an attack cost like ["L", "C", "C"]."""
+    return tuple(sorted(cost))
+
+
+class CardRegistry(Mapping):
+    def __init__(self, entries: Dict[str, Any], namespace: str = DEFAULT_NAMESPACE, path: str | None = None):
+        self.namespace = namespace
+        self.path = path
+        self._entries = dict(entries)
+        self._definitions: Dict[str, CardDef] = {}
+        self._canonical: Dict[str, CardDef] = {}
+        self._by_supertype: Dict[str, list] = defaultdict(list)
+        self._by_energy_type: Dict[str, list] = defaultdict(list)
+        self._by_pokemon_type: Dict[str, list] = defaultdict(list)
+        self._by_stage: Dict[str, list] = defaultdict(list)
+        self._by_attack_cost: Dict[Tuple[str, ...], list] = defaultdict(list)
+
+        for card_id, entry in self._entries.items():
+            self._index(get_definition(card_id, self._entries), entry)
+
+    @classmethod
+    def from_file(cls, path=None, namespace: str = DEFAULT_NAMESPACE) -> "CardRegistry":
+        path = str(Path(path or DEFAULT_CARD_DB_PATH).resolve())
+        return cls(load_card_db(path), namespace=namespace, path=path)
+
+    def _index(self, definition: CardDef, entry: Dict[str, Any]) -> None:
+        card_id = definition.card_id
+        self._definitions[card_id] = definition
+        self._canonical[make_canonical_id(self.namespace, card_id).canonical_id] = definition
+        self._by_supertype[definition.supertype].append(definition)
+        if definition.supertype == "energy":
+            self._by_energy_type[definition.energy_type].append(definition)
+        if definition.supertype == "pokemon":
+            for t in definition.types:
+                self._by_pokemon_type[t].append(definition)
+            self._by_stage[str(entry.get("stage", "basic")).lower()].append(definition)
+            for atk in definition.attacks:
+                self._by_attack_cost[cost_key(atk.get("cost", []))].append((definition, atk))
+
+    # ---------------------------
+    # Mapping interface (raw entries)
+    # ---------------------------
+    def __getitem__(self, card_id: str) -> Dict[str, Any]:
+        return self._entries[card_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------------------------
+    # Definition lookups
+    # ---------------------------
+    def definition(self, card_id: str) -> CardDef:
+        try:
+            return self._definitions[card_id]
+        except KeyError:
+            raise ValueError(f"card_id {card_id} not found in DB") from None
+
+    def by_canonical_id(self, canonical_id: str) -> CardDef:
+        try:
+            return self._canonical[canonical_id]
+        except KeyError:
+            raise ValueError(f"No card registered for {canonical_id}") from None
+
+    def for_instance(self, card: CardInstance) -> CardDef:
+        """Definition behind a persistent CardInstance (e.g. from a Deck)."""
+        return self.by_canonical_id(card.canonical_id)
+
+    def by_supertype(self, supertype: str) -> Sequence[CardDef]:
+        return tuple(self._by_supertype.get(supertype, ()))
+
+    def by_energy_type(self, energy_type: str) -> Sequence[CardDef]:
+        return tuple(self._by_energy_type.get(energy_type, ()))
+
+    def by_pokemon_type(self, pokemon_type: str) -> Sequence[CardDef]:
+        return tuple(self._by_pokemon_type.get(pokemon_type, ()))
+
+    def by_stage(self, stage: str) -> Sequence[CardDef]:
+        return tuple(self._by_stage.get(stage.lower(), ()))
+
+    def by_attack_cost(self, cost: Iterable[str]) -> Sequence[Tuple[CardDef, Dict[str, Any]]]:
+        """(definition, attack) pairs whose attack cost matches `cost` in any order."""
+        return tuple(self._by_attack_cost.get(cost_key(cost), ()))
+
+    def __reduce__(self):
+        # File-backed registries are reloaded through the per-process cache,
+        # so worker processes build each registry once.
+        if self.path is not None:
+            return (load_registry, (self.path, self.namespace))
+        return (CardRegistry, (self._entries, self.namespace))
+
+    def __repr__(self):
+        return f"<CardRegistry {len(self)} cards ns={self.namespace} path={self.path}>"
+
+
+@lru_cache(maxsize=None)
+def _load_registry(path: str, namespace: str) -> CardRegistry:
+    return CardRegistry.from_file(path, namespace=namespace)
+
+
+def load_registry(path=None, namespace: str = DEFAULT_NAMESPACE) -> CardRegistry:
+    """Process-wide registry for a card_db file, loaded on first use only."""
+    return _load_registry(str(Path(path or DEFAULT_CARD_DB_PATH).resolve()), namespace)
+
+
+def default_registry() -> CardRegistry:
+    """Registry for the packaged card_db.json."""
+    return load_registry()
@@ -0,0 +1,312 @@
+"""
+Compact binary game replays.
+
+A replay stores how a game was set up (seed, both deck lists, hand size)
+and then one byte per action: the action's position in
+get_available_actions() for the state it was played in. Since new_game()
+and every rule are deterministic for a given seed, that is enough to rebuild
+every state of the game. Every `snapshot_every` turns a full snapshot of the
+state at the start of the turn is written as well, and a footer indexes the
+snapshots, so seek(T) restores the nearest snapshot at or before turn T and
+replays forward from there instead of from the first move.
+
+Layout (integers are unsigned LEB128 varints unless noted):
+
+    b"PTCGRP" | format version (1 byte)
+    header length | header (canonical JSON: seed, decks, hand_size, snapshot_every)
+        decks are [name, [[definition_id, run length], ...]] in deck order
+    body: records
+        0x00-0xFD            action at that position
+        0xFE, n              action at position n (large hands)
+        0xFF, len, payload   snapshot (state_codec, without the event log)
+    footer: count, then (turn, snapshot offset in body, actions before it) per snapshot
+    footer position relative to the body (4 bytes, little endian)
+
+Seeked states carry no event history from before their snapshot; the
+events of the replayed moves are in their event_log as usual. Archives of
+many replays are plain concatenations with a 4-byte length before each (see
+write_archive / read_archive).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping
+
+from . import api
+from .card_instance import create_instance
+from .deck import Deck
+from .errors import EngineError
+from .serialization import dump_canonical
+from .state import GameState
+from .state_codec import decode_state, encode_state
+
+MAGIC = b"PTCGRP"
+FORMAT_VERSION = 2
+
+_ESCAPE = 0xFE
+_SNAPSHOT = 0xFF
+_U32 = struct.Struct("<I")
+
+
+def _write_varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def _read_varint(data, pos: int) -> tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _deck_to_json(deck: Deck):
+    runs = []
+    for card in deck.cards:
+        def_id = card.identity.definition_id
+        if runs and runs[-1][0] == def_id:
+            runs[-1][1] += 1
+        else:
+            runs.append([def_id, 1])
+    return [deck.name, runs]
+
+def _deck_from_json(data) -> Deck:
+    name, runs = data
+    return Deck(name=name, cards=[create_instance(def_id) for def_id, n in runs for _ in range(n)])
+
+
+###############################################################
+# RECORDING
+###############################################################
+
+class ReplayRecorder:
+    """
+    Plays a game through api while recording it.
+
+        rec = ReplayRecorder(deck_a, deck_b, card_db, seed=1)
+        while rec.state.winner is None:
+            rec.step(choose(rec.state, api.get_available_actions(rec.state, card_db)))
+        data = rec.to_bytes()
+    """
+
+    def __init__(
+        self,
+        deck_a: Deck,
+        deck_b: Deck,
+        card_db: Mapping[str, Any],
+        seed: int = 0,
+        hand_size: int = 7,
+        snapshot_every: int = 10,
+    ):
+        self.card_db = card_db
+        self.header = {
+            "seed": seed,
+            "decks": [_deck_to_json(deck_a), _deck_to_json(deck_b)],
+            "hand_size": hand_size,
+            "snapshot_every": snapshot_every,
+        }
+        self.snapshot_every = snapshot_every
+        self.state = api.new_game(deck_a, deck_b, card_db, seed=seed, hand_size=hand_size)
+        self.actions = 0
+        self._body = bytearray()
+        self._index: List[tuple[int, int, int]] = []
+        self._snapshot_turn = 1
+
+    def step(self, action):
+        """Apply `action` (one of get_available_actions) and record it; returns step()'s result."""
+        legal = api.get_available_actions(self.state, self.card_db)
+        try:
+            pos = legal.index(action)
+        except ValueError:
+            raise EngineError(f"Action {action!r} is not legal here") from None
+        body = self._body
+        if pos < _ESCAPE:
+            body.append(pos)
+        else:
+            body.append(_ESCAPE)
+            _write_varint(body, pos)
+        self.actions += 1
+
+        self.state, events = api.step(self.state, legal[pos], self.card_db)
+        turn = self.state.turn
+        if turn > self._snapshot_turn and turn % self.snapshot_every == 0 and self.state.winner is None:
+            self._snapshot_turn = turn
+            self._index.append((turn, len(body), self.actions))
+            payload = encode_state(self.state, include_events=False)
+            body.append(_SNAPSHOT)
+            _write_varint(body, len(payload))
+            body += payload
+        return self.state, events
+
+    def to_bytes(self) -> bytes:
+        out = bytearray(MAGIC)
+        out.append(FORMAT_VERSION)
+        header = dump_canonical(self.header).encode("utf-8")
+        _write_varint(out, len(header))
+        out += header
+        body_start = len(out)
+        out += self._body
+        footer = len(out)
+        _write_varint(out, len(self._index))
+        for turn, offset, actions in self._index:
+            _write_varint(out, turn)
+            _write_varint(out, offset)
+            _write_varint(out, actions)
+        out += _U32.pack(footer - body_start)
+        return bytes(out)
+
+
+def record_game(deck_a, deck_b, card_db, policy, seed=0, max_turns=200, snapshot_every=10, rng=None) -> bytes:
+    """Play one game with `policy` (a sim.Policy) for both players and return its replay."""
+    rng = rng or random.Random(seed)
+    rec = ReplayRecorder(deck_a, deck_b, card_db, seed=seed, snapshot_every=snapshot_every)
+    while rec.state.winner is None and rec.state.turn <= max_turns:
+        actions = api.get_available_actions(rec.state, card_db)
+        if not actions:
+            break
+        rec.step(policy(rec.state, actions, rng))
+    return rec.to_bytes()
+
+
+###############################################################
+# PLAYBACK
+###############################################################
+
+@dataclass(frozen=True)
+class Snapshot:
+    turn: int
+    offset: int
+    actions: int
+
+
+class Replay:
+    """Read-only view of a recorded game; `data` may be bytes or a memoryview."""
+
+    def __init__(self, data, card_db: Mapping[str, Any]):
+        data = memoryview(data)
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise EngineError("Not a replay")
+        if data[len(MAGIC)] != FORMAT_VERSION:
+            raise EngineError(f"Unsupported replay format version {data[len(MAGIC)]}")
+        self.card_db = card_db
+        size, pos = _read_varint(data, len(MAGIC) + 1)
+        self.header: Dict[str, Any] = json.loads(bytes(data[pos:pos + size]))
+        body_start = pos + size
+        (footer,) = _U32.unpack(data[-4:])
+        self._body = data[body_start:body_start + footer]
+
+        count, pos = _read_varint(data, body_start + footer)
+        self.snapshots: List[Snapshot] = []
+        for _ in range(count):
+            turn, pos = _read_varint(data, pos)
+            offset, pos = _read_varint(data, pos)
+            actions, pos = _read_varint(data, pos)
+            self.snapshots.append(Snapshot(turn, offset, actions))
+
+    @property
+    def seed(self) -> int:
+        return self.header["seed"]
+
+    @property
+    def decks(self) -> List[Deck]:
+        return [_deck_from_json(d) for d in self.header["decks"]]
+
+    def initial_state(self) -> GameState:
+        a, b = self.decks
+        return api.new_game(a, b, self.card_db, seed=self.seed, hand_size=self.header["hand_size"])
+
+    def actions(self, offset: int = 0) -> Iterator[int]:
+        """Recorded action positions from body `offset` on (snapshots skipped)."""
+        body = self._body
+        pos, end = offset, len(body)
+        while pos < end:
+            b = body[pos]
+            pos += 1
+            if b == _SNAPSHOT:
+                size, pos = _read_varint(body, pos)
+                pos += size
+                continue
+            if b == _ESCAPE:
+                b, pos = _read_varint(body, pos)
+            yield b
+
+    def states(self) -> Iterator[GameState]:
+        """The initial state, then the state after every recorded action."""
+        state = self.initial_state()
+        yield state
+        for pos in self.actions():
+            state, _ = api.step(state, api.get_available_actions(state, self.card_db)[pos], self.card_db)
+            yield state
+
+    def final_state(self) -> GameState:
+        state = self.initial_state()
+        self._play(state, self.actions())
+        return state
+
+    def seek(self, turn: int) -> GameState:
+        """State at the start of `turn` (or the final state if the game ended earlier)."""
+        snap = None
+        for s in self.snapshots:
+            if s.turn > turn:
+                break
+            snap = s
+        if snap is None:
+            state, offset = self.initial_state(), 0
+        else:
+            size, start = _read_varint(self._body, snap.offset + 1)
+            state = decode_state(self._body[start:start + size], self.card_db)
+            offset = start + size
+        self._play(state, self.actions(offset), until_turn=turn)
+        return state
+
+    def _play(self, state, positions: Iterable[int], until_turn: int | None = None) -> None:
+        # Replays in place and unjournaled (nothing here is ever undone);
+        # the states built here are never shared.
+        card_db = self.card_db
+        for pos in positions:
+            if until_turn is not None and state.turn >= until_turn:
+                break
+            api._advance(state, api.get_available_actions(state, card_db)[pos], card_db)
+
+
+###############################################################
+# ARCHIVES
+###############################################################
+
+def write_archive(path: str, replays: Iterable[bytes]) -> int:
+    """Write replays to one file; returns how many were written."""
+    n = 0
+    with open(path, "wb") as f:
+        for data in replays:
+            f.write(_U32.pack(len(data)))
+            f.write(data)
+            n += 1
+    return n
+
+def read_archive(path: str, card_db: Mapping[str, Any]) -> Iterator[Replay]:
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+    pos = 0
+    while pos < len(data):
+        (size,) = _U32.unpack(data[pos:pos + 4])
+        pos += 4
+        yield Replay(data[pos:pos + size], card_db)
+        pos += size
+
+
+def load(path: str, card_db: Mapping[str, Any]) -> Replay:
+    with open(path, "rb") as f:
+        return Replay(f.read(), card_db)
+
+def save(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
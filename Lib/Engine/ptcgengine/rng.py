@@ -0,0 +1,117 @@
+"""
+Counter-based, splittable random streams.
+
+A Stream is an immutable (key, counter) pair. Draw i of a stream is a pure
+function of (key, counter + i) -- the SplitMix64 output function applied to
+key + n * golden ratio -- so skipping ahead is just adding to the counter
+and two processes holding the same stream always draw the same numbers, no
+matter what else they did first. split(*labels) derives an independent
+stream from a key and a path of str/int labels (e.g. "player", 1, "deck"),
+which is how one game seed fans out into per-player and per-effect streams.
+
+Inside a game, GameState.rng holds the game's root stream and
+GameState.rng_counters how many draws each labelled stream has used. take()
+hands out the next draws of a labelled stream and records them through
+state.set(), so undo() rewinds randomness together with everything else.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import secrets
+from dataclasses import dataclass
+from typing import List
+
+from .errors import EngineError
+
+MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _mix(z: int) -> int:
+    """SplitMix64 finaliser."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    return z ^ (z >> 31)
+
+
+def _label(label) -> int:
+    if isinstance(label, int):
+        return label & MASK
+    return int.from_bytes(hashlib.blake2b(str(label).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@dataclass(frozen=True)
+class Stream:
+    key: int
+    counter: int = 0
+
+    @classmethod
+    def from_seed(cls, seed: int | None = None) -> Stream:
+        """Root stream for `seed`; None picks a fresh random key."""
+        if seed is None:
+            return cls(secrets.randbits(64))
+        return cls(_mix(((seed & MASK) + _GOLDEN) & MASK) ^ _mix((seed >> 64) & MASK))
+
+    def split(self, *labels) -> Stream:
+        """Independent child stream named by `labels`."""
+        key = self.key
+        for label in labels:
+            key = _mix(((key ^ _mix((_label(label) + _GOLDEN) & MASK)) + _GOLDEN) & MASK)
+        return Stream(key)
+
+    def skip(self, n: int) -> Stream:
+        return Stream(self.key, self.counter + n)
+
+    def u64(self, i: int = 0) -> int:
+        """Draw i (counting from the current position) as a 64-bit integer."""
+        return _mix((self.key + (self.counter + i + 1) * _GOLDEN) & MASK)
+
+    def random(self, i: int = 0) -> float:
+        """Draw i as a float in [0, 1)."""
+        return (self.u64(i) >> 11) * (1.0 / (1 << 53))
+
+    def below(self, n: int, i: int = 0) -> int:
+        """Draw i as an integer in [0, n) (multiply-shift, bias < n / 2**64)."""
+        return (self.u64(i) * n) >> 64
+
+    def shuffle(self, items: List) -> Stream:
+        """Fisher-Yates shuffle `items` in place; returns the stream after the draws used."""
+        key = self.key
+        c = self.counter
+        for j in range(len(items) - 1, 0, -1):
+            c += 1
+            k = (_mix((key + c * _GOLDEN) & MASK) * (j + 1)) >> 64
+            items[j], items[k] = items[k], items[j]
+        return Stream(key, c)
+
+
+###############################################################
+# GAME STREAMS
+###############################################################
+
+def stream(state, *labels) -> Stream:
+    """The labelled stream of `state`, positioned after the draws already taken."""
+    root = state.rng
+    if root is None:
+        raise EngineError("GameState has no RNG; create it with api.new_game() or set state.rng")
+    return root.split(*labels).skip(state.rng_counters.get(labels, 0))
+
+def take(state, *labels, n: int = 1) -> Stream:
+    """Reserve the next `n` draws of a labelled stream and return it positioned at the first."""
+    s = stream(state, *labels)
+    state.set("rng_counters", {**state.rng_counters, labels: s.counter + n})
+    return s
+
+def coin_flips(state, count: int, *labels) -> int:
+    """Flip `count` coins on a labelled stream and return the number of heads."""
+    if count <= 0:
+        return 0
+    s = take(state, "coins", *labels, n=count)
+    return sum(s.u64(i) >> 63 for i in range(count))
+
+def shuffle_zone(state, index: int, zone: str = "deck") -> None:
+    """Shuffle a zone of player `index` with that player's shuffle stream."""
+    cards = list(getattr(state.players[index], zone))
+    take(state, "player", index, "shuffle", zone, n=max(len(cards) - 1, 0)).shuffle(cards)
+    state.set_zone(index, zone, cards)
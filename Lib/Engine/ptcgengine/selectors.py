@@ -1,39 +1,80 @@
 from .errors import SelectorError
-from .filters import apply_filter
+from .filters import FilterChain
 
-def resolve_selector(node, game, ctx):
-    args = node["args"]
-    who = args["who"]
-    zone = args["zone"]
-    filters = args.get("filters", [])
+# id(node) -> (node, compiled); the node is kept alive so its id is stable.
+# Bounded, oldest entry out first, since callers may build nodes on the fly.
+_CACHE = {}
+_CACHE_SIZE = 1024
 
-    player = (
-        game.players[ctx.controller]
-        if who == "self"
-        else game.players[1 - ctx.controller]
-    )
+def _compiled(node):
+    hit = _CACHE.get(id(node))
+    if hit is not None and hit[0] is node:
+        return hit[1]
+    fn = compile_selector(node)
+    if len(_CACHE) >= _CACHE_SIZE:
+        del _CACHE[next(iter(_CACHE))]
+    _CACHE[id(node)] = (node, fn)
+    return fn
 
-    if zone == "active":
-        objs = [player.active] if player.active else []
-    elif zone == "bench":
-        objs = list(player.bench)
-    elif zone == "hand":
-        objs = list(player.hand)
-    elif zone == "deck":
-        objs = list(player.deck)
-    elif zone == "discard":
-        objs = list(player.discard)
-    else:
-        raise SelectorError(f"Unsupported zone: {zone}")
-
-    # apply filters
-    for flt in filters:
-        objs = [o for o in objs if apply_filter(o, flt)]
-
-    return objs
+def resolve_selector(node, game, ctx):
+    # Pre-compiled selector (see compile_selector)
+    if callable(node):
+        return node(game, ctx)
+    return _compiled(node)(game, ctx)
+
+def count_selector(node, game, ctx) -> int:
+    """len(resolve_selector(...)), answered from the zone indexes where possible."""
+    fn = node if callable(node) else _compiled(node)
+    count = getattr(fn, "count", None)
+    return count(game, ctx) if count is not None else len(fn(game, ctx))
 
 def resolve_single_target(node, game, ctx):
     objs = resolve_selector(node, game, ctx)
     if len(objs) != 1:
         raise SelectorError(f"Expected a single target, got {objs}")
     return objs[0]
+
+SELECTOR_ZONES = frozenset({"active", "bench", "hand", "deck", "discard"})
+
+def compile_selector(node):
+    """
+    Compile a select node into a closure fn(game, ctx) -> list of cards. The
+    closure's `count` attribute, fn.count(game, ctx), counts the same cards
+    without building the list.
+    """
+    if callable(node):
+        return node
+
+    args = node["args"]
+    opponent = args["who"] != "self"
+    zone = args["zone"]
+    filters = tuple(args.get("filters", []))
+
+    if zone == "active":
+        chain = FilterChain(filters, indexed=False)
+
+        def select(game, ctx):
+            who = 1 - ctx.controller if opponent else ctx.controller
+            active = game.players[who].active
+            return chain.filter([active] if active else [])
+
+        select.count = lambda game, ctx: len(select(game, ctx))
+        return select
+
+    if zone not in SELECTOR_ZONES:
+        def unsupported(game, ctx):
+            raise SelectorError(f"Unsupported zone: {zone}")
+        return unsupported
+
+    chain = FilterChain(filters)
+
+    def select(game, ctx):
+        who = 1 - ctx.controller if opponent else ctx.controller
+        return chain.select(game.players[who], zone)
+
+    def count(game, ctx):
+        who = 1 - ctx.controller if opponent else ctx.controller
+        return chain.count(game.players[who], zone)
+
+    select.count = count
+    return select
@@ -0,0 +1,495 @@
+"""
+Asyncio match server.
+
+One engine host runs many games at once and any number of clients (UIs,
+ladder bots, spectators) talk to it over a Unix socket or localhost TCP.
+The protocol is JSON lines: every request is one object with an "op" and an
+optional "id" that the reply echoes back.
+
+    -> {"id": 1, "op": "create", "decks": [deck, deck], "seed": 7, "bots": [null, "random"]}
+    <- {"id": 1, "ok": true, "result": {"game": 1}}
+    -> {"id": 2, "op": "join", "game": 1, "seat": 0}
+    <- {"id": 2, "ok": true, "result": {"game": 1, "seat": 0, "state": {...}, "actions": [...]}}
+    -> {"id": 3, "op": "act", "game": 1, "index": 0}
+    <- {"push": "update", "game": 1, "events": [...], "state": {...}, "winner": null, ...}
+    <- {"id": 3, "ok": true, "result": {"moves": 1}}
+
+Ops: create (the creator then watches the game), join (a seat, or watch
+with "seat": null), leave, state, actions, act (by "index" into the legal
+actions or by "action" dict), list and close (only for the game's creator
+or a seated player). A deck is Deck.to_json() output or a plain list of definition
+ids. Errors come back as {"id": ..., "ok": false, "error": "..."}.
+
+After every move each connection watching the game gets an "update" push
+with the new events and render_state(); the seat to move also gets its
+legal actions in it, and the seat making a pending choice (an attack
+searching its deck, say) gets the options as "choice"; the shared view
+only counts them. Views are numbered ("version"). A client that joins
+with "delta": true gets update pushes with a "patch" (see view.py) from
+the version it was last sent instead of the full "state", and the state op
+takes "since": version to the same effect. Only the client holding a seat may move for it, and
+actions are checked against get_available_actions() before they are applied.
+
+Rule steps are cheap and run on the event loop. Seats can instead be
+played by a server-side bot (a sim policy name or "mcts"); bot moves are
+computed in a process pool when `workers` > 0 (or on a thread otherwise),
+with the position shipped as state_codec bytes (more compact than a
+pickle of the GameState).
+
+    python -m ptcgengine.server --port 8765 --workers 4
+    python -m ptcgengine.server --unix /tmp/ptcg.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence
+
+from . import api
+from .card_instance import create_instance
+from .deck import Deck
+from .errors import EngineError
+from .registry import load_registry
+from .sim import POLICIES
+from .state_codec import decode_state, encode_state
+from .view import ViewHistory, choice_options
+
+BOTS = (*sorted(POLICIES), "mcts")
+
+# Largest request line accepted (decks are the biggest payloads)
+MAX_LINE = 1 << 20
+
+
+def _deck(data) -> Deck:
+    if isinstance(data, list):
+        return Deck(name="deck", cards=[create_instance(def_id) for def_id in data])
+    return Deck.from_json(data)
+
+
+def _dumps(msg) -> bytes:
+    return json.dumps(msg, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+def _think(data: bytes, card_db, bot: str, seed: int, think_time: float) -> int:
+    """Pick a move for the side to move in an encoded state; returns its legal-list position."""
+    state = decode_state(data, card_db)
+    actions = api.get_available_actions(state, card_db)
+    if bot == "mcts":
+        from .determinize import deck_lists
+        from .mcts import MCTS
+
+        # Search the information set, not the opponent's hand and deck order
+        mcts = MCTS(card_db, time_limit=think_time, seed=seed, deck_lists=deck_lists(state))
+        action = mcts.search(state).action
+    else:
+        action = POLICIES[bot](state, actions, random.Random(seed))
+    return actions.index(action)
+
+
+class Connection:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        # game id -> seat (None when only watching)
+        self.games: Dict[int, int | None] = {}
+        # game id -> view version last sent, for games watched as deltas
+        self.views: Dict[int, int] = {}
+
+    async def send(self, msg) -> None:
+        if self.writer.is_closing():
+            return
+        self.writer.write(_dumps(msg))
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+@dataclass
+class Match:
+    id: int
+    state: Any
+    # Per seat: the Connection playing it, a bot name, or None (open)
+    seats: List[Any]
+    # The Connection that created the game
+    creator: Any = None
+    watchers: set = field(default_factory=set)
+    views: ViewHistory = field(default_factory=ViewHistory)
+    moves: int = 0
+    finished: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    # Running _run_bots tasks, cancelled when the game is closed
+    tasks: set = field(default_factory=set)
+
+    def seat_to_move(self):
+        return self.seats[self.state.active_player]
+
+
+class MatchServer:
+    def __init__(
+        self,
+        card_db: Mapping[str, Any] | None = None,
+        workers: int = 0,
+        max_turns: int = 200,
+        think_time: float = 0.5,
+    ):
+        self.card_db = card_db if card_db is not None else load_registry()
+        self.max_turns = max_turns
+        self.think_time = think_time
+        self.matches: Dict[int, Match] = {}
+        self._pool: Executor | None = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+        self._next_id = 1
+        self._server: asyncio.AbstractServer | None = None
+        self._tasks: set = set()
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        return self._server
+
+    async def start_unix(self, path: str) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE)
+        return self._server
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --------------------------------------------------------
+    # Connections
+    # --------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = Connection(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError as exc:
+                    # Longer than MAX_LINE: the stream cannot be resynchronised
+                    await conn.send({"id": None, "ok": False, "error": f"Bad request: {exc}"})
+                    break
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                    if not isinstance(msg, dict):
+                        raise ValueError("Request must be a JSON object")
+                except ValueError as exc:
+                    await conn.send({"id": None, "ok": False, "error": f"Bad request: {exc}"})
+                    continue
+                await self._dispatch(conn, msg)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            for game_id in list(conn.games):
+                self._leave(conn, game_id)
+            writer.close()
+
+    async def _dispatch(self, conn: Connection, msg: dict) -> None:
+        handler = getattr(self, f"_op_{msg.get('op')}", None)
+        try:
+            if handler is None:
+                raise EngineError(f"Unknown op {msg.get('op')!r}")
+            result = await handler(conn, msg)
+        except (EngineError, ValueError, KeyError, TypeError) as exc:
+            await conn.send({"id": msg.get("id"), "ok": False, "error": str(exc)})
+        else:
+            await conn.send({"id": msg.get("id"), "ok": True, "result": result})
+
+    def _match(self, msg) -> Match:
+        try:
+            return self.matches[msg["game"]]
+        except KeyError:
+            raise EngineError(f"No game {msg.get('game')!r}") from None
+
+    # --------------------------------------------------------
+    # Ops
+    # --------------------------------------------------------
+    async def _op_create(self, conn, msg):
+        decks = msg["decks"]
+        if len(decks) != 2:
+            raise EngineError("A game needs two decks")
+        bots = list(msg.get("bots") or (None, None))
+        if len(bots) != 2:
+            raise EngineError(f"bots needs one entry per seat, got {len(bots)}")
+        for bot in bots:
+            if bot is not None and bot not in BOTS:
+                raise EngineError(f"Unknown bot {bot!r}; choose from {list(BOTS)}")
+        state = api.new_game(
+            _deck(decks[0]), _deck(decks[1]), self.card_db,
+            seed=msg.get("seed"), hand_size=msg.get("hand_size", 7),
+        )
+        match = Match(id=self._next_id, state=state, seats=bots, creator=conn)
+        self._next_id += 1
+        self.matches[match.id] = match
+        # The creator watches the game, so a bot-only game cannot finish unseen
+        conn.games[match.id] = None
+        match.watchers.add(conn)
+        self._spawn(self._run_bots(match), match)
+        return {"game": match.id}
+
+    async def _op_join(self, conn, msg):
+        match = self._match(msg)
+        seat = msg.get("seat")
+        if seat is not None:
+            if seat not in (0, 1):
+                raise EngineError("Seat must be 0, 1 or null")
+            if match.seats[seat] is not None and match.seats[seat] is not conn:
+                raise EngineError(f"Seat {seat} of game {match.id} is taken")
+            if conn.games.get(match.id) not in (None, seat):
+                raise EngineError("Already seated in this game")
+            match.seats[seat] = conn
+        conn.games[match.id] = seat
+        match.watchers.add(conn)
+        view = self._view(match, seat)
+        if msg.get("delta"):
+            conn.views[match.id] = view["version"]
+        else:
+            conn.views.pop(match.id, None)
+        return {"game": match.id, "seat": seat, **view}
+
+    async def _op_leave(self, conn, msg):
+        self._leave(conn, msg["game"])
+        return None
+
+    async def _op_state(self, conn, msg):
+        match = self._match(msg)
+        since = msg.get("since")
+        if since is not None and not isinstance(since, int):
+            raise EngineError(f"since must be a view version, got {since!r}")
+        return self._view(match, conn.games.get(match.id), since)
+
+    async def _op_actions(self, conn, msg):
+        match = self._match(msg)
+        return self._legal(match)
+
+    async def _op_act(self, conn, msg):
+        match = self._match(msg)
+        async with match.lock:
+            if match.finished:
+                raise EngineError(f"Game {match.id} is over")
+            if match.seat_to_move() is not conn:
+                raise EngineError("Not your turn")
+            legal = self._legal(match)
+            if "index" in msg:
+                index = msg["index"]
+                if not isinstance(index, int) or not 0 <= index < len(legal):
+                    raise EngineError(f"Action index {index!r} out of range (0..{len(legal) - 1})")
+            else:
+                try:
+                    index = legal.index(msg["action"])
+                except ValueError:
+                    raise EngineError(f"Illegal action {msg['action']!r}") from None
+            await self._move(match, legal[index])
+        self._spawn(self._run_bots(match), match)
+        return {"moves": match.moves}
+
+    async def _op_list(self, conn, msg):
+        return [
+            {
+                "game": m.id,
+                "turn": m.state.turn,
+                "finished": m.finished,
+                "seats": [_seat_name(s) for s in m.seats],
+            }
+            for m in self.matches.values()
+        ]
+
+    async def _op_close(self, conn, msg):
+        match = self._match(msg)
+        if conn is not match.creator and conn not in match.seats:
+            raise EngineError(f"Only the creator or a seated player may close game {match.id}")
+        del self.matches[match.id]
+        # Stops the bots between moves; the loop also checks it after thinking
+        match.finished = True
+        for task in list(match.tasks):
+            task.cancel()
+        watchers, match.watchers = match.watchers, set()
+        for watcher in watchers:
+            watcher.games.pop(match.id, None)
+            watcher.views.pop(match.id, None)
+            await watcher.send({"push": "closed", "game": match.id})
+        return None
+
+    # --------------------------------------------------------
+    # Games
+    # --------------------------------------------------------
+    def _legal(self, match: Match) -> list:
+        if match.finished:
+            return []
+        return api.get_available_actions(match.state, self.card_db)
+
+    def _view(self, match: Match, seat: int | None, since: int | None = None) -> dict:
+        version = match.views.update(match.state)
+        patch = match.views.delta(since) if since is not None else None
+        view = {
+            "version": version,
+            **({"state": match.views.view} if patch is None else {"patch": patch}),
+            "moves": match.moves,
+            "winner": match.state.winner,
+            "finished": match.finished,
+        }
+        if seat is not None and seat == match.state.active_player:
+            view["actions"] = self._legal(match)
+        options = choice_options(api.pending_choice(match.state), seat)
+        if options is not None:
+            view["choice"] = options
+        return view
+
+    async def _move(self, match: Match, action) -> None:
+        token = api.apply(match.state, action, self.card_db)
+        api.commit(match.state)
+        match.moves += 1
+        state = match.state
+        if state.winner is not None or state.turn > self.max_turns:
+            match.finished = True
+        events = [{"type": e.type, "payload": e.payload} for e in token.events]
+        for conn in list(match.watchers):
+            seat = conn.games.get(match.id)
+            view = self._view(match, seat, conn.views.get(match.id))
+            if match.id in conn.views:
+                conn.views[match.id] = view["version"]
+            await conn.send({"push": "update", "game": match.id, "events": events, **view})
+        if match.finished and not match.watchers:
+            self.matches.pop(match.id, None)
+
+    async def _run_bots(self, match: Match) -> None:
+        loop = asyncio.get_running_loop()
+        async with match.lock:
+            while not match.finished and isinstance(bot := match.seat_to_move(), str):
+                data = encode_state(match.state, include_events=False)
+                seed = random.getrandbits(32)
+                pos = await loop.run_in_executor(
+                    self._pool, _think, data, self.card_db, bot, seed, self.think_time
+                )
+                if match.finished:
+                    break
+                await self._move(match, self._legal(match)[pos])
+
+    def _leave(self, conn: Connection, game_id) -> None:
+        seat = conn.games.pop(game_id, None)
+        conn.views.pop(game_id, None)
+        match = self.matches.get(game_id)
+        if match is None:
+            return
+        match.watchers.discard(conn)
+        if seat is not None and match.seats[seat] is conn:
+            match.seats[seat] = None
+        if match.finished and not match.watchers:
+            del self.matches[game_id]
+
+    def _spawn(self, coro, match: Match | None = None) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if match is not None:
+            match.tasks.add(task)
+            task.add_done_callback(match.tasks.discard)
+
+
+def _seat_name(seat):
+    if seat is None or isinstance(seat, str):
+        return seat
+    return "client"
+
+
+###############################################################
+# CLIENT
+###############################################################
+
+class MatchClient:
+    """
+    Minimal asyncio client. request() waits for the reply to one request;
+    pushes for joined games queue up in `pushes`.
+
+        client = await MatchClient.connect(port=8765)
+        game = (await client.request("create", decks=[a, b], bots=[None, "random"]))["game"]
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.pushes: asyncio.Queue = asyncio.Queue()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 1
+        self._reader_task = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int | None = None, path: str | None = None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **fields):
+        """Send one request; returns its result or raises EngineError with the server's message."""
+        rid = self._next_id
+        self._next_id += 1
+        future = self._pending[rid] = asyncio.get_running_loop().create_future()
+        self.writer.write(_dumps({"id": rid, "op": op, **fields}))
+        await self.writer.drain()
+        reply = await future
+        if not reply["ok"]:
+            raise EngineError(reply["error"])
+        return reply["result"]
+
+    async def close(self) -> None:
+        self._reader_task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _read(self) -> None:
+        while line := await self.reader.readline():
+            msg = json.loads(line)
+            future = self._pending.pop(msg.get("id"), None) if "push" not in msg else None
+            if future is not None:
+                future.set_result(msg)
+            else:
+                self.pushes.put_nowait(msg)
+        for future in self._pending.values():
+            future.set_exception(ConnectionError("Server closed the connection"))
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ptcgengine.server", description=__doc__.split("\n\n")[1])
+    where = parser.add_mutually_exclusive_group()
+    where.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket")
+    where.add_argument("--port", type=int, default=8765, help="Listen on localhost TCP (default 8765)")
+    parser.add_argument("--workers", type=int, default=0, help="Processes for bot moves (0 = a thread)")
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--think-time", type=float, default=0.5, help="Seconds per MCTS bot move")
+    parser.add_argument("--card-db", default=None, help="Card database JSON (defaults to the packaged one)")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = MatchServer(
+            load_registry(args.card_db), workers=args.workers,
+            max_turns=args.max_turns, think_time=args.think_time,
+        )
+        listener = await (server.start_unix(args.unix) if args.unix else server.start_tcp(port=args.port))
+        print("listening on", ", ".join(str(s.getsockname()) for s in listener.sockets))
+        try:
+            await listener.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
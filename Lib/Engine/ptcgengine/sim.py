@@ -0,0 +1,249 @@
+"""
+Headless self-play simulation runner.
+
+Plays N complete games between two Decks with fixed per-game seeds, spread
+over a process pool. Each game is driven through api.get_available_actions /
+api.step by a pluggable policy, and the run is summarised as games/sec,
+steps/sec, win rates and the distribution of game lengths in turns.
+
+Game outcomes depend only on (seed, game index), never on the worker count or
+scheduling, so two runs with the same seed produce the same results.
+
+    python -m ptcgengine.sim deck_a.json deck_b.json --games 10000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from . import api
+from .actions import ATTACH_ENERGY, ATTACK, PASS
+from .deck import Deck
+from .registry import load_registry
+from .rng import Stream
+from .serialization import load_json
+
+# policy(state, legal_actions, rng) -> chosen action
+Policy = Callable[[Any, List[dict], random.Random], dict]
+
+
+def random_policy(state, actions, rng):
+    return rng.choice(actions)
+
+
+def aggressive_policy(state, actions, rng):
+    """Attack when possible, otherwise attach energy, otherwise pass."""
+    for kind in (ATTACK, ATTACH_ENERGY, PASS):
+        for a in actions:
+            if a["type"] == kind:
+                return a
+    return actions[0]
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "aggressive": aggressive_policy,
+}
+
+
+@dataclass(frozen=True)
+class GameResult:
+    index: int
+    seed: int
+    # 0 = deck_a won, 1 = deck_b won, None = draw (turn limit reached)
+    winner: int | None
+    turns: int
+    steps: int
+
+
+@dataclass
+class SimReport:
+    results: List[GameResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def games(self) -> int:
+        return len(self.results)
+
+    @property
+    def steps(self) -> int:
+        return sum(r.steps for r in self.results)
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def steps_per_sec(self) -> float:
+        return self.steps / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def win_rates(self) -> tuple[float, float, float]:
+        """(deck_a wins, deck_b wins, draws) as fractions of games played."""
+        if not self.results:
+            return (0.0, 0.0, 0.0)
+        c = Counter(r.winner for r in self.results)
+        n = self.games
+        return (c[0] / n, c[1] / n, c[None] / n)
+
+    @property
+    def turn_lengths(self) -> Counter:
+        """Histogram of game length in turns."""
+        return Counter(r.turns for r in self.results)
+
+    def summary(self) -> Dict[str, Any]:
+        turns = [r.turns for r in self.results] or [0]
+        a, b, draw = self.win_rates
+        return {
+            "games": self.games,
+            "steps": self.steps,
+            "elapsed_s": round(self.elapsed, 3),
+            "games_per_sec": round(self.games_per_sec, 1),
+            "steps_per_sec": round(self.steps_per_sec, 1),
+            "win_rate_a": a,
+            "win_rate_b": b,
+            "draw_rate": draw,
+            "turns_mean": statistics.fmean(turns),
+            "turns_median": statistics.median(turns),
+            "turns_min": min(turns),
+            "turns_max": max(turns),
+        }
+
+
+def game_seed(seed: int, index: int) -> int:
+    """Seed for game `index` of a run, independent of how games are scheduled."""
+    return Stream.from_seed(seed).split("game", index).u64() >> 1
+
+
+def play_game(
+    deck_a: Deck,
+    deck_b: Deck,
+    card_db: Mapping[str, Any],
+    seed: int,
+    policies: Sequence[Policy | str] = ("random", "random"),
+    max_turns: int = 200,
+    index: int = 0,
+) -> GameResult:
+    """
+    Play one game to completion. Odd game indices swap seats so each deck
+    moves first in half of the games; the result is reported per deck.
+    """
+    pols = [_resolve_policy(p) for p in policies]
+    swap = index % 2 == 1
+    decks = (deck_b, deck_a) if swap else (deck_a, deck_b)
+    if swap:
+        pols.reverse()
+
+    rng = random.Random(seed)
+    state = api.new_game(decks[0], decks[1], card_db, seed=seed)
+    steps = 0
+    while state.winner is None and state.turn <= max_turns:
+        actions = api.get_available_actions(state, card_db)
+        if not actions:
+            break
+        action = pols[state.active_player](state, actions, rng)
+        state, _ = api.step(state, action, card_db)
+        steps += 1
+
+    winner = state.winner
+    if swap and winner is not None:
+        winner = 1 - winner
+    return GameResult(index=index, seed=seed, winner=winner, turns=state.turn, steps=steps)
+
+
+def run(
+    deck_a: Deck,
+    deck_b: Deck,
+    n_games: int,
+    card_db: Mapping[str, Any] | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+    policies: Sequence[Policy | str] = ("random", "random"),
+    max_turns: int = 200,
+) -> SimReport:
+    """
+    Play `n_games` games and aggregate the results.
+
+    `workers` <= 1 plays every game in this process. Custom policies must be
+    module-level functions (or policy names) so they can be sent to workers.
+    """
+    card_db = card_db if card_db is not None else load_registry()
+    workers = workers if workers is not None else os.cpu_count() or 1
+    jobs = [
+        (deck_a, deck_b, card_db, seed, tuple(policies), max_turns, chunk)
+        for chunk in _chunks(n_games, workers)
+    ]
+
+    start = time.perf_counter()
+    if workers <= 1 or len(jobs) <= 1:
+        chunks = [_play_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_play_chunk, jobs))
+    elapsed = time.perf_counter() - start
+
+    results = sorted((r for chunk in chunks for r in chunk), key=lambda r: r.index)
+    return SimReport(results=results, elapsed=elapsed)
+
+
+def _play_chunk(job) -> List[GameResult]:
+    deck_a, deck_b, card_db, seed, policies, max_turns, indices = job
+    return [
+        play_game(deck_a, deck_b, card_db, game_seed(seed, i), policies, max_turns, index=i)
+        for i in indices
+    ]
+
+
+def _chunks(n: int, workers: int) -> List[range]:
+    # A few chunks per worker keeps the pool busy when game lengths vary.
+    size = max(1, -(-n // (max(workers, 1) * 4)))
+    return [range(i, min(i + size, n)) for i in range(0, n, size)]
+
+
+def _resolve_policy(policy: Policy | str) -> Policy:
+    if isinstance(policy, str):
+        try:
+            return POLICIES[policy]
+        except KeyError:
+            raise ValueError(f"Unknown policy {policy!r}; choose from {sorted(POLICIES)}") from None
+    return policy
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ptcgengine.sim", description=__doc__.split("\n\n")[1])
+    parser.add_argument("deck_a", help="Deck JSON file (Deck.to_json format)")
+    parser.add_argument("deck_b", help="Deck JSON file (Deck.to_json format)")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy-a", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--policy-b", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--card-db", default=None, help="Card database JSON (defaults to the packaged one)")
+    args = parser.parse_args(argv)
+
+    report = run(
+        Deck.from_json(load_json(args.deck_a)),
+        Deck.from_json(load_json(args.deck_b)),
+        args.games,
+        card_db=load_registry(args.card_db),
+        seed=args.seed,
+        workers=args.workers,
+        policies=(args.policy_a, args.policy_b),
+        max_turns=args.max_turns,
+    )
+    for key, value in report.summary().items():
+        print(f"{key:>14}: {value}")
+    print("  turn lengths:", dict(sorted(report.turn_lengths.items())))
+
+
+if __name__ == "__main__":
+    main()
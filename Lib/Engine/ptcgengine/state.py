@@ -1,7 +1,31 @@
+"""
+Game state containers.
+
+GameState is copy-on-write: clone() only copies the top-level object and
+shares players, zone lists and card objects with its parent. Code that
+changes a state in place must go through the mutation ops below (set(),
+set_flag(), add_card(), take_card(), update_card(), ...), which copy a shared
+object the first time this state writes to it. States that were never cloned
+own everything, so freshly built states can still be mutated directly.
+
+The same ops feed an optional undo journal: checkpoint() starts recording and
+rollback() replays the inverse ops back to a mark, which is what api.apply()
+and api.undo() are built on.
+"""
+
+import copy
 from dataclasses import dataclass, field
-from typing import List, Any
-from .cards import BaseCard, PokemonCard, EnergyCard, TrainerCard
-from .events import GameEvent
+from typing import Any, List
+
+from . import hashing
+from .cards import BaseCard, PokemonCard
+from .errors import EngineError
+from .event_log import EventLog
+from .zone_index import ZoneIndex
+
+# List-valued zones on PlayerState (active is a single slot)
+ZONES = ("deck", "hand", "bench", "discard")
+
 
 @dataclass
 class PlayerState:
@@ -10,6 +34,17 @@ class PlayerState:
     active: PokemonCard | None = None
     bench: List[PokemonCard] = field(default_factory=list)
     discard: List[BaseCard] = field(default_factory=list)
+    # zone name -> ZoneIndex, see index()
+    _index: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def index(self, name: str) -> ZoneIndex:
+        """Secondary index of zone `name` (see zone_index), built on first use."""
+        zone = getattr(self, name)
+        idx = self._index.get(name)
+        if idx is None or idx.zone is not zone or idx.size != len(zone):
+            idx = self._index[name] = ZoneIndex(zone)
+        return idx
+
 
 @dataclass
 class GameState:
@@ -20,13 +55,320 @@ class GameState:
     turn: int = 1
     phase: str = "start"
     turn_flags: dict = field(default_factory=dict)
-    event_log: List[GameEvent] = field(default_factory=list)
+    event_log: EventLog = field(default_factory=EventLog)
     trainer: Any | None = None
     deck: Any | None = None
+    winner: int | None = None
+    # Root random stream of the game and draws used per labelled stream (see rng)
+    rng: Any | None = None
+    rng_counters: dict = field(default_factory=dict)
+    # interpreter.PendingChoice while an attack waits for a "choose" action
+    pending: Any | None = None
+
+    # Copy-on-write bookkeeping. Once a state has been cloned it only owns
+    # the objects recorded in _owned (keyed by id, holding a strong ref so
+    # ids cannot be recycled while the entry exists).
+    _cow: bool = field(default=False, repr=False, compare=False)
+    _owned: dict = field(default_factory=dict, repr=False, compare=False)
+    # Undo journal of (inverse_op, args, kwargs); None when not recording.
+    _journal: list | None = field(default=None, repr=False, compare=False)
+    # Cards copied while rolling back, so older entries can find their slot.
+    _subst: dict | None = field(default=None, repr=False, compare=False)
+    # Bumped by every mutation op; keys caches of derived data (see memo()).
+    _version: int = field(default=0, repr=False, compare=False)
+    _memo: tuple | None = field(default=None, repr=False, compare=False)
+    # Incrementally maintained position hash; None until first requested.
+    _hash: int | None = field(default=None, repr=False, compare=False)
 
     def clone(self):
-        import copy
-        return copy.deepcopy(self)
+        """
+        Return a structurally shared copy of this state.
+
+        Both the parent and the child give up ownership of everything they
+        currently reference, so a later write on either side copies first.
+        The child does not inherit the parent's undo journal.
+        """
+        self._cow = True
+        self._owned = {}
+        new = copy.copy(self)
+        new._owned = {}
+        new._journal = None
+        return new
+
+    # ---------------------------
+    # Copy-on-write helpers
+    # ---------------------------
+    def owns(self, obj) -> bool:
+        return not self._cow or id(obj) in self._owned
+
+    def _claim(self, obj):
+        if self._cow:
+            self._owned[id(obj)] = obj
+        return obj
+
+    def player(self, index: int) -> PlayerState:
+        """Writable PlayerState for `index` (zones may still be shared)."""
+        p = self.players[index]
+        if self.owns(p):
+            return p
+        if not self.owns(self.players):
+            self.players = self._claim(list(self.players))
+        p = self._claim(copy.copy(p))
+        p._index = dict(p._index)
+        self.players[index] = p
+        return p
+
+    def zone(self, index: int, name: str) -> list:
+        """Writable zone list `name` ("deck", "hand", ...) of player `index`."""
+        p = self.player(index)
+        z = getattr(p, name)
+        if self.owns(z):
+            return z
+        z = self._claim(list(z))
+        setattr(p, name, z)
+        return z
+
+    def card(self, card):
+        """
+        Writable version of `card`.
+
+        If the card is shared it is copied and the copy is swapped into the
+        slot the original occupies, so callers must use the returned object.
+        """
+        if self._subst is not None:
+            card = self._subst.get(id(card), (None, card))[1]
+        if self.owns(card):
+            return card
+        new = self._claim(card.copy())
+        self._replace_card(card, new)
+        self._record(self._replace_card, new, card)
+        if self._subst is not None:
+            self._subst[id(card)] = (card, new)
+        return new
+
+    def _replace_card(self, old, new) -> None:
+        if self._subst is not None:
+            old = self._subst.get(id(old), (None, old))[1]
+        for i, p in enumerate(self.players):
+            if p.active is old:
+                self.player(i).active = new
+                return
+            for name in ZONES:
+                for j, c in enumerate(getattr(p, name)):
+                    if c is old:
+                        z = self.zone(i, name)
+                        idx = self._live_index(i, name, z)
+                        z[j] = new
+                        if idx is not None:
+                            idx.replaced(old, new)
+                        return
+        raise EngineError(f"Card {getattr(old, 'card_id', old)!r} is not part of this state")
+
+    # ---------------------------
+    # Mutation ops
+    # ---------------------------
+    def set(self, name: str, value) -> None:
+        """Assign a top-level field (turn, phase, event_log, ...)."""
+        old = getattr(self, name)
+        self._record(self.set, name, old)
+        setattr(self, name, value)
+        if self._hash is not None and name in hashing.HASHED_FIELDS:
+            self._rehash(hashing.field_key(name, value) - hashing.field_key(name, old))
+
+    def set_flag(self, key: str, value) -> None:
+        flags = self.turn_flags
+        if key in flags:
+            self._record(self.set_flag, key, flags[key])
+            if self._hash is not None:
+                self._rehash(-hashing.feature_key(("flag", key, flags[key])))
+        else:
+            self._record(self._clear_flag, key)
+        if not self.owns(flags):
+            flags = self.turn_flags = self._claim(dict(flags))
+        flags[key] = value
+        if self._hash is not None:
+            self._rehash(hashing.feature_key(("flag", key, value)))
+
+    def set_flags(self, flags: dict) -> None:
+        """Replace all turn flags at once."""
+        self.set("turn_flags", self._claim(dict(flags)))
+
+    def _clear_flag(self, key: str) -> None:
+        if not self.owns(self.turn_flags):
+            self.turn_flags = self._claim(dict(self.turn_flags))
+        value = self.turn_flags.pop(key)
+        if self._hash is not None:
+            self._rehash(-hashing.feature_key(("flag", key, value)))
+
+    def set_active(self, index: int, card) -> None:
+        old = self.players[index].active
+        self._record(self.set_active, index, old)
+        self.player(index).active = card
+        if self._hash is not None:
+            self._rehash(hashing.card_key(index, "active", card) - hashing.card_key(index, "active", old))
+
+    def add_card(self, index: int, name: str, card, pos: int | None = None) -> None:
+        """Insert `card` into a zone, appending when `pos` is None."""
+        z = self.zone(index, name)
+        if pos is None:
+            pos = len(z)
+        self._record(self.take_card, index, name, pos)
+        idx = self._live_index(index, name, z)
+        z.insert(pos, card)
+        if idx is not None and not idx.inserted(pos, card):
+            del self.players[index]._index[name]
+        if self._hash is not None:
+            self._rehash(hashing.card_key(index, name, card))
+
+    def take_card(self, index: int, name: str, pos: int = -1):
+        """Remove and return the card at `pos` of a zone (top of deck by default)."""
+        z = self.zone(index, name)
+        if pos < 0:
+            pos += len(z)
+        idx = self._live_index(index, name, z)
+        card = z.pop(pos)
+        if idx is not None:
+            idx.removed(card)
+        self._record(self.add_card, index, name, card, pos)
+        if self._hash is not None:
+            self._rehash(-hashing.card_key(index, name, card))
+        return card
+
+    def set_zone(self, index: int, name: str, cards: list) -> None:
+        """Replace the whole contents of a zone with the list `cards` (taken over, not copied)."""
+        self._swap_zone(index, name, self._claim(cards))
+
+    def _swap_zone(self, index: int, name: str, cards: list) -> None:
+        # Inverse of set_zone: puts the old list back without claiming it
+        p = self.player(index)
+        old = getattr(p, name)
+        self._record(self._swap_zone, index, name, old)
+        setattr(p, name, cards)
+        if self._hash is not None:
+            self._rehash(
+                sum(hashing.card_key(index, name, c) for c in cards)
+                - sum(hashing.card_key(index, name, c) for c in old)
+            )
+
+    def _live_index(self, index: int, name: str, z: list) -> ZoneIndex | None:
+        # Index of the (writable) zone list `z`, if one is built and current
+        idx = self.players[index]._index.get(name)
+        if idx is not None and idx.zone is z and idx.size == len(z):
+            return idx
+        return None
+
+    def remove_card(self, index: int, name: str, card) -> None:
+        """Remove the first card equal to `card` from a zone."""
+        self.take_card(index, name, getattr(self.players[index], name).index(card))
+
+    def update_card(self, card, **fields):
+        """
+        Assign runtime fields (current_hp, status, attached_energies, ...) on
+        `card` and return the writable card now occupying its slot.
+
+        Field values are replaced, never mutated in place, so older values
+        can be restored as-is.
+        """
+        card = self.card(card)
+        where = self._locate(card) if self._hash is not None else None
+        if where is not None:
+            self._rehash(-hashing.card_key(*where, card))
+        for name, value in fields.items():
+            self._record(self.update_card, card, **{name: getattr(card, name)})
+            setattr(card, name, value)
+        if where is not None:
+            self._rehash(hashing.card_key(*where, card))
+        return card
+
+    def _locate(self, card):
+        """(player, zone) holding `card`, checking the in-play slots first."""
+        for i, p in enumerate(self.players):
+            if p.active is card:
+                return i, "active"
+        for name in ("bench",) + tuple(z for z in ZONES if z != "bench"):
+            for i, p in enumerate(self.players):
+                if any(c is card for c in getattr(p, name)):
+                    return i, name
+        return None
+
+    # ---------------------------
+    # Undo journal
+    # ---------------------------
+    def _record(self, fn, *args, **kwargs) -> None:
+        """Note a mutation: bump the version and journal its inverse op."""
+        self._version += 1
+        if self._journal is not None:
+            self._journal.append((fn, args, kwargs))
+
+    def checkpoint(self) -> int:
+        """Start (or continue) journaling ops and return a mark to roll back to."""
+        if self._journal is None:
+            self._journal = []
+        return len(self._journal)
+
+    def rollback(self, mark: int) -> None:
+        """Undo every op recorded since `mark`, most recent first."""
+        journal = self._journal
+        if journal is None or mark > len(journal):
+            raise EngineError("Rollback mark is not part of this state's journal")
+        self._journal = None
+        self._subst = {}
+        try:
+            while len(journal) > mark:
+                fn, args, kwargs = journal.pop()
+                fn(*args, **kwargs)
+        finally:
+            self._subst = None
+            self._journal = journal if mark else None
+
+    def commit(self) -> None:
+        """Stop journaling and drop all recorded ops."""
+        self._journal = None
+
+    # ---------------------------
+    # Versioning
+    # ---------------------------
+    @property
+    def version(self) -> int:
+        """
+        Counter that changes whenever a mutation op changes this state.
+
+        A clone starts at its parent's version. Code that mutates a state
+        directly instead of through the ops must call touch() afterwards.
+        """
+        return self._version
+
+    def touch(self) -> None:
+        """Mark the state as changed after a direct (non-op) mutation."""
+        self._version += 1
+        self._hash = None
+        for p in self.players:
+            p._index = {}
+
+    @property
+    def zobrist(self) -> int:
+        """
+        64-bit position hash (see hashing.py), stable across processes.
+
+        Computed from scratch on first use, then kept up to date by the
+        mutation ops in O(1) per change.
+        """
+        if self._hash is None:
+            self._hash = hashing.compute_hash(self)
+        return self._hash
+
+    def _rehash(self, delta: int) -> None:
+        self._hash = (self._hash + delta) & hashing.MASK
+
+    def memo(self) -> dict:
+        """
+        Scratch cache for data derived from this state (legal actions, UI
+        projections, ...). It is emptied whenever the version changes.
+        """
+        memo = self._memo
+        if memo is None or memo[0] != self._version:
+            memo = self._memo = (self._version, {})
+        return memo[1]
 
     def __repr__(self):
         return f"<GameState turn={self.turn} AP={self.active_player} phase={self.phase}>"
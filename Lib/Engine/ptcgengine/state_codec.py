@@ -0,0 +1,337 @@
+"""
+Versioned binary codec for GameState.
+
+encode_state() writes a self-contained snapshot: a string table (card ids,
+phases, flag names, statuses, rng labels) followed by the game fields and
+both players' zones. Cards are stored as a definition id plus their runtime
+fields (current HP, attached energy, status), never as definitions, so a
+snapshot stays small and is rebuilt against whatever card_db the reader
+passes to decode_state().
+
+decode_state() reads straight from a memoryview over the input (a bytes
+object, mmap, a slice of a larger archive, ...) without copying the buffer;
+only the resulting Python objects are allocated. Definitions are resolved
+once per distinct card id.
+
+Layout (integers are unsigned LEB128 varints unless noted):
+
+    b"PTGS" | format version (2 bytes, little endian)
+    string count | (length, utf-8 bytes) per string
+    active_player, turn, phase (string), winner (value)
+    turn flag count | (name (string), value) per flag
+    rng: 0 | 1, key (8 bytes, little endian), counter
+    rng counter count | (label count, labels (values), draws) per stream
+    per player: 0 | 1 and the active card, then deck, hand, bench, discard as count | cards
+    trainer, deck, event log, pending choice: 0 | length, canonical JSON
+
+A card is 1 + string index for a plain card, or 0, string index, HP
+(zigzag), energy count | energy cards, status count | strings for a Pokémon.
+A value is a tag byte (None, False, True, int, str) and its payload.
+
+A pending choice is stored as the attacker's card id, the attack name and
+the interpreter frames; its options are listed again from the decoded
+state. Version 1 snapshots (no pending choice) still decode.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Mapping
+
+from .cards import attack_trees, card_from_definition, get_definition
+from .deck import Deck
+from .errors import EngineError
+from .event_log import EventLog
+from .events import GameEvent
+from .interpreter import Choice, PendingChoice, reoffer
+from .rng import Stream
+from .serialization import dump_canonical
+from .state import ZONES, GameState
+from .trainer import Trainer
+
+MAGIC = b"PTGS"
+FORMAT_VERSION = 2
+
+_HEADER = struct.Struct("<4sH")
+_U64 = struct.Struct("<Q")
+
+_NONE, _FALSE, _TRUE, _INT, _STR = range(5)
+
+
+def _put_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+class _Writer:
+    def __init__(self):
+        self.out = bytearray()
+        self.strings: dict[str, int] = {}
+
+    def varint(self, n: int) -> None:
+        _put_varint(self.out, n)
+
+    def zigzag(self, n: int) -> None:
+        self.varint(n * 2 if n >= 0 else -n * 2 - 1)
+
+    def string(self, s: str) -> None:
+        self.varint(self._string_index(s))
+
+    def value(self, v) -> None:
+        if v is None:
+            self.out.append(_NONE)
+        elif v is True or v is False:
+            self.out.append(_TRUE if v else _FALSE)
+        elif isinstance(v, int):
+            self.out.append(_INT)
+            self.zigzag(v)
+        elif isinstance(v, str):
+            self.out.append(_STR)
+            self.string(v)
+        else:
+            raise EngineError(f"Cannot encode value {v!r}")
+
+    def card(self, card) -> None:
+        if not hasattr(card, "current_hp"):
+            self.varint(1 + self._string_index(card.card_id))
+            return
+        self.out.append(0)
+        self.string(card.card_id)
+        self.zigzag(card.current_hp)
+        self.cards(card.attached_energies)
+        self.varint(len(card.status))
+        for s in sorted(card.status):
+            self.string(s)
+
+    def cards(self, cards) -> None:
+        self.varint(len(cards))
+        for c in cards:
+            self.card(c)
+
+    def blob(self, data) -> None:
+        if data is None:
+            self.varint(0)
+            return
+        raw = dump_canonical(data).encode("utf-8")
+        self.varint(len(raw))
+        self.out += raw
+
+    def _string_index(self, s: str) -> int:
+        idx = self.strings.get(s)
+        if idx is None:
+            idx = self.strings[s] = len(self.strings)
+        return idx
+
+
+class _Reader:
+    def __init__(self, data: memoryview, pos: int, card_db):
+        self.data = data
+        self.pos = pos
+        self.card_db = card_db
+        self.strings: list[str] = []
+        self.definitions: dict[int, Any] = {}
+
+    def varint(self) -> int:
+        data = self.data
+        pos = self.pos
+        n = shift = 0
+        while True:
+            b = data[pos]
+            pos += 1
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                self.pos = pos
+                return n
+            shift += 7
+
+    def zigzag(self) -> int:
+        n = self.varint()
+        return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+    def string(self) -> str:
+        return self.strings[self.varint()]
+
+    def value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _NONE:
+            return None
+        if tag == _FALSE or tag == _TRUE:
+            return tag == _TRUE
+        if tag == _INT:
+            return self.zigzag()
+        if tag == _STR:
+            return self.string()
+        raise EngineError(f"Corrupt snapshot: unknown value tag {tag}")
+
+    def definition(self, idx: int):
+        d = self.definitions.get(idx)
+        if d is None:
+            d = self.definitions[idx] = get_definition(self.strings[idx], self.card_db)
+        return d
+
+    def card(self):
+        head = self.varint()
+        if head:
+            return card_from_definition(self.definition(head - 1))
+        card = card_from_definition(self.definition(self.varint()))
+        card.current_hp = self.zigzag()
+        card.attached_energies = self.cards()
+        pool = {}
+        for e in card.attached_energies:
+            pool[e.energy_type] = pool.get(e.energy_type, 0) + 1
+        card.energy_pool = pool
+        card.status = {self.string() for _ in range(self.varint())}
+        return card
+
+    def cards(self) -> list:
+        out = []
+        data = self.data
+        defs = self.definitions
+        for _ in range(self.varint()):
+            head = data[self.pos]
+            if 0 < head < 0x80 and head - 1 in defs:
+                # Plain card whose definition is already resolved (the common case)
+                self.pos += 1
+                out.append(card_from_definition(defs[head - 1]))
+            else:
+                out.append(self.card())
+        return out
+
+    def blob(self):
+        size = self.varint()
+        if not size:
+            return None
+        start = self.pos
+        self.pos += size
+        return json.loads(str(self.data[start:self.pos], "utf-8"))
+
+
+def encode_state(state, include_events: bool = True) -> bytes:
+    """Snapshot `state` as bytes; `include_events=False` leaves the event log out."""
+    w = _Writer()
+    w.varint(state.active_player)
+    w.varint(state.turn)
+    w.string(state.phase)
+    w.value(state.winner)
+    w.varint(len(state.turn_flags))
+    for name, v in state.turn_flags.items():
+        w.string(name)
+        w.value(v)
+
+    if state.rng is None:
+        w.out.append(0)
+    else:
+        w.out.append(1)
+        w.out += _U64.pack(state.rng.key)
+        w.varint(state.rng.counter)
+    w.varint(len(state.rng_counters))
+    for labels, n in state.rng_counters.items():
+        w.varint(len(labels))
+        for label in labels:
+            w.value(label)
+        w.varint(n)
+
+    for p in state.players:
+        if p.active is None:
+            w.out.append(0)
+        else:
+            w.out.append(1)
+            w.card(p.active)
+        for zone in ZONES:
+            w.cards(getattr(p, zone))
+
+    w.blob(state.trainer.to_json() if state.trainer is not None else None)
+    w.blob(state.deck.to_json() if state.deck is not None else None)
+    events = None
+    if include_events and len(state.event_log):
+        events = [[e.type, e.payload] if isinstance(e, GameEvent) else e for e in state.event_log]
+    w.blob(events)
+    pending = state.pending
+    if pending is not None:
+        definition, attack = pending.source
+        pending = {
+            "card_id": definition.card_id,
+            "attack": attack,
+            "controller": pending.controller,
+            "frames": [list(f) for f in pending.frames],
+            "max": pending.choice.max,
+        }
+    w.blob(pending)
+
+    out = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION))
+    _put_varint(out, len(w.strings))
+    for s in w.strings:
+        raw = s.encode("utf-8")
+        _put_varint(out, len(raw))
+        out += raw
+    out += w.out
+    return bytes(out)
+
+
+def decode_state(data, card_db: Mapping[str, Any]) -> GameState:
+    """Rebuild a GameState from encode_state() output (bytes-like, read without copying)."""
+    data = memoryview(data)
+    if len(data) < _HEADER.size:
+        raise EngineError("Not a GameState snapshot")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise EngineError("Not a GameState snapshot")
+    if version > FORMAT_VERSION:
+        raise EngineError(f"GameState snapshot version {version} is newer than supported ({FORMAT_VERSION})")
+
+    r = _Reader(data, _HEADER.size, card_db)
+    for _ in range(r.varint()):
+        size = r.varint()
+        r.strings.append(str(data[r.pos:r.pos + size], "utf-8"))
+        r.pos += size
+
+    state = GameState(active_player=r.varint(), turn=r.varint(), phase=r.string(), winner=r.value())
+    state.turn_flags = {r.string(): r.value() for _ in range(r.varint())}
+
+    if data[r.pos]:
+        (key,) = _U64.unpack_from(data, r.pos + 1)
+        r.pos += 1 + _U64.size
+        state.rng = Stream(key, r.varint())
+    else:
+        r.pos += 1
+    counters = {}
+    for _ in range(r.varint()):
+        labels = tuple(r.value() for _ in range(r.varint()))
+        counters[labels] = r.varint()
+    state.rng_counters = counters
+
+    for p in state.players:
+        r.pos += 1
+        p.active = r.card() if data[r.pos - 1] else None
+        p.deck = r.cards()
+        p.hand = r.cards()
+        p.bench = r.cards()
+        p.discard = r.cards()
+
+    trainer = r.blob()
+    deck = r.blob()
+    events = r.blob()
+    state.trainer = Trainer.from_json(trainer) if trainer is not None else None
+    state.deck = Deck.from_json(deck) if deck is not None else None
+    if events:
+        state.event_log = EventLog(GameEvent(*e) if isinstance(e, list) else e for e in events)
+    pending = r.blob() if version >= 2 else None
+    if pending is not None:
+        state.pending = _decode_pending(pending, state, card_db)
+    return state
+
+
+def _decode_pending(data, state, card_db) -> PendingChoice:
+    definition = get_definition(data["card_id"], card_db)
+    source = (definition, data["attack"])
+    frames = tuple((key, i, n) for key, i, n in data["frames"])
+    tree = attack_trees(definition).get(data["attack"])
+    if tree is None:
+        raise EngineError(f"Corrupt snapshot: {data['card_id']} has no attack {data['attack']!r}")
+    # Only the size limit is stored; the options come from the decoded zones
+    stub = PendingChoice(Choice("", data["controller"], (), 0, data["max"]), source, data["controller"], frames)
+    return reoffer(tree, state, stub)
@@ -0,0 +1,368 @@
+"""
+Round-robin deck tournaments.
+
+Every pairing of the decks in a directory plays `games` games (seats
+alternate, see sim.play_game), spread over a process pool in chunks. Game
+seeds come from (seed, deck names, game index), so results never depend on
+the worker count or on how often the run was interrupted.
+
+Results go to a compact columnar file that doubles as the checkpoint: each
+finished chunk is appended as one block of columns, so an interrupted run
+picks up where it stopped when started again with the same arguments.
+
+    b"PTCGTN" | format version (1 byte)
+    header length (4 bytes) | header (canonical JSON: decks, deck_hashes, games, seed, policy, max_turns)
+    blocks: payload length (4 bytes), crc32 (4 bytes), payload
+        payload: row count (4 bytes), then one little-endian column each of
+        pair (u16), game (u32), winner (i8: 0 first deck, 1 second, -1 draw),
+        turns (u16), steps (u32), microseconds (u32)
+
+A block cut short by an interruption fails its length or crc check and is
+dropped (and overwritten) on resume. The header is written to a temporary
+file and moved into place, so an interrupted start leaves no half header;
+deck_hashes (see deck_hash) make a resume refuse a deck whose cards changed
+under the same name.
+
+    python -m ptcgengine.tournament decks/ --games 200 --out nightly.ptn --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+from .deck import Deck
+from .errors import EngineError
+from .registry import load_registry
+from .rng import Stream
+from .serialization import dump_canonical, load_json
+from .sim import POLICIES, game_seed, play_game
+from .trainer import Trainer
+
+MAGIC = b"PTCGTN"
+FORMAT_VERSION = 2
+
+COLUMNS = (("pair", "H"), ("game", "I"), ("winner", "b"), ("turns", "H"), ("steps", "I"), ("micros", "I"))
+
+_U32 = struct.Struct("<I")
+_BLOCK = struct.Struct("<II")
+
+
+def load_decks(directory: str) -> Dict[str, Deck]:
+    """
+    Decks of every *.json file in `directory`, keyed by file stem. A Trainer
+    file contributes its active deck (resolved as core.trainer_loader does);
+    deck files already used that way are not entered twice.
+    """
+    found: Dict[str, Deck] = {}
+    used = set()
+    for path in sorted(Path(directory).glob("*.json")):
+        data = load_json(path)
+        if "cards" in data:
+            found[path.stem] = Deck.from_json(data)
+            continue
+        trainer = Trainer.from_json(data)
+        if not trainer.active_deck:
+            raise EngineError(f"{path.name}: trainer {trainer.name!r} has no active deck")
+        deck_path = (path.parent / trainer.active_deck).resolve()
+        if deck_path.parent == path.parent.resolve():
+            used.add(deck_path.stem)
+        found[path.stem] = Deck.from_json(load_json(deck_path))
+    return {name: deck for name, deck in found.items() if name not in used}
+
+
+def deck_hash(deck: Deck) -> str:
+    """Digest of a deck's contents (definition ids and counts, order ignored)."""
+    counts: Dict[str, int] = {}
+    for c in deck.cards:
+        counts[c.identity.definition_id] = counts.get(c.identity.definition_id, 0) + 1
+    return hashlib.blake2b(dump_canonical(sorted(counts.items())).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def pair_seed(seed: int, a: str, b: str) -> int:
+    return Stream.from_seed(seed).split("pair", a, b).u64() >> 1
+
+
+###############################################################
+# RESULTS FILE
+###############################################################
+
+def _encode_block(rows: Sequence[Tuple[int, ...]]) -> bytes:
+    payload = bytearray(_U32.pack(len(rows)))
+    for i, (_, code) in enumerate(COLUMNS):
+        payload += struct.pack(f"<{len(rows)}{code}", *(r[i] for r in rows))
+    return _BLOCK.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _decode_block(payload) -> Dict[str, Tuple[int, ...]]:
+    (n,) = _U32.unpack_from(payload)
+    pos = _U32.size
+    out = {}
+    for name, code in COLUMNS:
+        fmt = f"<{n}{code}"
+        out[name] = struct.unpack_from(fmt, payload, pos)
+        pos += struct.calcsize(fmt)
+    return out
+
+
+def read_results(path: str) -> Tuple[Dict[str, Any], Dict[str, List[int]], int]:
+    """(header, columns, bytes of valid data) of a results file; damaged trailing blocks are ignored."""
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise EngineError(f"{path} is not a tournament results file")
+    pos = len(MAGIC) + 1 + _U32.size
+    if len(data) < pos:
+        raise EngineError(f"{path}: header is truncated; delete the file to start over")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise EngineError(f"Unsupported tournament format version {data[len(MAGIC)]}")
+    (size,) = _U32.unpack_from(data, pos - _U32.size)
+    try:
+        if len(data) < pos + size:
+            raise ValueError("header shorter than its length")
+        header = json.loads(bytes(data[pos:pos + size]))
+    except ValueError:
+        raise EngineError(f"{path}: header is truncated; delete the file to start over") from None
+    pos += size
+
+    columns: Dict[str, List[int]] = {name: [] for name, _ in COLUMNS}
+    while pos + _BLOCK.size <= len(data):
+        length, crc = _BLOCK.unpack_from(data, pos)
+        payload = data[pos + _BLOCK.size:pos + _BLOCK.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        for name, values in _decode_block(payload).items():
+            columns[name].extend(values)
+        pos += _BLOCK.size + length
+    return header, columns, pos
+
+
+###############################################################
+# RUNNING
+###############################################################
+
+@dataclass(frozen=True)
+class DeckTiming:
+    games: int
+    steps: int
+    seconds: float
+
+    @property
+    def ms_per_game(self) -> float:
+        return 1000 * self.seconds / self.games if self.games else 0.0
+
+    @property
+    def steps_per_sec(self) -> float:
+        return self.steps / self.seconds if self.seconds else 0.0
+
+
+class TournamentResult:
+    """Aggregated results; indices follow `decks` (sorted deck names)."""
+
+    def __init__(self, header: Mapping[str, Any], columns: Mapping[str, Sequence[int]]):
+        self.decks: List[str] = list(header["decks"])
+        n = len(self.decks)
+        pairs = list(combinations(range(n), 2))
+        self.games_per_pair: int = header["games"]
+        # wins[i][j]: games deck i won against deck j; draws[i][j] symmetric
+        self.wins = [[0] * n for _ in range(n)]
+        self.draws = [[0] * n for _ in range(n)]
+        games, steps, micros = [0] * n, [0] * n, [0] * n
+        for pair, winner, step_count, us in zip(
+            columns["pair"], columns["winner"], columns["steps"], columns["micros"], strict=True
+        ):
+            i, j = pairs[pair]
+            if winner == 0:
+                self.wins[i][j] += 1
+            elif winner == 1:
+                self.wins[j][i] += 1
+            else:
+                self.draws[i][j] += 1
+                self.draws[j][i] += 1
+            for d in (i, j):
+                games[d] += 1
+                steps[d] += step_count
+                micros[d] += us
+        self.timing = {
+            name: DeckTiming(games[d], steps[d], micros[d] / 1e6) for d, name in enumerate(self.decks)
+        }
+
+    def games(self, i: int, j: int) -> int:
+        return self.wins[i][j] + self.wins[j][i] + self.draws[i][j]
+
+    def win_rate(self, i: int, j: int) -> float:
+        """Score of deck i against deck j (a draw counts half); nan before any game."""
+        n = self.games(i, j)
+        return (self.wins[i][j] + 0.5 * self.draws[i][j]) / n if n else math.nan
+
+    def interval(self, i: int, j: int, z: float = 1.96) -> Tuple[float, float]:
+        """Wilson score interval of win_rate(i, j) (95% by default)."""
+        n = self.games(i, j)
+        if not n:
+            return (0.0, 1.0)
+        p = self.win_rate(i, j)
+        centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return (max(0.0, centre - half), min(1.0, centre + half))
+
+    def matrix(self) -> List[List[float]]:
+        n = len(self.decks)
+        return [[math.nan if i == j else self.win_rate(i, j) for j in range(n)] for i in range(n)]
+
+    @property
+    def complete(self) -> bool:
+        pairs = combinations(range(len(self.decks)), 2)
+        return all(self.games(i, j) >= self.games_per_pair for i, j in pairs)
+
+    def format(self) -> str:
+        width = max([8, *(len(d) for d in self.decks)])
+        lines = [" " * width + "".join(f"{d[:width]:>{width + 2}}" for d in self.decks)]
+        for i, name in enumerate(self.decks):
+            cells = "".join(
+                f"{'-':>{width + 2}}" if i == j else f"{self.win_rate(i, j):>{width + 2}.3f}"
+                for j in range(len(self.decks))
+            )
+            lines.append(f"{name:<{width}}" + cells)
+        lines.append("")
+        for i, j in combinations(range(len(self.decks)), 2):
+            lo, hi = self.interval(i, j)
+            lines.append(
+                f"{self.decks[i]} vs {self.decks[j]}: {self.win_rate(i, j):.3f} "
+                f"[{lo:.3f}, {hi:.3f}] over {self.games(i, j)} games"
+            )
+        lines.append("")
+        for name, t in self.timing.items():
+            lines.append(f"{name:<{width}}  {t.games:>7} games  {t.ms_per_game:8.2f} ms/game  {t.steps_per_sec:10.0f} steps/s")
+        return "\n".join(lines)
+
+
+def run(
+    decks: Mapping[str, Deck],
+    games: int,
+    out: str,
+    card_db: Mapping[str, Any] | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+    policy: str = "random",
+    max_turns: int = 200,
+    chunk_size: int = 50,
+) -> TournamentResult:
+    """
+    Play every pairing of `decks` `games` times, appending results to `out`.
+    If `out` already holds a run with the same settings, only the missing
+    games are played.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}; choose from {sorted(POLICIES)}")
+    card_db = card_db if card_db is not None else load_registry()
+    workers = workers if workers is not None else os.cpu_count() or 1
+    names = sorted(decks)
+    if len(names) < 2:
+        raise EngineError(f"A tournament needs at least two decks, got {len(names)}")
+    header = {
+        "decks": names,
+        "deck_hashes": [deck_hash(decks[name]) for name in names],
+        "games": games,
+        "seed": seed,
+        "policy": policy,
+        "max_turns": max_turns,
+    }
+
+    done = set()
+    if os.path.exists(out) and os.path.getsize(out):
+        existing, columns, valid = read_results(out)
+        if existing != header:
+            changed = []
+            if existing.get("decks") == names:
+                old = existing.get("deck_hashes") or [None] * len(names)
+                changed = [n for n, h, o in zip(names, header["deck_hashes"], old, strict=True) if h != o]
+            if changed:
+                raise EngineError(f"{out} was played with different contents for decks {changed}")
+            raise EngineError(f"{out} holds a different tournament: {existing}")
+        done.update(zip(columns["pair"], columns["game"], strict=True))
+        with open(out, "r+b") as f:
+            f.truncate(valid)
+    else:
+        raw = dump_canonical(header).encode("utf-8")
+        tmp = f"{out}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + bytes([FORMAT_VERSION]) + _U32.pack(len(raw)) + raw)
+        os.replace(tmp, out)
+
+    jobs = []
+    for pair, (a, b) in enumerate(combinations(names, 2)):
+        todo = [g for g in range(games) if (pair, g) not in done]
+        for k in range(0, len(todo), chunk_size):
+            jobs.append((pair, decks[a], decks[b], card_db, pair_seed(seed, a, b), policy, max_turns, todo[k:k + chunk_size]))
+
+    with open(out, "ab") as f:
+        for rows in _play_all(jobs, workers):
+            f.write(_encode_block(rows))
+            f.flush()
+
+    header, columns, _ = read_results(out)
+    return TournamentResult(header, columns)
+
+
+def _play_all(jobs, workers) -> Iterable[List[Tuple[int, ...]]]:
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _play_chunk(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(_play_chunk, job) for job in jobs]):
+            yield future.result()
+
+
+def _play_chunk(job) -> List[Tuple[int, ...]]:
+    pair, deck_a, deck_b, card_db, seed, policy, max_turns, indices = job
+    rows = []
+    for i in indices:
+        start = time.perf_counter()
+        r = play_game(deck_a, deck_b, card_db, game_seed(seed, i), (policy, policy), max_turns, index=i)
+        micros = int((time.perf_counter() - start) * 1e6)
+        winner = -1 if r.winner is None else r.winner
+        rows.append((pair, i, winner, min(r.turns, 0xFFFF), r.steps, min(micros, 0xFFFFFFFF)))
+    return rows
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m ptcgengine.tournament", description=__doc__.split("\n\n")[1])
+    parser.add_argument("directory", help="Directory of deck (Deck.to_json) or trainer JSON files")
+    parser.add_argument("--games", type=int, default=100, help="Games per pairing")
+    parser.add_argument("--out", default="tournament.ptn", help="Results file (resumed if it exists)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", default="random", choices=sorted(POLICIES))
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--card-db", default=None, help="Card database JSON (defaults to the packaged one)")
+    args = parser.parse_args(argv)
+
+    result = run(
+        load_decks(args.directory),
+        args.games,
+        args.out,
+        card_db=load_registry(args.card_db),
+        seed=args.seed,
+        workers=args.workers,
+        policy=args.policy,
+        max_turns=args.max_turns,
+        chunk_size=args.chunk_size,
+    )
+    print(result.format())
+
+
+if __name__ == "__main__":
+    main()
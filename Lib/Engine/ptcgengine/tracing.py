@@ -0,0 +1,267 @@
+"""
+Structured tracing and lightweight runtime statistics.
+
+Tracing is organised in named channels ("effect", "turn", ...), each with
+its own level. Call sites guard on the channel's precomputed flags:
+
+    _TRACE = channel("effect")
+    ...
+    if _TRACE.debug:
+        _TRACE.emit(DEBUG, "exec", op=op)
+
+so a disabled channel costs one attribute check and never builds messages.
+Records go to the configured sinks: stderr by default, or an in-memory
+RingBufferSink for headless runs and tests.
+
+Statistics (call counters plus log2 timing histograms) are collected by
+functions decorated with @instrument(name) while STATS.enabled is set.
+@instrument only wraps when PTCG_STATS is set at import time; otherwise it
+hands back the function itself, so step/apply/get_available_actions pay
+nothing for it. enable_stats() at runtime still switches the inline
+STATS.count() call sites (effect ops, ...) on and off.
+
+Both can be switched on without code changes through environment variables:
+    PTCG_TRACE="effect=debug,turn=info"   (or "*=debug")
+    PTCG_STATS=1
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+OFF = 0
+INFO = 1
+DEBUG = 2
+
+LEVELS = {"off": OFF, "info": INFO, "debug": DEBUG}
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    category: str
+    level: int
+    message: str
+    fields: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = 0.0
+
+
+class Channel:
+    """A tracing category. Check .info / .debug before calling emit()."""
+
+    __slots__ = ("name", "level", "info", "debug")
+
+    def __init__(self, name: str, level: int = OFF):
+        self.name = name
+        self._set_level(level)
+
+    def _set_level(self, level: int) -> None:
+        self.level = level
+        self.info = level >= INFO
+        self.debug = level >= DEBUG
+
+    def emit(self, level: int, message: str, **fields) -> None:
+        if level > self.level:
+            return
+        record = TraceRecord(self.name, level, message, fields, time.perf_counter())
+        for sink in _SINKS:
+            sink(record)
+
+    def __repr__(self):
+        return f"<Channel {self.name} level={self.level}>"
+
+
+def stderr_sink(record: TraceRecord) -> None:
+    extra = " ".join(f"{k}={v!r}" for k, v in record.fields.items())
+    print("[TRACE]", f"{record.category}:", record.message, extra, file=sys.stderr)
+
+
+class RingBufferSink:
+    """Keeps the most recent `capacity` trace records in memory."""
+
+    def __init__(self, capacity: int = 1024):
+        self._records: deque[TraceRecord] = deque(maxlen=capacity)
+
+    def __call__(self, record: TraceRecord) -> None:
+        self._records.append(record)
+
+    def records(self, category: str | None = None) -> List[TraceRecord]:
+        if category is None:
+            return list(self._records)
+        return [r for r in self._records if r.category == category]
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+
+_CHANNELS: Dict[str, Channel] = {}
+_LEVEL_SPEC: Dict[str, int] = {}
+_SINKS: List[Callable[[TraceRecord], None]] = [stderr_sink]
+
+
+def channel(name: str) -> Channel:
+    """Return the process-wide channel for `name`, creating it if needed."""
+    ch = _CHANNELS.get(name)
+    if ch is None:
+        ch = _CHANNELS[name] = Channel(name, _level_for(name))
+    return ch
+
+
+def configure(
+    levels: str | Dict[str, int | str] | None = None,
+    sinks: Iterable[Callable[[TraceRecord], None]] | None = None,
+) -> None:
+    """
+    Set channel levels and/or sinks.
+
+    `levels` is either a dict {category: level} or a spec string like
+    "effect=debug,turn=info". The "*" category sets the default for every
+    channel not listed. Passing levels replaces the previous configuration.
+    """
+    if levels is not None:
+        if isinstance(levels, str):
+            levels = _parse_spec(levels)
+        _LEVEL_SPEC.clear()
+        for name, level in levels.items():
+            _LEVEL_SPEC[name] = LEVELS[level.lower()] if isinstance(level, str) else int(level)
+        for ch in _CHANNELS.values():
+            ch._set_level(_level_for(ch.name))
+    if sinks is not None:
+        _SINKS[:] = list(sinks)
+
+
+def disable() -> None:
+    """Turn every channel off."""
+    configure({})
+
+
+def _level_for(name: str) -> int:
+    return _LEVEL_SPEC.get(name, _LEVEL_SPEC.get("*", OFF))
+
+
+def _parse_spec(spec: str) -> Dict[str, int]:
+    levels = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, level = part.partition("=")
+        levels[name.strip()] = LEVELS[(level or "debug").strip().lower()]
+    return levels
+
+
+# ---------------------------
+# Statistics
+# ---------------------------
+class Histogram:
+    """Timing histogram with power-of-two nanosecond buckets."""
+
+    __slots__ = ("buckets", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, ns: int) -> None:
+        self.buckets[min(ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> int:
+        """Upper bound (ns) of the bucket holding the q-th quantile (0..1)."""
+        if not self.count:
+            return 0
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return 1 << i
+        return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ns": self.total_ns // self.count if self.count else 0,
+            "p50_ns": self.percentile(0.5),
+            "p99_ns": self.percentile(0.99),
+            "max_ns": self.max_ns,
+        }
+
+
+class Stats:
+    """Per-op counters and timing histograms, collected while enabled."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.counters: Counter[str] = Counter()
+        self.histograms: Dict[str, Histogram] = {}
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def record(self, name: str, ns: int) -> None:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        hist.add(ns)
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "timings": {k: h.summary() for k, h in self.histograms.items()},
+        }
+
+
+STATS = Stats(enabled=os.environ.get("PTCG_STATS", "") not in ("", "0"))
+# Whether @instrument wraps at all; fixed when the module is imported
+_INSTRUMENT = STATS.enabled
+
+
+def enable_stats(on: bool = True) -> None:
+    STATS.enabled = on
+
+
+def instrument(name: str):
+    """
+    Count calls to and time the decorated function while STATS is enabled.
+    A no-op unless PTCG_STATS was set when the module was imported.
+    """
+
+    def decorator(fn):
+        if not _INSTRUMENT:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not STATS.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STATS.record(name, time.perf_counter_ns() - start)
+                STATS.count(name)
+        return wrapper
+
+    return decorator
+
+
+if os.environ.get("PTCG_TRACE"):
+    configure(os.environ["PTCG_TRACE"])
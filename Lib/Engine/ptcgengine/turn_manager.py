@@ -2,7 +2,10 @@
 Turn and phase management for the TCG engine.
 """
 
-from .utils import trace
+from .events import game_over_event, knockout_event
+from .tracing import INFO, channel, instrument
+
+_TRACE = channel("turn")
 
 # Phases (simple for now)
 PHASE_START = "start"
@@ -10,31 +13,63 @@ PHASE_MAIN = "main"
 PHASE_ATTACK = "attack"
 PHASE_END = "end"
 
+TURN_FLAG_DEFAULTS = {
+    "retreat_used": False,
+    "attack_used": False,
+    "energy_attached": False,
+}
+
 def init_turn_flags(state):
     """Reset per-turn flags."""
-    state.turn_flags = {
-        "retreat_used": False,
-        "attack_used": False,
-        "energy_attached": False,
-    }
+    state.set_flags(TURN_FLAG_DEFAULTS)
 
+@instrument("turn.start")
 def start_of_turn(state):
     """Handles draw step + resets flags."""
-    player = state.players[state.active_player]
-    if player.deck:
-        player.hand.append(player.deck.pop())
+    ap = state.active_player
+    if state.players[ap].deck:
+        state.add_card(ap, "hand", state.take_card(ap, "deck"))
 
     init_turn_flags(state)
 
-    state.phase = PHASE_MAIN
-    trace(f"Start of turn {state.turn}, player {state.active_player}")
+    state.set("phase", PHASE_MAIN)
+    if _TRACE.info:
+        _TRACE.emit(INFO, "start of turn", turn=state.turn, player=state.active_player)
 
+@instrument("turn.end")
 def end_turn(state):
     """Switch active player and increment turn counter."""
-    trace(f"Ending turn for player {state.active_player}")
-    state.active_player = 1 - state.active_player
-    state.turn += 1
-    state.phase = PHASE_START
+    if _TRACE.info:
+        _TRACE.emit(INFO, "end of turn", turn=state.turn, player=state.active_player)
+    state.set("active_player", 1 - state.active_player)
+    state.set("turn", state.turn + 1)
+    state.set("phase", PHASE_START)
+
+def resolve_knockouts(state):
+    """
+    Discard every active Pokémon at 0 HP (with its energy) and promote the
+    first benched Pokémon. A player with nothing left to promote loses: the
+    winner is recorded and the game moves to PHASE_END.
+    """
+    events = []
+    for i in (1 - state.active_player, state.active_player):
+        mon = state.players[i].active
+        if mon is None or mon.current_hp > 0:
+            continue
+        events.append(knockout_event(mon.card_id, i))
+        for energy in mon.attached_energies:
+            state.add_card(i, "discard", energy)
+        mon = state.update_card(mon, attached_energies=[], energy_pool={})
+        state.add_card(i, "discard", mon)
+        if state.players[i].bench:
+            state.set_active(i, state.take_card(i, "bench", 0))
+            continue
+        state.set_active(i, None)
+        if state.winner is None:
+            state.set("winner", 1 - i)
+            state.set("phase", PHASE_END)
+            events.append(game_over_event(1 - i))
+    return events
 
 def apply_phase_transitions(state):
     """
@@ -1,8 +1,8 @@
-import sys
+from .tracing import DEBUG, channel
 
-TRACE_ENABLED = True
+_TRACE = channel("engine")
 
 def trace(*args):
-    """Simple debug logger."""
-    if TRACE_ENABLED:
-        print("[TRACE]", *args, file=sys.stderr)
+    """Simple debug logger, routed to the "engine" tracing channel (off by default)."""
+    if _TRACE.debug:
+        _TRACE.emit(DEBUG, " ".join(str(a) for a in args))
@@ -0,0 +1,125 @@
+"""
+Vectorised multi-game environment.
+
+VecBattleEnv keeps n_games independent games and advances all of them with
+one step() call that takes an array of action indices (see
+encoding.action_from_index) and returns stacked NumPy arrays:
+
+    obs      float32 (n_games, encoding.NUM_FEATURES), side to move first
+    rewards  float32 (n_games,), +1 / -1 when the move just played won / lost
+    dones    bool    (n_games,), the game in that slot ended on this step
+    masks    bool    (n_games, encoding.NUM_ACTIONS), legal actions
+
+Finished games are replaced by fresh ones before returning, so obs and masks
+always describe a live game. Episodes are seeded like sim.run (episode k
+uses sim.game_seed(seed, k), odd episodes swap seats), and winners records
+which deck won each finished game. The returned arrays are reused between
+calls; copy them if they need to outlive the next step().
+
+Callers only see arrays, so the list of GameState objects behind them can
+later be replaced by a struct-of-arrays backend.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from . import api, encoding
+from .deck import Deck
+from .registry import load_registry
+from .sim import game_seed
+
+
+class VecBattleEnv:
+    def __init__(
+        self,
+        n_games: int,
+        decks: Sequence[Deck],
+        seed: int = 0,
+        card_db: Mapping[str, Any] | None = None,
+        max_turns: int = 200,
+    ):
+        if n_games < 1:
+            raise ValueError("n_games must be at least 1")
+        deck_a, deck_b = decks
+        self.n_games = n_games
+        self.decks = (deck_a, deck_b)
+        self.seed = seed
+        self.card_db = card_db if card_db is not None else load_registry()
+        self.max_turns = max_turns
+
+        self.states = [None] * n_games
+        self.obs, self.masks = encoding.allocate(n_games)
+        self.rewards = np.zeros(n_games, dtype=np.float32)
+        self.dones = np.zeros(n_games, dtype=np.bool_)
+        # Deck index (0 / 1) that won the game finished in each slot on the
+        # last step; -1 for a draw or when the slot did not finish.
+        self.winners = np.full(n_games, -1, dtype=np.int8)
+        self._swapped = [False] * n_games
+        self._episodes = 0
+
+    num_actions = encoding.NUM_ACTIONS
+    num_features = encoding.NUM_FEATURES
+
+    def reset(self):
+        """Start a new game in every slot; returns (obs, masks)."""
+        self._episodes = 0
+        for i in range(self.n_games):
+            self._new_game(i)
+        self.rewards[:] = 0
+        self.dones[:] = False
+        self.winners[:] = -1
+        encoding.encode_into(self.states, self.obs, self.masks, self.card_db)
+        return self.obs, self.masks
+
+    def step(self, actions):
+        """
+        Play actions[i] (an action index) in game i for every slot; returns
+        (obs, rewards, dones, masks). Raises EngineError, before any game
+        moves, if an index is illegal.
+        """
+        if len(actions) != self.n_games:
+            raise ValueError(f"Expected {self.n_games} actions, got {len(actions)}")
+        card_db = self.card_db
+        rewards, dones, winners = self.rewards, self.dones, self.winners
+        rewards[:] = 0
+        dones[:] = False
+        winners[:] = -1
+
+        if self.states[0] is None:
+            raise RuntimeError("reset() must be called before step()")
+        # Resolve every index first so an illegal one leaves all games untouched
+        chosen = [
+            encoding.action_from_index(state, int(a), card_db)
+            for state, a in zip(self.states, actions, strict=True)
+        ]
+
+        for i, (state, action) in enumerate(zip(self.states, chosen, strict=True)):
+            actor = state.active_player
+            api.apply(state, action, card_db)
+            api.commit(state)
+
+            winner = state.winner
+            if winner is None and state.turn <= self.max_turns and \
+                    encoding.legal_action_indices(state, card_db):
+                continue
+            if winner is not None:
+                rewards[i] = 1.0 if winner == actor else -1.0
+                winners[i] = 1 - winner if self._swapped[i] else winner
+            dones[i] = True
+            self._new_game(i)
+
+        encoding.encode_into(self.states, self.obs, self.masks, card_db)
+        return self.obs, rewards, dones, self.masks
+
+    def _new_game(self, i):
+        episode = self._episodes
+        self._episodes += 1
+        swap = episode % 2 == 1
+        a, b = self.decks
+        if swap:
+            a, b = b, a
+        self.states[i] = api.new_game(a, b, self.card_db, seed=game_seed(self.seed, episode))
+        self._swapped[i] = swap
@@ -1,9 +1,36 @@
 """
 Renderer-friendly view of the engine state.
 Uses card.snapshot() on each card instance.
+
+A pending choice (say, which deck cards to search for) shows its options
+only to the seat making it: the options of a deck search are that player's
+deck. Everyone else, and the seat-less view, gets their number.
+
+Clients that already hold a view can be sent patches instead of a full
+view each time. A patch is a JSON-friendly dict
+
+    {"from": 3, "to": 5, "ops": [["set", ["players", 1, "active", "hp"], 40],
+                                 ["set", ["players", 1, "discard", 7], {...}],
+                                 ["trim", ["players", 0, "bench"], 2]]}
+
+whose ops run in order. A path is a list of dict keys and list indices:
+"set" replaces the value at the path (an index one past the end appends),
+"trim" cuts the list at the path to the given length. diff_views() builds
+the ops between two views and apply_patch() applies them. ViewHistory
+numbers the views of one game and keeps the ops behind the most recent
+ones, so a client that reports the version it holds gets only what has
+changed since then.
 """
 
-def render_state(state):
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, List
+
+from .errors import EngineError
+
+
+def render_state(state, seat=None):
     return {
         "turn": state.turn,
         "active_player": state.active_player,
@@ -12,7 +39,26 @@ def render_state(state):
             _view_player(state.players[0]),
             _view_player(state.players[1]),
         ],
+        "pending": _view_choice(state.pending.choice, seat) if state.pending is not None else None,
+    }
+
+def _view_choice(choice, seat):
+    view = {
+        "player": choice.player,
+        "min": choice.min,
+        "max": choice.max,
+        "option_count": len(choice.options),
     }
+    options = choice_options(choice, seat)
+    if options is not None:
+        view["options"] = options
+    return view
+
+def choice_options(choice, seat):
+    """Snapshots of a choice's options if `seat` is the one choosing, else None."""
+    if choice is None or seat != choice.player:
+        return None
+    return [c.snapshot() for c in choice.options]
 
 def _view_player(p):
     return {
@@ -22,3 +68,123 @@ def _view_player(p):
         "deck_count": len(p.deck),
         "discard": [c.snapshot() for c in p.discard],
     }
+
+
+###############################################################
+# PATCHES
+###############################################################
+
+def diff_views(old, new) -> List[list]:
+    """Patch ops that turn view `old` into view `new`."""
+    ops: List[list] = []
+    _diff(old, new, [], ops)
+    return ops
+
+
+def _diff(old, new, path, ops):
+    if type(old) is not type(new):
+        ops.append(["set", path, new])
+    elif old == new:
+        return
+    elif isinstance(new, dict) and old.keys() == new.keys():
+        for key, value in new.items():
+            _diff(old[key], value, [*path, key], ops)
+    elif isinstance(new, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            _diff(old[i], new[i], [*path, i], ops)
+        if len(new) < len(old):
+            ops.append(["trim", path, len(new)])
+        for i in range(common, len(new)):
+            ops.append(["set", [*path, i], new[i]])
+    else:
+        ops.append(["set", path, new])
+
+
+def apply_patch(view, patch):
+    """
+    The view `patch` (a patch dict or a bare list of ops) turns `view`
+    into. `view` is not modified: containers on a changed path are copied
+    (once per patch) and everything else is shared with it.
+    """
+    ops = patch["ops"] if isinstance(patch, dict) else patch
+    # ids of the containers this call copied, and may therefore change
+    fresh: set = set()
+    for op in ops:
+        kind, path = op[0], op[1]
+        if kind not in ("set", "trim"):
+            raise EngineError(f"Unknown patch op {kind!r}")
+        if not path:
+            view = op[2] if kind == "set" else view[:op[2]]
+            continue
+        try:
+            view = node = _writable(view, fresh)
+            for key in path[:-1]:
+                node[key] = _writable(node[key], fresh)
+                node = node[key]
+            key = path[-1]
+            if kind == "trim":
+                node[key] = node[key][:op[2]]
+                fresh.add(id(node[key]))
+            elif isinstance(node, list) and key == len(node):
+                node.append(op[2])
+            else:
+                node[key] = op[2]
+        except (KeyError, IndexError, TypeError) as exc:
+            raise EngineError(f"Patch path {path!r} does not fit the view") from exc
+    return view
+
+
+def _writable(node, fresh: set):
+    if id(node) in fresh:
+        return node
+    if isinstance(node, dict):
+        node = dict(node)
+    elif isinstance(node, list):
+        node = list(node)
+    else:
+        raise TypeError(f"cannot descend into {type(node).__name__}")
+    fresh.add(id(node))
+    return node
+
+
+class ViewHistory:
+    """
+    Numbered views of one game. update() renders the state when it has
+    changed since the last call and gives the view a new version if it
+    differs from the previous one; delta(since) is the patch from version
+    `since` to the current one, or None once `since` is older than the
+    last `keep` versions (send the full view then).
+    """
+
+    def __init__(self, keep: int = 64):
+        self.version = 0
+        self.view: dict[str, Any] | None = None
+        # (version, ops leading to it from version - 1), oldest first
+        self._ops: deque = deque(maxlen=keep)
+        # The state and state version the current view was rendered from
+        self._seen = (None, None)
+
+    def update(self, state) -> int:
+        version = getattr(state, "version", None)
+        if version is not None and self._seen[0] is state and self._seen[1] == version:
+            return self.version
+        self._seen = (state, version)
+        view = render_state(state)
+        if self.view is None:
+            self.view = view
+            return self.version
+        ops = diff_views(self.view, view)
+        if ops:
+            self.version += 1
+            self._ops.append((self.version, ops))
+            self.view = view
+        return self.version
+
+    def delta(self, since: int) -> dict | None:
+        if since == self.version:
+            return {"from": since, "to": since, "ops": []}
+        if not self._ops or not self._ops[0][0] - 1 <= since < self.version:
+            return None
+        ops = [op for version, step in self._ops if version > since for op in step]
+        return {"from": since, "to": self.version, "ops": ops}
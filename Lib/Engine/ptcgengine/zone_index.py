@@ -0,0 +1,95 @@
+"""
+Secondary indexes over a zone's cards.
+
+A ZoneIndex maps index keys to the zone's cards that have them, each list in
+zone order:
+
+    ("supertype", "pokemon")    by card supertype
+    ("type", "lightning")       by Pokémon type
+    ("hp", 7)                   by HP bucket (max HP // HP_BUCKET)
+    ("hp", None)                every card with HP
+
+All keys come from a card's definition, so they never change while the card
+is in the zone; only membership does. GameState's mutation ops keep the
+index of a zone they write in step (appends, removals and card swaps are
+patched in place, inserting mid-zone drops the index). PlayerState.index()
+builds one lazily and throws it away when the zone list it belongs to has
+been replaced or has a different length.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Tuple
+
+HP_BUCKET = 10
+
+
+def index_keys(card) -> Tuple[Hashable, ...]:
+    d = getattr(card, "definition", None)
+    if d is None:
+        return ()
+    hp = getattr(d, "hp", None)
+    if hp is None:
+        return (("supertype", d.supertype),)
+    return (
+        ("supertype", d.supertype),
+        ("hp", hp // HP_BUCKET),
+        ("hp", None),
+        *(("type", t) for t in d.types),
+    )
+
+
+class ZoneIndex:
+    __slots__ = ("zone", "size", "buckets")
+
+    def __init__(self, zone: list):
+        self.zone = zone
+        self.size = len(zone)
+        buckets: Dict[Hashable, List] = {}
+        for card in zone:
+            for key in index_keys(card):
+                bucket = buckets.get(key)
+                if bucket is None:
+                    buckets[key] = [card]
+                else:
+                    bucket.append(card)
+        self.buckets = buckets
+
+    def get(self, key) -> List:
+        """Cards with `key`, in zone order (do not mutate)."""
+        return self.buckets.get(key, ())
+
+    def hp_buckets(self):
+        """(bucket, cards) for every HP bucket present."""
+        return ((k[1], v) for k, v in self.buckets.items() if k[0] == "hp" and k[1] is not None)
+
+    # Maintenance, called by GameState after it changed `zone` in place
+    def inserted(self, pos: int, card) -> bool:
+        """Patch in a card inserted at `pos`; False if the index must be dropped instead."""
+        self.size += 1
+        if pos != self.size - 1:
+            return False
+        buckets = self.buckets
+        for key in index_keys(card):
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [card]
+            else:
+                bucket.append(card)
+        return True
+
+    def removed(self, card) -> None:
+        self.size -= 1
+        for key in index_keys(card):
+            bucket = self.buckets[key]
+            if bucket[-1] is card:
+                bucket.pop()
+            else:
+                del bucket[next(i for i, c in enumerate(bucket) if c is card)]
+            if not bucket:
+                del self.buckets[key]
+
+    def replaced(self, old, new) -> None:
+        for key in index_keys(old):
+            bucket = self.buckets[key]
+            bucket[next(i for i, c in enumerate(bucket) if c is old)] = new
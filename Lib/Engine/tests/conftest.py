@@ -0,0 +1,46 @@
+import pytest
+
+from ptcgengine import api
+from ptcgengine.card_instance import create_instance
+from ptcgengine.cards import load_card_db
+from ptcgengine.deck import Deck
+from ptcgengine.registry import default_registry
+
+
+@pytest.fixture
+def new_state():
+    """Start a game between two copies of a small TestMon deck: new_state(seed=0)."""
+    cards = [create_instance("TestMon")] * 3 + [create_instance("LightningEnergy")] * 17
+    deck = Deck(name="D", cards=cards)
+    db = default_registry()
+
+    def build(seed=0):
+        return api.new_game(deck, deck, db, seed=seed)
+
+    return build
+
+
+@pytest.fixture
+def seeker_db():
+    """The packaged card db plus "Seeker", whose free attack stops to search its deck for a Pokémon."""
+    db = load_card_db()
+    db["Seeker"] = {
+        "name": "Seeker",
+        "supertype": "pokemon",
+        "hp": 60,
+        "types": ["normal"],
+        "attacks": [{
+            "name": "Call for Family",
+            "cost": [],
+            "effect": {"op": "seq", "args": {"steps": [
+                {"op": "search_deck", "args": {
+                    "selector": {"op": "select", "args": {
+                        "who": "self", "zone": "deck", "filters": [{"type": "supertype", "value": "pokemon"}],
+                    }},
+                    "max": {"op": "const", "value": 1},
+                }},
+                {"type": "attack", "damage": 0, "target": "defender"},
+            ]}},
+        }],
+    }
+    return db
@@ -0,0 +1,48 @@
+import random
+
+from ptcgengine.action_generation import get_available_actions
+from ptcgengine.api import step
+from ptcgengine.registry import default_registry
+from ptcgengine.turn_manager import apply_phase_transitions
+
+DB = default_registry()
+
+
+def _by_transition(state):
+    # Reference: materialise the phase transition on a copy
+    local = state.clone()
+    apply_phase_transitions(local)
+    local.touch()
+    return get_available_actions(local, DB)
+
+
+def test_matches_applying_the_phase_transition(new_state):
+    rng = random.Random(3)
+    state = new_state()
+    for _ in range(40):
+        actions = get_available_actions(state, DB)
+        assert actions == _by_transition(state)
+        if not actions:
+            break
+        state, _ = step(state, rng.choice(actions), DB)
+
+
+def test_does_not_mutate_or_clone(new_state):
+    state = new_state()
+    hand = list(state.players[0].hand)
+    get_available_actions(state, DB)
+    assert state.phase == "start"
+    assert state.players[0].hand == hand
+    assert not state._cow
+
+
+def test_memoised_per_version(new_state):
+    state = new_state()
+    first = get_available_actions(state, DB)
+    assert get_available_actions(state, DB) == first
+    assert state.memo()[("actions", False)] is state.memo()[("actions", False)]
+
+    state.players[0].hand.clear()
+    state.players[0].deck.clear()
+    state.touch()
+    assert not any(a["type"] == "attach_energy" for a in get_available_actions(state, DB))
@@ -0,0 +1,66 @@
+import copy
+import json
+import pickle
+
+from ptcgengine import selectors
+from ptcgengine.cards import PokemonCard, attack_effects, create_card_instance, get_definition
+from ptcgengine.context import EffectContext
+from ptcgengine.state import GameState
+
+with open("ptcgengine/cards/card_db.json") as f:
+    DB = json.load(f)
+
+
+def test_instances_share_one_interned_definition():
+    a = create_card_instance("TestMon", DB)
+    b = create_card_instance("TestMon", json.loads(json.dumps(DB)))
+    assert a.definition is b.definition is get_definition("TestMon", DB)
+    assert a.attacks[0]["name"] == "Bonk"
+    assert "Bonk" in a.definition.effects
+
+
+def test_runtime_record_only_holds_battle_state():
+    mon = create_card_instance("TestMon", DB)
+    assert not hasattr(mon, "__dict__")
+    assert mon.current_hp == mon.hp == 100
+
+    hurt = mon.copy()
+    hurt.current_hp = 40
+    assert hurt.definition is mon.definition
+    assert mon.current_hp == 100
+    assert hurt != mon
+
+
+def test_changed_db_entry_builds_new_definition():
+    modded = json.loads(json.dumps(DB))
+    modded["TestMon"]["hp"] = 130
+    assert create_card_instance("TestMon", modded).hp == 130
+    assert create_card_instance("TestMon", DB).hp == 100
+
+
+def test_ad_hoc_cards_keep_keyword_constructor():
+    mon = PokemonCard(card_id="A", supertype="pokemon", name="A", hp=60, current_hp=60, types=["fire"])
+    assert mon.types == ("fire",)
+    assert mon.snapshot()["max_hp"] == 60
+
+
+def test_states_pickle_and_deepcopy_onto_the_interned_definitions():
+    state = GameState()
+    state.players[0].active = create_card_instance("TestMon", DB)
+    state.players[0].hand.append(create_card_instance("LightningEnergy", DB))
+    assert state.players[0].active.definition.effects
+    for clone in (pickle.loads(pickle.dumps(state)), copy.deepcopy(state)):
+        assert clone == state
+        assert clone.players[0].active.definition is get_definition("TestMon", DB)
+        assert clone.players[0].hand[0].definition is get_definition("LightningEnergy", DB)
+
+
+def test_compiled_caches_stay_bounded():
+    definition = get_definition("TestMon", DB)
+    assert attack_effects(definition) is attack_effects(definition)
+
+    select = {"op": "select", "args": {"who": "self", "zone": "hand"}}
+    state, ctx = GameState(), EffectContext(0)
+    for _ in range(selectors._CACHE_SIZE + 10):
+        assert selectors.count_selector(dict(select), state, ctx) == 0
+    assert len(selectors._CACHE) <= selectors._CACHE_SIZE
@@ -0,0 +1,60 @@
+import copy
+import pickle
+
+from ptcgengine import api
+from ptcgengine.actions import CHOOSE
+from ptcgengine.card_instance import create_instance
+from ptcgengine.cards import create_card_instance
+from ptcgengine.deck import Deck
+from ptcgengine.hashing import state_equal
+from ptcgengine.state_codec import decode_state, encode_state
+
+DECK = Deck(name="D", cards=[create_instance("Seeker")] * 4 + [create_instance("TestMon")] * 4
+            + [create_instance("LightningEnergy")] * 12)
+
+
+def _paused(db):
+    state = api.new_game(DECK, DECK, db, seed=2)
+    state.players[0].active = create_card_instance("Seeker", db)
+    state, _ = api.step(state, {"type": "attack", "attack_name": "Call for Family"}, db)
+    return state
+
+
+def test_attack_stops_at_the_choice_and_finishes_on_choose(seeker_db):
+    state = _paused(seeker_db)
+    choice = api.pending_choice(state)
+    assert choice is not None and choice.player == 0 and choice.max == 1
+    actions = api.get_available_actions(state, seeker_db)
+    assert actions and all(a["type"] == CHOOSE for a in actions)
+    # One pick per distinct card id, plus taking nothing
+    assert len(actions) == 1 + len({c.card_id for c in choice.options})
+    assert state.active_player == 0 and api.render_state(state)["pending"]["max"] == 1
+    # Only the chooser sees the options (they are cards from its deck)
+    assert "options" not in api.render_state(state)["pending"]
+    assert "options" not in api.render_state(state, 1)["pending"]
+    assert len(api.render_state(state, 0)["pending"]["options"]) == len(choice.options)
+    assert api.render_state(state)["pending"]["option_count"] == len(choice.options)
+
+    pick = next(a for a in actions if a["selection"])
+    wanted = choice.options[pick["selection"][0]].card_id
+    hand = [c.card_id for c in state.players[0].hand]
+    after, events = api.step(state, pick, seeker_db)
+    assert api.pending_choice(after) is None
+    assert sorted(c.card_id for c in after.players[0].hand) == sorted(hand + [wanted])
+    assert [e.type for e in events] == ["attack"]
+    assert after.active_player == 1
+
+
+def test_pending_choice_survives_undo_codec_and_pickle(seeker_db):
+    state = _paused(seeker_db)
+    token = api.apply(state, api.get_available_actions(state, seeker_db)[-1], seeker_db)
+    assert api.pending_choice(state) is None
+    api.undo(state, token)
+    assert api.pending_choice(state) is not None
+
+    for copy_ in (decode_state(encode_state(state), seeker_db), pickle.loads(pickle.dumps(state)), copy.deepcopy(state)):
+        assert state_equal(copy_, state)
+        assert api.get_available_actions(copy_, seeker_db) == api.get_available_actions(state, seeker_db)
+        done, _ = api.step(copy_, api.get_available_actions(copy_, seeker_db)[-1], seeker_db)
+        assert api.pending_choice(done) is None and done.active_player == 1
+
@@ -0,0 +1,66 @@
+import pytest
+
+from ptcgengine.cards import BaseCard, PokemonCard
+from ptcgengine.compiler import compile_effect
+from ptcgengine.context import EffectContext
+from ptcgengine.errors import ExpressionError, InterpreterError
+from ptcgengine.interpreter import execute_effect
+from ptcgengine.state import GameState
+
+DAMAGE = {
+    "op": "deal_damage",
+    "args": {
+        "target": {"op": "select", "args": {"who": "opponent", "zone": "active"}},
+        "amount": {"op": "mul", "args": [{"op": "const", "value": 10}, {"op": "const", "value": 2}]},
+    },
+}
+
+EFFECT = {
+    "op": "seq",
+    "args": {
+        "steps": [
+            {"op": "repeat", "args": {"count": {"op": "const", "value": 2}, "body": [DAMAGE]}},
+            {
+                "op": "if",
+                "args": {
+                    "condition": {
+                        "op": "gte",
+                        "args": [
+                            {"op": "count", "selector": {"op": "select", "args": {"who": "self", "zone": "deck"}}},
+                            {"op": "const", "value": 2},
+                        ],
+                    },
+                    "then": [{"op": "draw", "args": {"count": {"op": "const", "value": 2}}}],
+                    "else": [DAMAGE],
+                },
+            },
+            {"type": "attack", "damage": 40, "target": "defender"},
+        ]
+    },
+}
+
+
+def _state():
+    game = GameState()
+    for p in game.players:
+        p.active = PokemonCard(card_id="A", supertype="pokemon", name="A", hp=100, current_hp=100)
+    game.players[0].deck = [BaseCard(f"D{i}", "trainer", f"D{i}") for i in range(3)]
+    return game
+
+
+def test_compiled_matches_interpreter():
+    expected, expected_events = execute_effect(EFFECT, _state(), EffectContext(0))
+    actual, events = compile_effect(EFFECT)(_state(), EffectContext(0))
+    assert actual == expected
+    assert events == expected_events
+    assert actual.players[1].active.current_hp == 60
+    assert len(actual.players[0].hand) == 2
+
+
+def test_errors_surface_when_executed():
+    bad_op = compile_effect({"op": "teleport", "args": {}})
+    bad_expr = compile_effect({"op": "draw", "args": {"count": {"op": "var", "name": "n"}}})
+    with pytest.raises(InterpreterError):
+        bad_op(_state(), EffectContext(0))
+    with pytest.raises(ExpressionError):
+        bad_expr(_state(), EffectContext(0))
@@ -0,0 +1,99 @@
+from collections import Counter
+
+import pytest
+
+from ptcgengine import api
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.determinize import Determinizer, deck_lists
+from ptcgengine.errors import EngineError
+from ptcgengine.hashing import compute_hash, public_key
+from ptcgengine.mcts import MCTS
+from ptcgengine.registry import default_registry
+
+DB = default_registry()
+DECK_A = Deck(name="A", cards=[create_instance("TestMon")] * 4 + [create_instance("LightningEnergy")] * 16)
+DECK_B = Deck(name="B", cards=[create_instance("TestMon")] * 2 + [create_instance("LightningEnergy")] * 18)
+
+
+def _midgame():
+    state = api.new_game(DECK_A, DECK_B, DB, seed=5)
+    for _ in range(6):
+        actions = api.get_available_actions(state, DB)
+        energy = [a for a in actions if a["type"] == "attach_energy"]
+        state, _ = api.step(state, (energy or actions)[-1], DB)
+    return state
+
+
+def _ids(cards):
+    return Counter(c.card_id for c in cards)
+
+
+def test_samples_keep_public_information():
+    state = _midgame()
+    observer = state.active_player
+    sampler = Determinizer(state, observer, (DECK_A, DECK_B), DB, seed=1)
+
+    for sample in sampler.samples(state, 20):
+        for i, (p, q) in enumerate(zip(state.players, sample.players, strict=True)):
+            assert q.active == p.active and q.bench == p.bench and q.discard == p.discard
+            assert len(q.hand) == len(p.hand) and len(q.deck) == len(p.deck)
+            # The multiset of hidden cards never changes, only where they sit
+            assert _ids(q.hand + q.deck) == _ids(p.hand + p.deck)
+            if i == observer:
+                assert q.hand == p.hand
+        assert sample.zobrist == compute_hash(sample)
+        assert public_key(sample) == public_key(state)
+
+
+def test_samples_are_reproducible_and_independent_of_order():
+    state = _midgame()
+    a = Determinizer(state, 0, (DECK_A, DECK_B), DB, seed=9)
+    b = Determinizer(state, 0, (DECK_A, DECK_B), DB, seed=9)
+    first = [a.sample(state, k).players[1].hand for k in range(5)]
+    backwards = [b.sample(state, k).players[1].hand for k in reversed(range(5))]
+    assert first == backwards[::-1]
+    assert len({tuple(c.card_id for c in h) for h in first}) > 1
+
+
+def test_sampling_leaves_the_source_state_alone():
+    state = _midgame()
+    hands = [list(p.hand) for p in state.players]
+    Determinizer(state, 0, (DECK_A, DECK_B), DB).samples(state, 5)
+    assert [list(p.hand) for p in state.players] == hands
+
+
+def test_deck_lists_of_a_state():
+    state = _midgame()
+    lists = deck_lists(state)
+    decks = [Counter(c.identity.definition_id for c in d.cards) for d in (DECK_A, DECK_B)]
+    assert [Counter(ids) for ids in lists] == decks
+    Determinizer(state, 1, lists, DB).sample(state)
+
+
+def test_inconsistent_deck_list_is_rejected():
+    state = _midgame()
+    with pytest.raises(EngineError):
+        Determinizer(state, 0, (DECK_A, DECK_B.cards[:-1]), DB)
+
+
+def test_information_set_search():
+    state = _midgame()
+    mcts = MCTS(DB, iterations=60, time_limit=None, seed=0, deck_lists=(DECK_A, DECK_B))
+    result = mcts.search(state)
+    assert result.action in api.get_available_actions(state, DB)
+    assert result.root_visits == 60
+
+
+def test_information_set_tree_is_reused_between_moves():
+    state = _midgame()
+    mcts = MCTS(DB, iterations=100, time_limit=None, seed=0, deck_lists=(DECK_A, DECK_B))
+    mcts.search(state)
+    # Each child is keyed by what every deal shares, so the real game finds it
+    for child in mcts.root.children:
+        after, _ = api.step(state, child.action, DB)
+        assert child.key == public_key(after)
+
+    attach = next(c for c in mcts.root.children if c.action["type"] == "attach_energy")
+    state, _ = api.step(state, attach.action, DB)
+    assert mcts.search(state).root_visits > 100
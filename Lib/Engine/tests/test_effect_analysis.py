@@ -0,0 +1,91 @@
+import pytest
+from test_compiler import EFFECT, _state
+
+from ptcgengine.compiler import compile_effect
+from ptcgengine.context import EffectContext
+from ptcgengine.effect_analysis import (
+    check_card_db,
+    check_effect,
+    fold_effect,
+    is_state_independent,
+)
+from ptcgengine.errors import CardDataError
+from ptcgengine.interpreter import execute_effect
+from ptcgengine.registry import CardRegistry
+
+OPPONENT = {"op": "select", "args": {"who": "opponent", "zone": "active"}}
+
+
+def _const(v):
+    return {"op": "const", "value": v}
+
+
+def test_folds_constant_subtrees():
+    folded = fold_effect(EFFECT)
+    damage = folded["args"]["steps"][0]["args"]["body"][0]
+    assert damage["args"]["amount"] == _const(20)
+    # The input is left alone and folding is idempotent
+    assert EFFECT["args"]["steps"][0]["args"]["body"][0]["args"]["amount"]["op"] == "mul"
+    assert fold_effect(folded) is folded
+
+    expected, expected_events = execute_effect(EFFECT, _state(), EffectContext(0))
+    actual, events = compile_effect(folded)(_state(), EffectContext(0))
+    assert actual == expected and events == expected_events
+
+
+def test_constant_branches_and_state_independence():
+    effect = {
+        "op": "if",
+        "args": {
+            "condition": {"op": "gt", "args": [{"op": "add", "args": [_const(1), _const(2)]}, _const(2)]},
+            "then": [{"op": "deal_damage", "args": {"target": OPPONENT, "amount": {"op": "sub", "args": [_const(50), _const(20)]}}}],
+            "else": [{"op": "draw", "args": {"count": {"op": "count", "selector": OPPONENT}}}],
+        },
+    }
+    folded = fold_effect(effect)
+    assert folded == {
+        "op": "seq",
+        "args": {"steps": [{"op": "deal_damage", "args": {"target": OPPONENT, "amount": _const(30)}}]},
+    }
+    assert is_state_independent(effect)
+    assert not is_state_independent(EFFECT)
+    assert not is_state_independent({"op": "draw", "args": {"count": {"op": "coin_flips", "count": 2}}})
+
+
+def test_reports_every_problem_with_its_path():
+    effect = {
+        "op": "seq",
+        "args": {
+            "steps": [
+                {"op": "teleport", "args": {}},
+                {"op": "deal_damage", "args": {"target": {"op": "select", "args": {"who": "me", "zone": "pocket"}}}},
+                {"op": "draw", "args": {"count": {"op": "div", "args": [_const(4), {"op": "sub", "args": [_const(2), _const(2)]}]}}},
+                {"op": "search_deck", "args": {"selector": {"op": "select", "args": {"who": "self", "zone": "deck", "filters": [{"type": "shiny", "value": 1}]}}, "max": {"op": "pow"}}},
+                {"op": "move_card", "args": {"src": "hand", "dst": "active", "card": None}},
+            ]
+        },
+    }
+    problems = check_effect(effect)
+    assert problems == [
+        "effect.steps[0]: unknown op 'teleport'",
+        "effect.steps[1].target: 'who' must be 'self' or 'opponent'",
+        "effect.steps[1].target: unknown zone 'pocket'",
+        "effect.steps[1]: deal_damage is missing 'amount'",
+        "effect.steps[2].count: division by zero",
+        "effect.steps[3].selector.filters[0]: unknown filter {'type': 'shiny', 'value': 1}",
+        "effect.steps[3].max: unknown expression op 'pow'",
+        "effect.steps[4].dst: unknown zone 'active'",
+    ]
+    assert check_effect(EFFECT) == []
+
+
+def test_bad_cards_fail_at_load_time():
+    db = {
+        "Good": {"supertype": "pokemon", "hp": 50, "attacks": [{"name": "Hit", "cost": [], "effect": EFFECT}]},
+        "Bad": {"supertype": "pokemon", "hp": 50, "attacks": [{"name": "Oops", "cost": [], "effect": {"op": "nope"}}]},
+    }
+    reports = {r.card_id: r for r in check_card_db(db)}
+    assert reports["Bad"].problems == ("effect: unknown op 'nope'",)
+    assert reports["Good"].problems == () and not reports["Good"].state_independent
+    with pytest.raises(CardDataError, match="Bad"):
+        CardRegistry(db)
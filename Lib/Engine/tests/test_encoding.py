@@ -0,0 +1,84 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ptcgengine import encoding
+from ptcgengine.api import get_available_actions, step
+from ptcgengine.errors import EngineError
+from ptcgengine.registry import default_registry
+from ptcgengine.turn_manager import PHASE_MAIN, PHASE_START, apply_phase_transitions
+
+DB = default_registry()
+
+
+def test_encode_single_state(new_state):
+    state = new_state()
+    state, _ = step(state, {"type": "pass"}, DB)  # player 1 to move
+    hurt = state.players[0].active.copy()
+    hurt.current_hp = 40
+    state.players[0].active = hurt
+    state.touch()
+
+    features, mask = encoding.encode(state, DB)
+    view = encoding.unpack(features)
+
+    assert features.shape == (encoding.NUM_FEATURES,)
+    # Block 0 is the side to move
+    assert view["hp"][:, 0].tolist() == [100, 40]
+    assert view["max_hp"][:, 0].tolist() == [100, 100]
+    assert view["occupied"][:, 1].tolist() == [0, 0]
+    assert view["zone_sizes"][1].tolist() == [len(state.players[0].deck), len(state.players[0].hand), 0, 0]
+    assert view["turn"] == state.turn
+
+    actions = get_available_actions(state, DB)
+    assert mask.sum() == len({encoding.action_index(state, a) for a in actions})
+    for a in actions:
+        index = encoding.action_index(state, a)
+        assert mask[index]
+        assert encoding.action_from_index(state, index, DB)["type"] == a["type"]
+
+
+def test_batch_matches_single_and_reuses_buffers(new_state):
+    states = [new_state(seed) for seed in range(8)]
+    features, mask = encoding.allocate(10)
+    mask[:] = True
+    encoding.encode_into(states, features, mask, DB, start=2)
+
+    assert mask[:2].all()  # rows before start are left alone
+    for row, state in enumerate(states, 2):
+        f, m = encoding.encode(state, DB)
+        assert (features[row] == f).all()
+        assert (mask[row] == m).all()
+
+    with pytest.raises(ValueError):
+        encoding.encode_into(states, features, mask, DB, start=3)
+
+
+def test_energy_counts_and_illegal_index(new_state):
+    state = new_state()
+    while True:
+        energy = [a for a in get_available_actions(state, DB) if a["type"] == "attach_energy"]
+        if energy:
+            break
+        state, _ = step(state, {"type": "pass"}, DB)
+    state, _ = step(state, energy[0], DB)
+
+    view = encoding.unpack(encoding.encode(state, DB)[0])
+    assert view["energy"][0, 0, encoding.ENERGY_INDEX["L"]] == 1
+    assert view["flags"][list(encoding.FLAGS).index("energy_attached")] == 1
+
+    with pytest.raises(EngineError):
+        encoding.action_from_index(state, encoding.ATTACH_OFFSET + encoding.ENERGY_INDEX["L"], DB)
+
+
+def test_turn_start_is_encoded_after_the_draw(new_state):
+    state = new_state()
+    assert state.phase == PHASE_START
+    features, mask = encoding.encode(state, DB)
+
+    started = state.clone()
+    apply_phase_transitions(started)
+    assert started.phase == PHASE_MAIN
+    assert (features == encoding.encode(started, DB)[0]).all()
+    assert (mask == encoding.encode(started, DB)[1]).all()
+    assert state.phase == PHASE_START  # the clone drew, not the state
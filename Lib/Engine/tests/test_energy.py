@@ -0,0 +1,57 @@
+from ptcgengine.api import apply, get_available_actions, undo
+from ptcgengine.cards import EnergyCard, PokemonCard
+from ptcgengine.context import EffectContext
+from ptcgengine.energy import compile_cost, has_energy_for_cost
+from ptcgengine.interpreter import execute_effect
+from ptcgengine.state import GameState
+
+
+def _energy(t):
+    return EnergyCard(card_id=f"{t}Energy", name=f"{t} Energy", energy_type=t)
+
+
+def _mon(*energies):
+    return PokemonCard(
+        card_id="M", name="M", hp=100, current_hp=100,
+        attacks=[{"name": "Zap", "cost": ["L", "C"]}],
+        attached_energies=[_energy(t) for t in energies],
+    )
+
+
+def test_cost_matching():
+    assert compile_cost(["L", "C", "L"]).typed == (("L", 2),)
+    assert has_energy_for_cost(_mon("L", "W"), ["L", "C"])
+    assert has_energy_for_cost(_mon("L", "L"), ["L", "C"])
+    assert not has_energy_for_cost(_mon("W", "W"), ["L", "C"])
+    assert not has_energy_for_cost(_mon("L"), ["L", "C"])
+    assert has_energy_for_cost(_mon(), [])
+
+
+def test_pool_tracks_attach_action_and_undo():
+    state = GameState()
+    state.players[0].active = _mon("W")
+    state.players[1].active = _mon()
+    state.players[0].hand = [_energy("L")]
+    assert not any(a["type"] == "attack" for a in get_available_actions(state, {}))
+
+    attach = [a for a in get_available_actions(state, {}) if a["type"] == "attach_energy"][0]
+    token = apply(state, attach, {})
+    assert state.players[0].active.energy_pool == {"W": 1, "L": 1}
+    assert any(a["type"] == "attack" for a in get_available_actions(state, {}))
+
+    undo(state, token)
+    assert state.players[0].active.energy_pool == {"W": 1}
+
+
+def test_pool_tracks_attach_primitive():
+    state = GameState()
+    state.players[0].active = _mon("L")
+    effect = {
+        "op": "attach_energy",
+        "args": {
+            "to": {"op": "select", "args": {"who": "self", "zone": "active"}},
+            "energy_card": _energy("L"),
+        },
+    }
+    state, _ = execute_effect(effect, state, EffectContext(0))
+    assert state.players[0].active.energy_pool == {"L": 2}
@@ -0,0 +1,35 @@
+from ptcgengine.event_log import CHUNK_SIZE, EventLog
+from ptcgengine.events import GameEvent
+
+
+def _events(start, n):
+    return [GameEvent(type="e", payload={"i": i}) for i in range(start, start + n)]
+
+
+def test_extend_is_persistent():
+    base = EventLog(_events(0, 3))
+    longer = base.extend(_events(3, 2))
+    assert len(base) == 3 and len(longer) == 5
+    assert [e.payload["i"] for e in longer] == [0, 1, 2, 3, 4]
+    assert list(base) == _events(0, 3)
+
+
+def test_branches_share_full_chunks():
+    base = EventLog(_events(0, CHUNK_SIZE * 2 + 5))
+    a = base.extend(_events(1000, 3))
+    b = base.extend(_events(2000, 4))
+    assert a._chunks[0] is b._chunks[0] is base._chunks[0]
+    assert [e.payload["i"] for e in a.since(len(base))] == [1000, 1001, 1002]
+    assert [e.payload["i"] for e in b.since(len(base))] == [2000, 2001, 2002, 2003]
+    assert list(base) == _events(0, CHUNK_SIZE * 2 + 5)
+
+
+def test_newer_than_and_indexing():
+    log = EventLog()
+    for i in range(CHUNK_SIZE + 10):
+        log = log.append(GameEvent(type="e", payload={"i": i}))
+    assert log.version == CHUNK_SIZE + 10
+    assert [e.payload["i"] for e in log.newer_than(CHUNK_SIZE - 2)] == list(range(CHUNK_SIZE - 2, CHUNK_SIZE + 10))
+    assert log.newer_than(log.version) == []
+    assert log[-1].payload["i"] == CHUNK_SIZE + 9
+    assert log == _events(0, CHUNK_SIZE + 10)
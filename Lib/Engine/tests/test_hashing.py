@@ -0,0 +1,52 @@
+import random
+import subprocess
+import sys
+
+from ptcgengine.api import apply, get_available_actions, step, undo
+from ptcgengine.hashing import compute_hash, state_equal
+from ptcgengine.registry import default_registry
+
+DB = default_registry()
+
+
+def test_incremental_hash_matches_full_recompute(new_state):
+    rng = random.Random(11)
+    state = new_state()
+    assert state.zobrist == compute_hash(state)
+    while state.winner is None and state.turn < 40:
+        action = rng.choice(get_available_actions(state, DB))
+        before = state.zobrist
+
+        token = apply(state, action, DB)
+        assert state.zobrist == compute_hash(state)
+        undo(state, token)
+        assert state.zobrist == before == compute_hash(state)
+
+        state, _ = step(state, action, DB)
+        assert state.zobrist == compute_hash(state)
+
+
+def test_hash_is_stable_across_processes(new_state):
+    code = (
+        "from ptcgengine.api import new_game;"
+        "from ptcgengine.card_instance import create_instance;"
+        "from ptcgengine.deck import Deck;"
+        "from ptcgengine.registry import default_registry;"
+        "d = Deck(name='D', cards=[create_instance('TestMon')] * 3 + [create_instance('LightningEnergy')] * 17);"
+        "print(new_game(d, d, default_registry(), seed=0).zobrist)"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert int(out.stdout) == new_state().zobrist
+
+
+def test_state_equal(new_state):
+    a = new_state()
+    b = a.clone()
+    assert state_equal(a, b)
+
+    hurt = b.players[1].active.copy()
+    hurt.current_hp -= 10
+    b.players[1].active = hurt
+    b.touch()
+    assert a.zobrist != b.zobrist
+    assert not state_equal(a, b)
@@ -0,0 +1,78 @@
+import pytest
+
+from ptcgengine.cards import BaseCard, PokemonCard
+from ptcgengine.context import EffectContext
+from ptcgengine.errors import InterpreterError
+from ptcgengine.interpreter import Execution, execute_effect, start_effect
+from ptcgengine.state import GameState
+
+SEARCH = {
+    "op": "seq",
+    "args": {
+        "steps": [
+            {
+                "op": "search_deck",
+                "args": {
+                    "selector": {
+                        "op": "select",
+                        "args": {"who": "self", "zone": "deck", "filters": [{"type": "hp_at_least", "value": 1}]},
+                    },
+                    "max": {"op": "const", "value": 2},
+                },
+            },
+            {"op": "draw", "args": {"count": {"op": "const", "value": 1}}},
+            {"type": "attack", "damage": 10, "target": "defender"},
+        ]
+    },
+}
+
+
+def _state():
+    game = GameState()
+    p = game.players[0]
+    p.active = PokemonCard(card_id="A", supertype="pokemon", name="A", hp=100, current_hp=100)
+    p.deck = [
+        BaseCard("E1", "energy", "E1"),
+        PokemonCard(card_id="M1", supertype="pokemon", name="M1", hp=60, current_hp=60),
+        PokemonCard(card_id="M2", supertype="pokemon", name="M2", hp=70, current_hp=70),
+        PokemonCard(card_id="M3", supertype="pokemon", name="M3", hp=80, current_hp=80),
+        BaseCard("E2", "energy", "E2"),
+    ]
+    return game
+
+
+def test_suspends_at_search_deck_and_resumes():
+    execution = start_effect(SEARCH, _state(), EffectContext(0))
+    choice = execution.pending
+    assert not execution.done and execution.events == []
+    assert [c.card_id for c in choice.options] == ["M1", "M2", "M3"]
+    assert (choice.player, choice.min, choice.max) == (0, 0, 2)
+
+    with pytest.raises(InterpreterError):
+        execution.run()
+    with pytest.raises(InterpreterError):
+        execution.resume([0, 1, 2])
+
+    assert execution.resume([2]) is None and execution.done
+    hand = [c.card_id for c in execution.game.players[0].hand]
+    # The chosen card, then the draw from the top (end) of the deck
+    assert hand == ["M3", "E2"]
+    assert [e.type for e in execution.events] == ["attack"]
+
+
+def test_execute_effect_takes_the_default_choice():
+    game, events = execute_effect(SEARCH, _state(), EffectContext(0))
+    assert [c.card_id for c in game.players[0].hand] == ["M1", "M2", "E2"]
+    assert len(events) == 1
+
+    picked = Execution(SEARCH, _state(), EffectContext(0))
+    assert picked.run(lambda choice: [1]) is None
+    assert [c.card_id for c in picked.game.players[0].hand] == ["M2", "E2"]
+
+
+def test_deep_effects_do_not_recurse():
+    node = {"type": "attack", "damage": 1}
+    for _ in range(5000):
+        node = {"op": "repeat", "args": {"count": {"op": "const", "value": 1}, "body": [{"op": "seq", "args": {"steps": [node]}}]}}
+    _, events = execute_effect(node, GameState(), EffectContext(0))
+    assert len(events) == 1
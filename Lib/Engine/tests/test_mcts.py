@@ -0,0 +1,47 @@
+from ptcgengine import api
+from ptcgengine.card_instance import create_instance
+from ptcgengine.hashing import compute_hash
+from ptcgengine.mcts import MCTS, MCTSOpponent
+from ptcgengine.registry import default_registry
+
+DB = default_registry()
+
+
+def test_search_respects_budget_and_leaves_state_alone(new_state):
+    state = new_state()
+    before = (state.version, compute_hash(state))
+    result = MCTS(DB, iterations=64, time_limit=None, seed=1).search(state)
+    assert result.iterations == 64
+    assert result.root_visits == 64
+    assert result.action in api.get_available_actions(state, DB)
+    assert (state.version, compute_hash(state)) == before
+
+
+def test_search_sees_the_winning_line(new_state):
+    state = new_state()
+    mon = state.players[0].active
+    for _ in range(2):
+        state.update_card(mon, attached_energies=[*mon.attached_energies, create_instance("LightningEnergy")])
+    state.update_card(state.players[1].active, current_hp=20)
+
+    result = MCTS(DB, iterations=200, time_limit=None, rollout="heuristic", seed=0).search(state)
+    assert result.action["type"] != "pass"
+    assert result.value > 0.9
+
+
+def test_tree_is_reused_between_moves(new_state):
+    mcts = MCTS(DB, iterations=100, time_limit=None, seed=2)
+    state = new_state()
+    first = mcts.search(state)
+    state, _ = api.step(state, first.action, DB)
+    second = mcts.search(state)
+    assert second.root_visits > second.iterations
+
+
+def test_opponent_thinks_in_background(new_state):
+    opponent = MCTSOpponent(player=0, card_db=DB, iterations=20, time_limit=None, seed=0)
+    state = new_state()
+    assert opponent.wants_to_move(state)
+    action = opponent.think(state).result(timeout=10)
+    assert action in api.get_available_actions(state, DB)
+    opponent.close()
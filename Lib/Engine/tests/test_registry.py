@@ -0,0 +1,41 @@
+import pickle
+
+from ptcgengine.api import get_available_actions, step
+from ptcgengine.card_instance import create_instance
+from ptcgengine.cards import create_card_instance
+from ptcgengine.registry import CardRegistry, default_registry, load_registry
+from ptcgengine.state import GameState
+
+
+def test_registry_is_loaded_once():
+    assert default_registry() is load_registry()
+    assert pickle.loads(pickle.dumps(default_registry())) is default_registry()
+
+
+def test_secondary_indexes():
+    reg = default_registry()
+    assert [d.card_id for d in reg.by_supertype("pokemon")] == ["TestMon"]
+    assert [d.card_id for d in reg.by_energy_type("L")] == ["LightningEnergy"]
+    assert [d.card_id for d in reg.by_pokemon_type("normal")] == ["TestMon"]
+    assert [d.card_id for d in reg.by_stage("Basic")] == ["TestMon"]
+    ((mon, attack),) = reg.by_attack_cost(["C"])
+    assert mon.card_id == "TestMon" and attack["name"] == "Bonk"
+    assert reg.by_attack_cost(["L", "L"]) == ()
+
+
+def test_canonical_id_lookup():
+    reg = default_registry()
+    inst = create_instance("LightningEnergy")
+    assert reg.by_canonical_id(inst.canonical_id) is reg.definition("LightningEnergy")
+    assert reg.for_instance(inst).energy_type == "L"
+
+
+def test_registry_can_stand_in_for_card_db():
+    reg = CardRegistry({"Mon": {"name": "Mon", "supertype": "pokemon", "hp": 30, "attacks": []}})
+    state = GameState()
+    state.players[0].active = create_card_instance("Mon", reg)
+    state.players[1].active = create_card_instance("Mon", reg)
+    actions = get_available_actions(state, reg)
+    state, _ = step(state, actions[-1], reg)
+    assert state.active_player == 1
+    assert state.players[0].active.definition is reg.definition("Mon")
@@ -0,0 +1,55 @@
+import random
+
+from ptcgengine import api, replay
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.hashing import state_equal
+from ptcgengine.registry import default_registry
+from ptcgengine.sim import random_policy
+
+DB = default_registry()
+DECK_A = Deck(name="A", cards=[create_instance("TestMon")] * 4 + [create_instance("LightningEnergy")] * 16)
+DECK_B = Deck(name="B", cards=[create_instance("TestMon")] * 3 + [create_instance("LightningEnergy")] * 17)
+
+
+def _same(a, b):
+    return (
+        state_equal(a, b)
+        and a.turn == b.turn
+        and a.rng_counters == b.rng_counters
+        and all(p.deck == q.deck and p.hand == q.hand for p, q in zip(a.players, b.players, strict=True))
+    )
+
+
+def test_replay_reproduces_the_game():
+    rec = replay.ReplayRecorder(DECK_A, DECK_B, DB, seed=4, snapshot_every=3)
+    rng = random.Random(0)
+    while rec.state.winner is None and rec.state.turn < 40:
+        rec.step(random_policy(rec.state, api.get_available_actions(rec.state, DB), rng))
+    data = rec.to_bytes()
+
+    r = replay.Replay(data, DB)
+    assert r.seed == 4 and [d.name for d in r.decks] == ["A", "B"]
+    assert len(list(r.actions())) == rec.actions
+    assert r.snapshots and all(s.turn % 3 == 0 for s in r.snapshots)
+    assert _same(r.final_state(), rec.state)
+    # One byte per action plus the snapshots
+    assert len(data) < rec.actions + 4096 * (len(r.snapshots) + 1)
+
+
+def test_seek_matches_replaying_from_the_start():
+    data = replay.record_game(DECK_A, DECK_B, DB, random_policy, seed=2, max_turns=30, snapshot_every=4)
+    r = replay.Replay(data, DB)
+    first_of_turn = {}
+    for state in r.states():
+        first_of_turn.setdefault(state.turn, state)
+    for turn in (1, 2, 4, 5, 9, max(first_of_turn)):
+        assert _same(r.seek(turn), first_of_turn[turn])
+
+
+def test_archive_round_trip(tmp_path):
+    games = [replay.record_game(DECK_A, DECK_B, DB, random_policy, seed=s, max_turns=10) for s in range(3)]
+    path = tmp_path / "games.bin"
+    assert replay.write_archive(path, games) == 3
+    seeds = [r.seed for r in replay.read_archive(path, DB)]
+    assert seeds == [0, 1, 2]
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+from ptcgengine import api, rng
+from ptcgengine.context import EffectContext
+from ptcgengine.expressions import compile_expr, eval_expr
+from ptcgengine.registry import default_registry
+from ptcgengine.rng import Stream
+
+DB = default_registry()
+
+
+def test_streams_are_counter_based_and_splittable():
+    s = Stream.from_seed(42)
+    draws = [s.u64(i) for i in range(10)]
+    # Skipping ahead lands on the same draws without replaying them
+    assert [s.skip(7).u64(i) for i in range(3)] == draws[7:10]
+    assert s.split("player", 0) == s.split("player", 0)
+    assert s.split("player", 0).u64() != s.split("player", 1).u64()
+    assert len(set(draws)) == 10
+    assert all(0 <= s.random(i) < 1 and 0 <= s.below(6, i) < 6 for i in range(100))
+
+    items = list(range(20))
+    after = s.shuffle(items)
+    assert sorted(items) == list(range(20)) and items != list(range(20))
+    assert after == s.skip(19)
+
+
+def test_streams_match_across_processes():
+    code = "from ptcgengine.rng import Stream; print(Stream.from_seed(7).split('game', 3).u64(5))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert int(out.stdout) == Stream.from_seed(7).split("game", 3).u64(5)
+
+
+def test_game_draws_are_reproducible_and_undoable(new_state):
+    a, b = new_state(3), new_state(3)
+    assert [c.card_id for c in a.players[0].deck] == [c.card_id for c in b.players[0].deck]
+
+    heads = [rng.coin_flips(a, 4, 0) for _ in range(5)]
+    assert heads == [rng.coin_flips(b, 4, 0) for _ in range(5)]
+    assert a.rng_counters[("coins", 0)] == 20
+
+    token = api.apply(a, {"type": "pass"}, DB)
+    first = rng.coin_flips(a, 8, 0)
+    api.undo(a, token)
+    assert rng.coin_flips(a, 8, 0) == first
+
+
+def test_coin_flip_expression_and_zone_shuffle(new_state):
+    state = new_state(1)
+    ctx = EffectContext(controller=0)
+    node = {"op": "mul", "args": [{"op": "const", "value": 10}, {"op": "coin_flips", "count": 3}]}
+    twin = new_state(1)
+    assert eval_expr(node, state, ctx) == compile_expr(node)(twin, ctx)
+    assert eval_expr(node, state, ctx) in (0, 10, 20, 30)
+
+    deck = [c.card_id for c in state.players[1].deck]
+    rng.shuffle_zone(state, 1)
+    assert sorted(c.card_id for c in state.players[1].deck) == sorted(deck)
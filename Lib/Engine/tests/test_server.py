@@ -0,0 +1,226 @@
+import asyncio
+import json
+
+import pytest
+
+from ptcgengine import api
+from ptcgengine.errors import EngineError
+from ptcgengine.registry import default_registry
+from ptcgengine.server import MAX_LINE, MatchClient, MatchServer
+from ptcgengine.view import apply_patch
+
+DECK = ["TestMon"] * 4 + ["LightningEnergy"] * 16
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=60))
+
+
+def test_client_plays_against_a_server_bot():
+    async def main():
+        server = MatchServer(default_registry(), max_turns=60)
+        listener = await server.start_tcp()
+        client = await MatchClient.connect(port=listener.sockets[0].getsockname()[1])
+        game = (await client.request("create", decks=[DECK, DECK], seed=3, bots=[None, "aggressive"]))["game"]
+        view = await client.request("join", game=game, seat=0)
+        assert view["state"]["turn"] == 1 and view["actions"]
+
+        while True:
+            result = await client.request("act", game=game, action=view["actions"][-1])
+            assert result["moves"] >= 1
+            view = await client.pushes.get()
+            # The bot answers on its own; wait until it is our move or the game ends
+            while not view["finished"] and "actions" not in view:
+                view = await client.pushes.get()
+            if view["finished"]:
+                break
+        listing = await client.request("list")
+        await client.close()
+        await server.close()
+        return view, listing
+
+    view, listing = _run(main())
+    assert view["state"]["turn"] > 1
+    assert listing == [{"game": 1, "turn": view["state"]["turn"], "finished": True, "seats": ["client", "aggressive"]}]
+
+
+def test_requests_are_validated():
+    async def main():
+        server = MatchServer(default_registry())
+        listener = await server.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        a = await MatchClient.connect(port=port)
+        b = await MatchClient.connect(port=port)
+        game = (await a.request("create", decks=[DECK, DECK], seed=1))["game"]
+        await a.request("join", game=game, seat=0)
+        errors = []
+        for client, op, fields in [
+            (b, "join", {"game": game, "seat": 0}),
+            (b, "act", {"game": game, "index": 0}),
+            (a, "act", {"game": game, "index": 99}),
+            (a, "act", {"game": game, "action": {"type": "attack", "attack_name": "Nope"}}),
+            (a, "state", {"game": 42}),
+            (a, "shuffle", {}),
+            (a, "create", {"decks": [DECK, DECK], "bots": ["cheater", None]}),
+            (a, "create", {"decks": [DECK, DECK], "bots": ["random"]}),
+            (b, "close", {"game": game}),
+        ]:
+            with pytest.raises(EngineError) as exc:
+                await client.request(op, **fields)
+            errors.append(str(exc.value))
+        # Spectators see the game but get no actions
+        watched = await b.request("join", game=game, seat=None)
+        await a.close()
+        await b.close()
+        await server.close()
+        return errors, watched
+
+    errors, watched = _run(main())
+    assert "taken" in errors[0] and "Not your turn" in errors[1] and "out of range" in errors[2]
+    assert "Illegal action" in errors[3] and "No game" in errors[4] and "Unknown op" in errors[5]
+    assert "Unknown bot" in errors[6] and "one entry per seat" in errors[7]
+    assert "Only the creator" in errors[8]
+    assert "actions" not in watched and watched["state"]["turn"] == 1
+
+
+def test_overlong_line_gets_an_error_and_a_hangup():
+    async def main():
+        server = MatchServer(default_registry())
+        listener = await server.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection(port=port)
+        writer.write(b"x" * (MAX_LINE + 10) + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        rest = await reader.read()
+        writer.close()
+        # The server keeps serving other clients
+        client = await MatchClient.connect(port=port)
+        listing = await client.request("list")
+        await client.close()
+        await server.close()
+        return reply, rest, listing
+
+    reply, rest, listing = _run(main())
+    assert reply["ok"] is False and "Bad request" in reply["error"]
+    assert rest == b"" and listing == []
+
+
+def test_bot_ladder_over_unix_socket_with_process_pool(tmp_path):
+    async def main():
+        server = MatchServer(default_registry(), workers=2, max_turns=60)
+        path = str(tmp_path / "ptcg.sock")
+        await server.start_unix(path)
+        client = await MatchClient.connect(path=path)
+        games = []
+        for seed in range(3):
+            game = (await client.request("create", decks=[DECK, DECK], seed=seed, bots=["random", "random"]))["game"]
+            games.append(game)
+        finals = {}
+        while len(finals) < len(games):
+            push = await client.pushes.get()
+            if push["push"] == "update" and push["finished"]:
+                finals[push["game"]] = push
+        await client.close()
+        await server.close()
+        return finals
+
+    finals = _run(main())
+    assert len(finals) == 3
+    assert all(p["winner"] is not None or p["state"]["turn"] > 60 for p in finals.values())
+
+
+def test_spectator_follows_a_game_by_patches():
+    async def main():
+        server = MatchServer(default_registry(), max_turns=30)
+        listener = await server.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        host = await MatchClient.connect(port=port)
+        spectator = await MatchClient.connect(port=port)
+        game = (await host.request("create", decks=[DECK, DECK], seed=5, bots=["random", "random"]))["game"]
+        joined = await spectator.request("join", game=game, seat=None, delta=True)
+        view, version = joined["state"], joined["version"]
+        push = joined
+        while not push["finished"]:
+            push = await spectator.pushes.get()
+            assert "state" not in push and push["patch"]["from"] == version
+            view, version = apply_patch(view, push["patch"]), push["version"]
+        full = await spectator.request("state", game=game)
+        since = await spectator.request("state", game=game, since=joined["version"])
+        await host.close()
+        await spectator.close()
+        await server.close()
+        return joined, view, version, full, since
+
+    joined, view, version, full, since = _run(main())
+    assert version > joined["version"] and full["version"] == version
+    assert view == full["state"]
+    assert apply_patch(joined["state"], since["patch"]) == full["state"]
+
+
+def test_only_the_chooser_sees_the_choice_options(seeker_db):
+    deck = ["Seeker"] * 8 + ["LightningEnergy"] * 12
+
+    async def main():
+        server = MatchServer(seeker_db)
+        listener = await server.start_tcp()
+        port = listener.sockets[0].getsockname()[1]
+        a = await MatchClient.connect(port=port)
+        b = await MatchClient.connect(port=port)
+        game = (await a.request("create", decks=[deck, deck], seed=2))["game"]
+        await a.request("join", game=game, seat=0)
+        await b.request("join", game=game, seat=1)
+        await a.request("act", game=game, action={"type": "attack", "attack_name": "Call for Family"})
+        pushes = await a.pushes.get(), await b.pushes.get()
+        await a.close()
+        await b.close()
+        await server.close()
+        return pushes
+
+    mine, theirs = _run(main())
+    pending = theirs["state"]["pending"]
+    assert pending["player"] == 0 and pending["option_count"] == len(mine["choice"]) > 0
+    assert "options" not in pending and "choice" not in theirs
+    assert all(card["card_id"] == "Seeker" for card in mine["choice"])
+
+
+def test_closing_a_bot_game_stops_it():
+    async def main():
+        server = MatchServer(default_registry(), max_turns=200)
+        listener = await server.start_tcp()
+        client = await MatchClient.connect(port=listener.sockets[0].getsockname()[1])
+        game = (await client.request("create", decks=[DECK, DECK], seed=4, bots=["random", "random"]))["game"]
+        await client.pushes.get()  # the bots are under way
+        await client.request("close", game=game)
+        pushes = []
+        while not client.pushes.empty():
+            pushes.append(await client.pushes.get())
+        await asyncio.sleep(0.2)
+        late = client.pushes.qsize()
+        await client.close()
+        await server.close()
+        return pushes, late, server.matches
+
+    pushes, late, matches = _run(main())
+    assert pushes[-1] == {"push": "closed", "game": 1}
+    assert late == 0 and matches == {}
+
+
+def test_mcts_bot_does_not_see_hidden_cards(monkeypatch, new_state):
+    from ptcgengine import mcts
+    from ptcgengine.server import _think
+    from ptcgengine.state_codec import encode_state
+
+    seen = []
+
+    class Recording(mcts.MCTS):
+        def search(self, state, **kwargs):
+            seen.append(self.deck_lists)
+            return super().search(state, **kwargs)
+
+    monkeypatch.setattr(mcts, "MCTS", Recording)
+    state = new_state()
+    db = default_registry()
+    pos = _think(encode_state(state, include_events=False), db, "mcts", 0, 0.05)
+    assert 0 <= pos < len(api.get_available_actions(state, db))
+    assert [len(ids) for ids in seen[0]] == [20, 20]
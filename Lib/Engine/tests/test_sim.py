@@ -0,0 +1,36 @@
+from ptcgengine import sim
+from ptcgengine.api import new_game
+from ptcgengine.card_instance import create_instance
+from ptcgengine.cards import load_card_db
+from ptcgengine.deck import Deck
+
+DB = load_card_db()
+
+
+def _deck(name, mons, energies):
+    cards = [create_instance("TestMon") for _ in range(mons)]
+    cards += [create_instance("LightningEnergy") for _ in range(energies)]
+    return Deck(name=name, cards=cards)
+
+
+def test_new_game_deals_hands_and_actives():
+    state = new_game(_deck("A", 4, 16), _deck("B", 4, 16), DB, seed=3)
+    for p in state.players:
+        assert p.active is not None and p.active.card_id == "TestMon"
+        assert len(p.hand) + len(p.deck) == 19
+
+
+def test_games_finish_with_knockouts():
+    report = sim.run(_deck("A", 2, 18), _deck("B", 2, 18), 6, card_db=DB, seed=1, workers=1,
+                     policies=("aggressive", "aggressive"))
+    assert report.games == 6
+    assert all(r.winner is not None for r in report.results)
+    assert sum(report.win_rates) == 1.0
+    assert report.summary()["steps"] == report.steps
+
+
+def test_results_do_not_depend_on_worker_count():
+    a, b = _deck("A", 3, 17), _deck("B", 1, 19)
+    serial = sim.run(a, b, 8, card_db=DB, seed=5, workers=1)
+    pooled = sim.run(a, b, 8, card_db=DB, seed=5, workers=2)
+    assert serial.results == pooled.results
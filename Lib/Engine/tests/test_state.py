@@ -0,0 +1,52 @@
+import json
+
+from ptcgengine.actions import make_attack_action
+from ptcgengine.api import get_available_actions, step
+from ptcgengine.cards import create_card_instance
+from ptcgengine.state import GameState
+
+with open("ptcgengine/cards/card_db.json") as f:
+    DB = json.load(f)
+
+
+def _setup_state():
+    state = GameState()
+    state.players[0].active = create_card_instance("TestMon", DB)
+    state.players[1].active = create_card_instance("TestMon", DB)
+    state.players[0].deck = [create_card_instance("LightningEnergy", DB) for _ in range(5)]
+    state.players[1].deck = [create_card_instance("LightningEnergy", DB) for _ in range(5)]
+    state.players[1].bench = [create_card_instance("TestMon", DB)]
+    return state
+
+
+def test_clone_shares_structure():
+    state = _setup_state()
+    child = state.clone()
+    assert child.players is state.players
+    assert child.players[0].deck is state.players[0].deck
+
+
+def test_step_leaves_parent_untouched():
+    state = _setup_state()
+    attach = [a for a in get_available_actions(state, DB) if a["type"] == "attach_energy"][0]
+    s1, _ = step(state, attach, DB)
+    s2, _ = step(s1, make_attack_action("Bonk"), DB)
+
+    assert len(state.players[0].deck) == 5
+    assert state.players[0].hand == []
+    assert s1.players[1].active.current_hp == 100
+    assert s2.players[1].active.current_hp == 80
+    assert len(s1.players[0].active.attached_energies) == 1
+
+
+def test_step_only_copies_touched_objects():
+    state = _setup_state()
+    attach = [a for a in get_available_actions(state, DB) if a["type"] == "attach_energy"][0]
+    s1, _ = step(state, attach, DB)
+    s2, _ = step(s1, make_attack_action("Bonk"), DB)
+
+    # The defender was copied, the untouched bench and discard are shared
+    assert s2.players[1].active is not s1.players[1].active
+    assert s2.players[1].bench is s1.players[1].bench
+    assert s2.players[0].discard is s1.players[0].discard
+    assert s2.players[0].active is s1.players[0].active
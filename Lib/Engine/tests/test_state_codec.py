@@ -0,0 +1,73 @@
+import random
+import struct
+
+import pytest
+
+from ptcgengine import api, rng
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.errors import EngineError
+from ptcgengine.hashing import state_equal
+from ptcgengine.registry import default_registry
+from ptcgengine.sim import random_policy
+from ptcgengine.state_codec import FORMAT_VERSION, decode_state, encode_state
+from ptcgengine.trainer import Trainer
+
+DB = default_registry()
+DECK = Deck(name="D", cards=[create_instance("TestMon")] * 4 + [create_instance("LightningEnergy")] * 16)
+
+
+def _midgame():
+    state = api.new_game(DECK, DECK, DB, seed=8)
+    r = random.Random(1)
+    for _ in range(12):
+        actions = api.get_available_actions(state, DB)
+        if state.winner is not None or not actions:
+            break
+        state, _ = api.step(state, random_policy(state, actions, r), DB)
+    rng.coin_flips(state, 2, 1, "Thunder Jolt")
+    mon = state.update_card(state.players[1].active, status={"paralyzed"}, current_hp=-10)
+    state.add_card(1, "bench", mon.copy())
+    state.set("trainer", Trainer(name="Red", metadata={"badges": 1}))
+    state.set("deck", DECK)
+    return state
+
+
+def test_round_trip():
+    state = _midgame()
+    copy = decode_state(encode_state(state), DB)
+
+    assert state_equal(copy, state)
+    for p, q in zip(state.players, copy.players, strict=True):
+        for zone in ("deck", "hand", "bench", "discard"):
+            assert getattr(p, zone) == getattr(q, zone)
+        assert p.active == q.active
+    assert copy.players[1].active.status == {"paralyzed"}
+    assert copy.players[1].active.energy_pool == state.players[1].active.energy_pool
+    assert (copy.turn, copy.rng, copy.rng_counters) == (state.turn, state.rng, state.rng_counters)
+    assert copy.trainer == state.trainer and copy.deck.name == "D"
+    assert list(copy.event_log) == list(state.event_log)
+    # Definitions are shared, not rebuilt
+    assert copy.players[0].active.definition is state.players[0].active.definition
+
+    # The decoded state plays on exactly like the original
+    action = api.get_available_actions(state, DB)[0]
+    assert state_equal(api.step(copy, action, DB)[0], api.step(state, action, DB)[0])
+
+
+def test_decodes_from_a_slice_of_a_larger_buffer():
+    state = _midgame()
+    data = encode_state(state, include_events=False)
+    buf = memoryview(b"junk" + data + b"more")
+    copy = decode_state(buf[4:4 + len(data)], DB)
+    assert state_equal(copy, state)
+    assert len(copy.event_log) == 0
+
+
+def test_rejects_foreign_and_newer_data():
+    data = encode_state(_midgame())
+    with pytest.raises(EngineError):
+        decode_state(b"nope" + data[4:], DB)
+    newer = data[:4] + struct.pack("<H", FORMAT_VERSION + 1) + data[6:]
+    with pytest.raises(EngineError):
+        decode_state(newer, DB)
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from ptcgengine import tournament
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.errors import EngineError
+from ptcgengine.registry import default_registry
+from ptcgengine.serialization import save_json
+from ptcgengine.trainer import Trainer
+
+DB = default_registry()
+
+
+def _deck(name, mons):
+    cards = [create_instance("TestMon")] * mons + [create_instance("LightningEnergy")] * (20 - mons)
+    return Deck(name=name, cards=cards)
+
+
+@pytest.fixture
+def deck_dir(tmp_path):
+    save_json(tmp_path / "alpha.json", _deck("alpha", 1).to_json())
+    save_json(tmp_path / "beta.json", _deck("beta", 4).to_json())
+    save_json(tmp_path / "gamma_list.json", _deck("gamma", 2).to_json())
+    save_json(tmp_path / "gamma.json", Trainer(name="Gamma", active_deck="gamma_list.json").to_json())
+    return tmp_path
+
+
+def _rows(path):
+    _, columns, _ = tournament.read_results(path)
+    rows = zip(*(columns[name] for name, _ in tournament.COLUMNS[:-1]), strict=True)
+    return sorted(rows)
+
+
+def test_round_robin_matrix(deck_dir, tmp_path):
+    decks = tournament.load_decks(deck_dir)
+    assert sorted(decks) == ["alpha", "beta", "gamma"]
+
+    out = str(tmp_path / "t.ptn")
+    result = tournament.run(decks, 6, out, card_db=DB, seed=1, workers=1, max_turns=60, chunk_size=4)
+    assert result.complete and result.decks == ["alpha", "beta", "gamma"]
+    for i in range(3):
+        for j in range(3):
+            if i != j:
+                assert result.games(i, j) == 6
+                assert result.win_rate(i, j) + result.win_rate(j, i) == pytest.approx(1.0)
+                lo, hi = result.interval(i, j)
+                assert lo <= result.win_rate(i, j) <= hi
+    assert all(t.games == 12 and t.seconds > 0 for t in result.timing.values())
+    assert "alpha vs beta" in result.format()
+
+
+def test_resumes_after_interruption_and_ignores_worker_count(deck_dir, tmp_path):
+    decks = tournament.load_decks(deck_dir)
+    full = str(tmp_path / "full.ptn")
+    tournament.run(decks, 5, full, card_db=DB, seed=2, workers=2, max_turns=60, chunk_size=2)
+
+    # Keep the header, one whole block and half of the next, as if killed mid-write
+    partial = str(tmp_path / "partial.ptn")
+    tournament.run(decks, 5, partial, card_db=DB, seed=2, workers=1, max_turns=60, chunk_size=2)
+    _, _, end = tournament.read_results(partial)
+    with open(partial, "rb") as f:
+        data = f.read()
+    header_end = data.index(b"}") + 1
+    with open(partial, "wb") as f:
+        f.write(data[:header_end + 60])
+    assert len(_rows(partial)) < 15
+
+    result = tournament.run(decks, 5, partial, card_db=DB, seed=2, workers=1, max_turns=60, chunk_size=2)
+    assert result.complete
+    assert _rows(partial) == _rows(full)
+    assert os.path.getsize(partial) == end
+
+    with pytest.raises(EngineError):
+        tournament.run(decks, 5, partial, card_db=DB, seed=3, workers=1)
+
+
+def test_refuses_changed_decks_and_truncated_headers(deck_dir, tmp_path):
+    decks = tournament.load_decks(deck_dir)
+    out = str(tmp_path / "t.ptn")
+    tournament.run(decks, 2, out, card_db=DB, seed=1, workers=1, max_turns=30)
+
+    changed = dict(decks, beta=_deck("beta", 5))
+    with pytest.raises(EngineError, match="different contents for decks \\['beta'\\]"):
+        tournament.run(changed, 2, out, card_db=DB, seed=1, workers=1, max_turns=30)
+
+    with open(out, "rb") as f:
+        data = f.read()
+    for cut in (len(tournament.MAGIC) + 2, data.index(b"}") - 5):
+        with open(out, "wb") as f:
+            f.write(data[:cut])
+        with pytest.raises(EngineError, match="header is truncated"):
+            tournament.read_results(out)
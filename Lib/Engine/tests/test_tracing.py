@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+from ptcgengine import tracing
+from ptcgengine.api import get_available_actions, step
+from ptcgengine.cards import create_card_instance
+from ptcgengine.state import GameState
+
+with open("ptcgengine/cards/card_db.json") as f:
+    DB = json.load(f)
+
+
+def _play_two_actions():
+    state = GameState()
+    state.players[0].active = create_card_instance("TestMon", DB)
+    state.players[1].active = create_card_instance("TestMon", DB)
+    state.players[0].hand = [create_card_instance("LightningEnergy", DB)]
+    for _ in range(2):
+        actions = get_available_actions(state, DB)
+        state, _ = step(state, actions[0], DB)
+
+
+def test_channels_are_off_by_default():
+    assert not tracing.channel("effect").debug
+    assert not tracing.channel("turn").info
+
+
+def test_ring_buffer_collects_enabled_categories_only():
+    ring = tracing.RingBufferSink(capacity=4)
+    tracing.configure({"turn": "info"}, sinks=[ring])
+    try:
+        _play_two_actions()
+    finally:
+        tracing.configure({}, sinks=[tracing.stderr_sink])
+
+    records = ring.records()
+    assert records and all(r.category == "turn" for r in records)
+    assert records[0].fields["player"] == 0
+    assert len(ring) <= 4
+
+
+def test_stats_count_and_time_instrumented_calls():
+    # @instrument only wraps when PTCG_STATS is set at import time
+    code = (
+        "import json, sys; sys.path.insert(0, 'tests');"
+        "from test_tracing import _play_two_actions;"
+        "from ptcgengine import tracing;"
+        "_play_two_actions();"
+        "print(json.dumps(tracing.STATS.snapshot()))"
+    )
+    env = {**os.environ, "PTCG_STATS": "1"}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+
+    snap = json.loads(out.stdout)
+    assert snap["counters"]["step"] == 2
+    assert snap["counters"]["get_available_actions"] == 2
+    assert snap["counters"]["effect.deal_damage"] == 1
+    assert snap["timings"]["step"]["count"] == 2
+    assert "turn.end" in snap["timings"]
+
+
+def test_instrument_is_free_when_stats_are_off_at_import():
+    assert not hasattr(step, "__wrapped__")
+    tracing.STATS.reset()
+    tracing.enable_stats()
+    try:
+        _play_two_actions()
+    finally:
+        tracing.enable_stats(False)
+    # Inline counters still follow enable_stats()
+    assert tracing.STATS.snapshot()["counters"] == {"effect.deal_damage": 1}
+
+
+def test_histogram_percentiles():
+    hist = tracing.Histogram()
+    for ns in (100, 200, 300, 5000):
+        hist.add(ns)
+    assert hist.percentile(0.5) == 256
+    assert hist.percentile(1.0) == 8192
+    assert hist.summary()["max_ns"] == 5000
@@ -0,0 +1,36 @@
+from ptcgengine import api
+from ptcgengine.registry import default_registry
+
+DB = default_registry()
+
+
+def test_projections_memoised_until_the_state_changes(new_state):
+    state = new_state()
+    active = api.get_active(state)
+    hand = api.get_human_hand(state)
+    assert api.get_active(state) is active
+    assert all(a is b for a, b in zip(api.get_human_hand(state), hand, strict=True))
+
+    state.update_card(state.players[0].active, current_hp=1)
+    assert api.get_active(state) is not active
+    assert api.get_active(state).current_hp == 1
+    state.take_card(0, "hand")
+    assert len(api.get_human_hand(state)) == len(hand) - 1
+
+
+def test_card_definitions_are_interned(new_state):
+    a, b = new_state(1), new_state(2)
+    assert api.get_active(a).definition is api.get_active(b).definition
+    defs = {c.definition.id: c.definition for c in api.get_hand(a)}
+    for c in api.get_hand(b):
+        if c.definition.id in defs:
+            assert c.definition is defs[c.definition.id]
+
+
+def test_plain_objects_without_memo():
+    class Dummy:
+        active_player = 0
+        players = []
+
+    assert api.get_active(Dummy()) is None
+    assert api.get_hand(Dummy()) == []
@@ -0,0 +1,90 @@
+import json
+import random
+
+import pytest
+
+from ptcgengine.api import apply, get_available_actions, step, undo
+from ptcgengine.cards import create_card_instance
+from ptcgengine.context import EffectContext
+from ptcgengine.interpreter import execute_effect
+from ptcgengine.state import GameState
+
+with open("ptcgengine/cards/card_db.json") as f:
+    DB = json.load(f)
+
+
+def _setup_state():
+    state = GameState()
+    for p in state.players:
+        p.active = create_card_instance("TestMon", DB)
+        p.bench = [create_card_instance("TestMon", DB)]
+        p.deck = [create_card_instance("LightningEnergy", DB) for _ in range(8)]
+    return state
+
+
+def test_apply_matches_step_and_undo_restores():
+    rng = random.Random(7)
+    state = _setup_state()
+    for _ in range(20):
+        action = rng.choice(get_available_actions(state, DB))
+        before = state.clone()
+        expected, events = step(state, action, DB)
+
+        token = apply(state, action, DB)
+        assert state == expected
+        assert token.events == events
+
+        undo(state, token)
+        assert state == before
+
+        state = expected
+
+
+def test_nested_undo_in_reverse_order():
+    state = _setup_state()
+    original = state.clone()
+    tokens = []
+    for _ in range(6):
+        tokens.append(apply(state, get_available_actions(state, DB)[0], DB))
+    for token in reversed(tokens):
+        undo(state, token)
+    assert state == original
+
+
+def test_rejected_action_leaves_the_state_alone():
+    state = _setup_state()
+    original = state.clone()
+    # The start-of-turn draw happens before the attack is looked up
+    with pytest.raises(ValueError, match="Nope"):
+        apply(state, {"type": "attack", "attack_name": "Nope"}, DB)
+    assert state == original
+
+
+def test_undo_primitives_after_clone():
+    state = _setup_state()
+    original = state.clone()
+    token_mark = state.checkpoint()
+    effect = {
+        "op": "seq",
+        "args": {
+            "steps": [
+                {"op": "draw", "args": {"count": {"op": "const", "value": 2}}},
+                {"op": "switch_active", "args": {}},
+                {
+                    "op": "deal_damage",
+                    "args": {
+                        "target": {"op": "select", "args": {"who": "opponent", "zone": "active"}},
+                        "amount": {"op": "const", "value": 30},
+                    },
+                },
+            ]
+        },
+    }
+    execute_effect(effect, state, EffectContext(0))
+    # A snapshot taken mid-line must survive rolling the live state back
+    snapshot = state.clone()
+    state.rollback(token_mark)
+
+    assert state == original
+    assert len(snapshot.players[0].hand) == 2
+    assert snapshot.players[1].active.current_hp == 70
@@ -0,0 +1,84 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ptcgengine import encoding
+from ptcgengine.api import pending_choice
+from ptcgengine.card_instance import create_instance
+from ptcgengine.deck import Deck
+from ptcgengine.errors import EngineError
+from ptcgengine.registry import default_registry
+from ptcgengine.vec_env import VecBattleEnv
+
+DECKS = (
+    Deck(name="A", cards=[create_instance("TestMon")] * 4 + [create_instance("LightningEnergy")] * 16),
+    Deck(name="B", cards=[create_instance("TestMon")] * 2 + [create_instance("LightningEnergy")] * 18),
+)
+
+
+def _play(env, steps, seed):
+    rng = np.random.default_rng(seed)
+    obs, masks = env.reset()
+    trace = []
+    for _ in range(steps):
+        # random legal action per game
+        scores = rng.random(masks.shape) * masks
+        obs, rewards, dones, masks = env.step(scores.argmax(axis=1))
+        trace.append((obs.copy(), rewards.copy(), dones.copy()))
+    return trace
+
+
+def test_step_shapes_and_auto_reset():
+    env = VecBattleEnv(4, DECKS, seed=1, card_db=default_registry())
+    obs, masks = env.reset()
+    assert obs.shape == (4, encoding.NUM_FEATURES)
+    assert masks.shape == (4, encoding.NUM_ACTIONS)
+    assert masks.any(axis=1).all()
+
+    trace = _play(env, 300, seed=0)
+    finished = 0
+    for obs, rewards, dones in trace:
+        assert set(rewards.tolist()) <= {-1.0, 0.0, 1.0}
+        assert not rewards[~dones].any()
+        # finished slots already hold a fresh game
+        assert (encoding.unpack(obs)["turn"][dones] == 1).all()
+        finished += dones.sum()
+    assert finished > 0
+    assert env.masks.any(axis=1).all()
+
+
+def test_runs_are_reproducible():
+    db = default_registry()
+    a = _play(VecBattleEnv(3, DECKS, seed=7, card_db=db), 50, seed=3)
+    b = _play(VecBattleEnv(3, DECKS, seed=7, card_db=db), 50, seed=3)
+    for (oa, ra, da), (ob, rb, db_) in zip(a, b, strict=True):
+        assert (oa == ob).all() and (ra == rb).all() and (da == db_).all()
+
+
+def test_illegal_action_index_raises():
+    env = VecBattleEnv(2, DECKS, card_db=default_registry())
+    _, masks = env.reset()
+    illegal = (~masks[0]).argmax()
+    with pytest.raises(EngineError):
+        env.step(np.array([illegal, masks[1].argmax()]))
+
+
+def test_attacks_that_stop_at_a_choice(seeker_db):
+    # Seeker's attack pauses on a deck search until a "choose" action answers it
+    deck = Deck(name="S", cards=[create_instance("Seeker")] * 8 + [create_instance("LightningEnergy")] * 12)
+    env = VecBattleEnv(3, (deck, deck), seed=4, card_db=seeker_db)
+    _, masks = env.reset()
+    attack = np.full(3, encoding.ATTACK_OFFSET)
+    assert masks[:, encoding.ATTACK_OFFSET].all()
+
+    _, _, dones, masks = env.step(attack)
+    assert not dones.any()
+    assert all(pending_choice(s) is not None for s in env.states)
+    # Only choose slots are legal, the empty selection first
+    assert not masks[:, :encoding.CHOOSE_OFFSET].any()
+    assert masks[:, encoding.CHOOSE_OFFSET].all()
+
+    turn = [s.active_player for s in env.states]
+    _, _, _, masks = env.step(np.full(3, encoding.CHOOSE_OFFSET + 1))
+    assert all(pending_choice(s) is None for s in env.states)
+    assert [s.active_player for s in env.states] == [1 - p for p in turn]
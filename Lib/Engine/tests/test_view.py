@@ -0,0 +1,45 @@
+import copy
+import random
+
+from ptcgengine import api
+from ptcgengine.registry import default_registry
+from ptcgengine.view import ViewHistory, apply_patch, diff_views, render_state
+
+DB = default_registry()
+
+
+def test_diff_and_apply_roundtrip_without_mutating():
+    old = {"a": 1, "xs": [{"hp": 10}, {"hp": 20}, {"hp": 30}], "active": None}
+    new = {"a": 2, "xs": [{"hp": 10}, {"hp": 5}], "active": {"hp": 60}}
+    before = copy.deepcopy(old)
+    ops = diff_views(old, new)
+    assert ops == [
+        ["set", ["a"], 2],
+        ["set", ["xs", 1, "hp"], 5],
+        ["trim", ["xs"], 2],
+        ["set", ["active"], {"hp": 60}],
+    ]
+    assert apply_patch(old, ops) == new
+    assert old == before
+    assert diff_views(new, old) and apply_patch(new, diff_views(new, old)) == old
+
+
+def test_history_patches_follow_a_game(new_state):
+    rng = random.Random(4)
+    state = new_state()
+    history = ViewHistory(keep=8)
+    client, version = copy.deepcopy(render_state(state)), history.update(state)
+    assert history.update(state) == version
+    first = version
+    for _ in range(20):
+        actions = api.get_available_actions(state, DB)
+        if not actions:
+            break
+        state, _ = api.step(state, rng.choice(actions), DB)
+        history.update(state)
+        patch = history.delta(version)
+        client, version = apply_patch(client, patch), patch["to"]
+        assert client == render_state(state)
+    assert history.delta(version)["ops"] == []
+    # Older than the kept ops: the caller falls back to a full view
+    assert history.delta(first) is None
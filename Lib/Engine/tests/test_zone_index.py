@@ -0,0 +1,103 @@
+import random
+
+from ptcgengine.cards import EnergyCard, PokemonCard
+from ptcgengine.context import EffectContext
+from ptcgengine.expressions import eval_expr
+from ptcgengine.filters import FilterChain, apply_filter
+from ptcgengine.selectors import resolve_selector
+from ptcgengine.state import GameState
+from ptcgengine.zone_index import ZoneIndex
+
+MONS = [
+    PokemonCard(card_id=f"M{hp}{t}", name="M", hp=hp, types=[t], current_hp=hp)
+    for hp in (30, 45, 60, 90, 120) for t in ("fire", "water")
+]
+ENERGY = [EnergyCard(card_id=f"E{t}", name="E", energy_type=t) for t in "RW"]
+
+CHAINS = [
+    [],
+    [{"type": "supertype", "value": "energy"}],
+    [{"type": "pokemon_type", "value": "fire"}],
+    [{"type": "hp_at_least", "value": 45}, {"type": "hp_at_most", "value": 90}],
+    [{"type": "and", "value": [{"type": "pokemon_type", "value": "water"}, {"type": "hp_at_least", "value": 60}]}],
+]
+
+
+def _card(rng):
+    return rng.choice(MONS + ENERGY).copy()
+
+
+def _check(state):
+    for p in state.players:
+        for zone in ("deck", "hand", "discard"):
+            cards = getattr(p, zone)
+            assert p.index(zone).buckets == ZoneIndex(cards).buckets
+            for filters in CHAINS:
+                expected = [c for c in cards if all(apply_filter(c, f) for f in filters)]
+                chain = FilterChain(filters)
+                got = chain.select(p, zone)
+                assert len(got) == len(expected) and all(a is b for a, b in zip(got, expected, strict=True))
+                assert chain.count(p, zone) == len(expected)
+
+
+def test_indexes_follow_every_mutation_op():
+    rng = random.Random(5)
+    state = GameState()
+    for p in state.players:
+        p.deck = [_card(rng) for _ in range(60)]
+    history = []
+    for step in range(400):
+        i, zone = rng.randrange(2), rng.choice(("deck", "hand", "discard"))
+        cards = getattr(state.players[i], zone)
+        op = rng.randrange(7)
+        if op == 0 and cards:
+            state.add_card(i, rng.choice(("hand", "discard")), state.take_card(i, zone, rng.randrange(len(cards))))
+        elif op == 1:
+            state.add_card(i, zone, _card(rng), rng.randrange(len(cards) + 1) if rng.random() < 0.3 else None)
+        elif op == 2 and cards:
+            state.add_card(i, "hand", state.take_card(i, zone))
+        elif op == 3 and cards:
+            # Copy-on-write swaps a shared card for a copy in its slot
+            card = rng.choice(cards)
+            if isinstance(card, PokemonCard):
+                state.update_card(card, current_hp=1)
+            else:
+                state.card(card)
+        elif op == 4:
+            state.set_zone(i, zone, rng.sample(cards, len(cards)))
+        elif op == 5:
+            history.append(state)
+            state = state.clone()
+        elif op == 6 and history:
+            mark = state.checkpoint()
+            if cards:
+                state.add_card(i, zone, state.take_card(i, zone, 0))
+            state.rollback(mark)
+            state.commit()
+        # Every index built so far must still describe its zone
+        if step % 7 == 0:
+            _check(state)
+    _check(state)
+    for old in history:
+        _check(old)
+
+
+def test_common_ops_patch_the_index_in_place():
+    rng = random.Random(1)
+    state = GameState()
+    p = state.players[0]
+    p.deck = [_card(rng) for _ in range(60)]
+    index = p.index("deck")
+    state.add_card(0, "hand", state.take_card(0, "deck"))
+    state.remove_card(0, "deck", p.deck[10])
+    state.add_card(0, "deck", _card(rng))
+    assert p.index("deck") is index
+
+
+def test_selectors_and_count_use_the_indexes():
+    state = GameState()
+    state.players[0].deck = [m.copy() for m in MONS] + [e.copy() for e in ENERGY]
+    sel = {"op": "select", "args": {"who": "self", "zone": "deck", "filters": CHAINS[3]}}
+    ctx = EffectContext(0)
+    assert [c.hp for c in resolve_selector(sel, state, ctx)] == [45, 45, 60, 60, 90, 90]
+    assert eval_expr({"op": "count", "selector": sel}, state, ctx) == 6
@@ -7,13 +7,20 @@ class SceneManager:
 
     def pop(self):
         if self.scenes:
-            self.scenes.pop()
+            self._close(self.scenes.pop())
 
     def replace(self, scene):
         if self.scenes:
-            self.scenes.pop()
+            self._close(self.scenes.pop())
         self.scenes.append(scene)
 
+    @staticmethod
+    def _close(scene):
+        # Scenes holding threads or other resources release them here
+        close = getattr(scene, "close", None)
+        if close is not None:
+            close()
+
     def current(self):
         return self.scenes[-1] if self.scenes else None
 
@@ -13,6 +13,9 @@ try:
 except Exception:  # pragma: no cover - in tests we monkeypatch 'api'
     api = None  # type: ignore[assignment]
 
+# Seconds the computer opponent (player 1) may think per move.
+OPPONENT_THINK_TIME = 1.0
+
 
 class BattleScene(BaseScene):
     """
@@ -21,6 +24,13 @@ class BattleScene(BaseScene):
     - UI state (selection index, log) is local and purely presentational.
     - Actions are taken from api.get_available_actions(self.state).
     - When an action is chosen, we call api.step(state, action) to get the next state.
+    - Player 1 is played by `opponent` (an MCTS search by default). It thinks on a
+      background thread; update() applies its move once the search finishes, so
+      drawing never waits on the search. The default search only knows what
+      player 1 could (it determinizes the hidden cards from the deck lists),
+      and, being pure Python, it costs the draw loop frames while it runs
+      (GIL). close() stops it; the scene manager calls it when the scene is
+      popped.
     """
 
     def __init__(
@@ -28,6 +38,7 @@ class BattleScene(BaseScene):
         screen: pygame.Surface,
         scene_manager: Any | None = None,
         initial_state: Any | None = None,
+        opponent: Any | None = None,
     ) -> None:
         self.screen = screen
         self.scene_manager = scene_manager
@@ -51,6 +62,10 @@ class BattleScene(BaseScene):
         self.selected_action_index: int = 0
         self.log: list[str] = []
 
+        # Computer opponent and its in-flight search (a Future), if any
+        self.opponent = opponent if opponent is not None else self._default_opponent(self.state)
+        self._pending_move: Any | None = None
+
         # --- Declarative UI integration ---
         from ui.ui_state import BattleUIState
         from ui.layout import BattleLayout
@@ -69,9 +84,31 @@ class BattleScene(BaseScene):
 
         if self.state is not None and api is not None:
             self._refresh_actions()
+            self._maybe_start_opponent()
         else:
             self.actions = []
 
+    @staticmethod
+    def _default_opponent(state: Any | None) -> Any | None:
+        if api is None or state is None:
+            return None
+        try:
+            from ptcgengine.determinize import deck_lists
+            from ptcgengine.mcts import MCTSOpponent
+
+            # Information-set search: hidden cards are redealt from the deck lists
+            lists = deck_lists(state)
+        except Exception:
+            return None
+        return MCTSOpponent(player=1, time_limit=OPPONENT_THINK_TIME, deck_lists=lists)
+
+    def close(self) -> None:
+        """Stop the opponent's search thread."""
+        if self.opponent is not None:
+            self.opponent.close()
+            self.opponent = None
+        self._pending_move = None
+
     # ---------------------------
     # Internal helpers
     # ---------------------------
@@ -90,20 +127,45 @@ class BattleScene(BaseScene):
         else:
             self.selected_action_index = min(self.selected_action_index, len(self.actions) - 1)
 
-    def _log_action(self, action: dict[str, Any]) -> None:
+    def _log_action(self, action: dict[str, Any], prefix: str = ">") -> None:
         label = str(action.get("label") or action.get("type") or repr(action))
-        self.log.append(f"> {label}")
+        self.log.append(f"{prefix} {label}")
         # Trim log to avoid unbounded growth
         if len(self.log) > 100:
             self.log = self.log[-100:]
 
+    def _opponent_to_move(self) -> bool:
+        return self.opponent is not None and self.opponent.wants_to_move(self.state)
+
+    def _maybe_start_opponent(self) -> None:
+        """Kick off a background search if it is the opponent's turn."""
+        if self._pending_move is None and self.state is not None and self._opponent_to_move():
+            self._pending_move = self.opponent.think(self.state)
+
+    def _poll_opponent(self) -> None:
+        """Apply the opponent's move if its search has finished."""
+        future = self._pending_move
+        if future is None or not future.done():
+            return
+        self._pending_move = None
+        try:
+            action = future.result()
+        except Exception as exc:
+            self.log.append(f"Opponent failed to move: {exc}")
+            self.opponent = None
+            return
+        self._apply_action(action, prefix="<")
+
     def _apply_selected_action(self) -> None:
         """Apply the currently selected action via the engine."""
         if api is None or self.state is None or not self.actions:
             return
+        if self._opponent_to_move():
+            return
+        self._apply_action(self.actions[self.selected_action_index])
 
-        action = self.actions[self.selected_action_index]
-        self._log_action(action)
+    def _apply_action(self, action: dict[str, Any], prefix: str = ">") -> None:
+        self._log_action(action, prefix)
 
         # Engine now returns (next_state, events)
         result = api.step(self.state, action)
@@ -121,6 +183,7 @@ class BattleScene(BaseScene):
         self.log = self.log[-100:]
 
         self._refresh_actions()
+        self._maybe_start_opponent()
 
     def _format_event(self, ev):
         """Convert structured event objects to readable text."""
@@ -133,15 +196,17 @@ class BattleScene(BaseScene):
     # BaseScene interface
     # ---------------------------
     def update(self, dt: float) -> None:  # noqa: ARG002
-        # No time-based animation yet; hook reserved for future work.
-        return
+        # No time-based animation yet; only the opponent's search is polled.
+        self._poll_opponent()
 
     def handle_event(self, event) -> None:
         if event.type == pygame.KEYDOWN:
             if event.key in (pygame.K_ESCAPE, pygame.K_q):
-                # Exit battle: pop this scene
+                # Exit battle: pop this scene (the manager closes it)
                 if self.scene_manager is not None:
                     self.scene_manager.pop()
+                else:
+                    self.close()
 
             elif event.key in (pygame.K_UP, pygame.K_k):
                 if self.actions:
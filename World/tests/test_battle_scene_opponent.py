@@ -0,0 +1,108 @@
+import os
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import pygame
+
+import scenes.battle_scene as bs
+
+
+class DummyAPI:
+    def __init__(self):
+        self.step_calls: list[tuple[object, dict]] = []
+
+    def initial_state(self):
+        return SimpleNamespace(active_player=0, winner=None)
+
+    def get_available_actions(self, state):
+        return [{"type": "pass", "label": "Pass"}]
+
+    def step(self, state, action):
+        self.step_calls.append((state, action))
+        return SimpleNamespace(active_player=1 - state.active_player, winner=None), []
+
+
+class SlowOpponent:
+    """Opponent whose move is released by the test, like a search still running."""
+
+    def __init__(self):
+        self.future: Future | None = None
+
+    def wants_to_move(self, state):
+        return state.active_player == 1
+
+    def think(self, state):
+        self.future = Future()
+        return self.future
+
+    def close(self):
+        pass
+
+
+def _screen():
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    return pygame.Surface((640, 480))
+
+
+def test_opponent_moves_without_blocking_the_scene(monkeypatch):
+    dummy_api = DummyAPI()
+    monkeypatch.setattr(bs, "api", dummy_api, raising=False)
+    opponent = SlowOpponent()
+    scene = bs.BattleScene(_screen(), opponent=opponent)
+
+    enter = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN)
+    scene.handle_event(enter)
+    assert scene.state.active_player == 1
+    assert opponent.future is not None
+
+    # While the opponent thinks, frames keep going and input is ignored
+    scene.update(1 / 60)
+    scene.draw(scene.screen)
+    scene.handle_event(enter)
+    assert len(dummy_api.step_calls) == 1
+
+    opponent.future.set_result({"type": "pass", "label": "Pass"})
+    scene.update(1 / 60)
+    assert len(dummy_api.step_calls) == 2
+    assert scene.state.active_player == 0
+    assert scene.log[-1] == "< Pass"
+
+
+def test_default_opponent_searches_in_background():
+    from ptcgengine.mcts import MCTSOpponent
+    from ptcgengine.state import GameState
+
+    state = GameState(active_player=1)
+    opponent = MCTSOpponent(player=1, iterations=50, time_limit=None, seed=0)
+    scene = bs.BattleScene(_screen(), initial_state=state, opponent=opponent)
+    assert scene._pending_move is not None
+
+    deadline = time.monotonic() + 10
+    while scene.state.active_player == 1 and time.monotonic() < deadline:
+        scene.update(1 / 60)
+        time.sleep(0.01)
+    assert scene.state.active_player == 0
+    assert opponent.last_result.iterations >= 50
+    opponent.close()
+
+
+def test_default_opponent_searches_the_information_set():
+    from ptcgengine import api
+    from ptcgengine.card_instance import create_instance
+    from ptcgengine.deck import Deck
+    from ptcgengine.registry import default_registry
+    from scene_manager import SceneManager
+
+    deck = Deck(name="D", cards=[create_instance("TestMon")] * 3 + [create_instance("LightningEnergy")] * 17)
+    state = api.new_game(deck, deck, default_registry(), seed=0)
+    manager = SceneManager()
+    scene = bs.BattleScene(_screen(), manager, initial_state=state)
+    manager.push(scene)
+    opponent = scene.opponent
+    assert [len(ids) for ids in opponent.mcts.deck_lists] == [20, 20]
+
+    manager.pop()
+    assert scene.opponent is None
+    assert opponent._executor._shutdown
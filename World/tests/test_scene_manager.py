@@ -33,6 +33,22 @@ def test_pop_removes_scene():
     assert manager.current() is None
 
 
+def test_popped_scenes_are_closed():
+    class ClosingScene(DummyScene):
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    manager = SceneManager()
+    s1, s2 = ClosingScene(), ClosingScene()
+    manager.push(s1)
+    manager.replace(s2)
+    assert s1.closed and not s2.closed
+    manager.pop()
+    assert s2.closed
+
+
 def test_replace():
     manager = SceneManager()
     s1 = DummyScene()